@@ -1,31 +1,29 @@
 import streamlit as st
-import pandas as pd
+from config import WALLET_DATA_FILE_PATH
+from transaction_store import load_transactions, dataset_version
+from wallet_index import get_wallet_index
+from table_pager import TableView
+from views.widgets import show_paged_table
 
-# Load your CSV data
-@st.cache_data
+# Load your CSV data (cached per process and reloaded only when the file changes)
 def load_data():
-    # Replace 'your_data.csv' with your actual CSV file path
-    return pd.read_csv(r"C:\Users\sugan\Desktop\random_wallet_transactions.csv")
+    return load_transactions(WALLET_DATA_FILE_PATH)
 
 transactions_df = load_data()
+wallet_index = get_wallet_index(WALLET_DATA_FILE_PATH)
 
 # Streamlit App Layout
 st.title("Wallet Details Page")
 
 # Select Wallet
-wallets = transactions_df['Sender Wallet'].tolist() + transactions_df['Receiver Wallet'].tolist()
-wallets = sorted(set(wallets))  # Unique and sorted wallet addresses
-selected_wallet = st.selectbox("Select Wallet", wallets)
+selected_wallet = st.selectbox("Select Wallet", wallet_index.wallets)  # Unique and sorted wallet addresses
 
 if selected_wallet:
     # Wallet Overview
     st.header("Wallet Overview")
-    wallet_transactions = transactions_df[
-        (transactions_df['Sender Wallet'] == selected_wallet) | 
-        (transactions_df['Receiver Wallet'] == selected_wallet)
-    ]
-    total_transactions = len(wallet_transactions)
-    total_amount_transacted = wallet_transactions['Amount Transacted'].sum()
+    wallet_transactions = wallet_index.history(transactions_df, selected_wallet)
+    total_transactions = wallet_index.count(selected_wallet)
+    total_amount_transacted = wallet_index.total(selected_wallet)
     risk_score = wallet_transactions['Risk Score'].mode()[0] if not wallet_transactions.empty else "Unknown"
     owner = "Not Linked to KYC"  # Placeholder, update if KYC data is available
 
@@ -37,12 +35,8 @@ if selected_wallet:
 
     # Transaction History
     st.header("Transaction History")
-    st.write(wallet_transactions[['Transaction ID', 'Sender Wallet', 'Receiver Wallet', 'Amount Transacted', 'Timestamp', 'Risk Score']])
-
-    # Export Options: CSV
-    st.download_button(
-        label="Download CSV",
-        data=wallet_transactions.to_csv(index=False).encode('utf-8'),
-        file_name=f"{selected_wallet}_transactions.csv",
-        mime='text/csv'
-    )
+    history = TableView(transactions_df, wallet_index.rows(selected_wallet),
+                        ['Transaction ID', 'Sender Wallet', 'Receiver Wallet', 'Amount Transacted', 'Timestamp', 'Risk Score'],
+                        key=(dataset_version(WALLET_DATA_FILE_PATH), selected_wallet))
+    # Only the visible page is sent to the browser; the CSV export is prepared only when asked for
+    show_paged_table(history, "wallet_history", f"{selected_wallet}_transactions.csv")
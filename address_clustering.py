@@ -0,0 +1,251 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+from block_warehouse import WAREHOUSE_DIR, get_warehouse
+
+CLUSTERS_FILE = "clusters.npz"
+
+
+class UnionFind:
+    """
+    Array-backed union-find over integer codes. The root of every set is its smallest code,
+    so cluster ids do not depend on the order unions are applied in.
+    """
+
+    def __init__(self, size=0):
+        self.parent = np.arange(size, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.parent)
+
+    def grow(self, size):
+        if size > len(self.parent):
+            self.parent = np.concatenate([self.parent, np.arange(len(self.parent), size, dtype=np.int64)])
+
+    def find(self, code):
+        """Root of `code`, halving the path on the way up."""
+        parent = self.parent
+        while parent[code] != code:
+            parent[code] = parent[parent[code]]
+            code = parent[code]
+        return int(code)
+
+    def union(self, a, b):
+        a, b = self.find(a), self.find(b)
+        if a != b:
+            self.parent[max(a, b)] = min(a, b)
+
+    def compress(self):
+        """Points every code straight at its root (vectorized pointer jumping)."""
+        parent = self.parent
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                return parent
+            parent[:] = grandparent
+
+    def union_pairs(self, a, b):
+        """Merges the sets of every (a[i], b[i]) pair with vectorized hooking and compression."""
+        a, b = np.asarray(a, dtype=np.int64), np.asarray(b, dtype=np.int64)
+        while len(a):
+            parent = self.compress()
+            root_a, root_b = parent[a], parent[b]
+            differ = root_a != root_b
+            if not differ.any():
+                return
+            low, high = np.minimum(root_a[differ], root_b[differ]), np.maximum(root_a[differ], root_b[differ])
+            # Roots point at themselves, so hooking each onto its smallest partner never drops a link
+            np.minimum.at(parent, high, low)
+            a, b = a[differ], b[differ]
+
+
+class AddressClusters:
+    """
+    Entities inferred from the common-input-ownership heuristic: every address spent in the
+    same transaction belongs to one entity. With `change_heuristic`, the single fresh output
+    of a two-output transaction is treated as change and joined to the spender too.
+    """
+
+    def __init__(self, change_heuristic=False):
+        self.change_heuristic = change_heuristic
+        self.addresses = []
+        self.codes = {}
+        self.sets = UnionFind()
+        # Warehouse blocks already clustered
+        self.blocks = set()
+        self.lock = threading.RLock()
+        self._members = None
+
+    def _code_array(self, addresses):
+        """Codes of `addresses` (strings; None/NaN -> -1), interning new ones."""
+        codes, uniques = pd.factorize(pd.Series(addresses, dtype=object))
+        mapping = np.empty(len(uniques), dtype=np.int64)
+        for i, address in enumerate(uniques.tolist()):
+            code = self.codes.get(address)
+            if code is None:
+                code = self.codes[address] = len(self.addresses)
+                self.addresses.append(address)
+            mapping[i] = code
+        self.sets.grow(len(self.addresses))
+        return np.where(codes >= 0, mapping[np.maximum(codes, 0)], -1)
+
+    def add_spends(self, tx_ids, addresses):
+        """
+        Clusters spent addresses: rows are (transaction id, input address) pairs in any order,
+        and all addresses of one transaction are merged.
+        """
+        with self.lock:
+            codes = self._code_array(addresses)
+            tx_codes = pd.factorize(pd.Series(tx_ids))[0]
+            keep = codes >= 0
+            codes, tx_codes = codes[keep], tx_codes[keep]
+            first = np.full(tx_codes.max() + 1 if len(tx_codes) else 0, -1, dtype=np.int64)
+            first[tx_codes[::-1]] = codes[::-1]
+            self.sets.union_pairs(codes, first[tx_codes])
+            self.sets.compress()
+            self._members = None
+
+    def add_change(self, tx_ids, output_addresses, spender_addresses, fresh):
+        """
+        Joins change outputs to their spender: `tx_ids` / `output_addresses` / `fresh` describe
+        outputs (fresh = first time the address is seen), `spender_addresses` maps tx id -> one
+        input address. A two-output transaction with exactly one fresh output that is not also
+        an input address is assumed to pay its change there.
+        """
+        outputs = pd.DataFrame({"tx": tx_ids, "addr": output_addresses, "fresh": fresh})
+        outputs["spender"] = outputs["tx"].map(spender_addresses)
+        outputs = outputs[outputs["spender"].notna() & outputs["addr"].notna()]
+        per_tx = outputs.groupby("tx", sort=False)
+        candidate = (per_tx["addr"].transform("size") == 2) & (per_tx["fresh"].transform("sum") == 1) \
+            & outputs["fresh"] & (outputs["addr"] != outputs["spender"])
+        change = outputs[candidate]
+        with self.lock:
+            self.sets.union_pairs(self._code_array(change["addr"].to_numpy()),
+                                  self._code_array(change["spender"].to_numpy()))
+            self.sets.compress()
+            self._members = None
+
+    def add_block(self, block):
+        """Clusters the transactions of a ColumnarBlock (see block_model.py)."""
+        inputs = np.asarray(block.addresses.lookup(block.in_address), dtype=object)
+        inputs[block.in_address < 0] = None
+        outputs = np.asarray(block.addresses.lookup(block.out_address), dtype=object)
+        outputs[block.out_address < 0] = None
+        self._add(block.in_tx, inputs, block.out_tx, outputs)
+
+    def add_warehouse(self, warehouse):
+        """Clusters every warehouse block not clustered yet. Returns the number of new blocks."""
+        with self.lock:
+            new_blocks = set(warehouse.blocks["hash"].tolist()) - self.blocks if len(warehouse) else set()
+            if not new_blocks:
+                return 0
+            new_heights = warehouse.blocks.loc[warehouse.blocks["hash"].isin(new_blocks), "height"]
+            tx_hashes = warehouse.txs.loc[warehouse.txs["block_height"].isin(new_heights), "hash"]
+            inputs = warehouse.inputs[warehouse.inputs["tx_hash"].isin(tx_hashes)]
+            outputs = warehouse.outputs[warehouse.outputs["tx_hash"].isin(tx_hashes)]
+            # Outputs in chain order, so "fresh" means first seen in the chain
+            order = warehouse.tx_index.get_indexer(outputs["tx_hash"]).astype(np.int64) * (1 << 20) \
+                + outputs["n"].to_numpy()
+            outputs = outputs.iloc[np.argsort(order, kind="stable")]
+            self._add(inputs["tx_hash"].to_numpy(), inputs["addr"].to_numpy(dtype=object),
+                      outputs["tx_hash"].to_numpy(), outputs["addr"].to_numpy(dtype=object))
+            self.blocks |= new_blocks
+            return len(new_blocks)
+
+    def _add(self, input_tx, input_addresses, output_tx, output_addresses):
+        with self.lock:
+            known = len(self.addresses)
+            self.add_spends(input_tx, input_addresses)
+            if self.change_heuristic and len(output_tx):
+                codes = self._code_array(output_addresses)
+                first_output = np.zeros(len(codes), dtype=bool)
+                first_output[np.unique(codes, return_index=True)[1]] = True
+                fresh = first_output & (codes >= known) & (codes >= 0)
+                # An address first seen as an input of this batch is not fresh either
+                fresh &= ~np.isin(codes, self._code_array(input_addresses))
+                spenders = pd.Series(input_addresses, index=input_tx).dropna()
+                spenders = spenders[~spenders.index.duplicated()]
+                self.add_change(output_tx, output_addresses, spenders, fresh)
+
+    def entity(self, address):
+        """Cluster id of `address` in O(1) (every update ends fully compressed), or None if unseen."""
+        with self.lock:
+            code = self.codes.get(address)
+            return None if code is None else int(self.sets.parent[code])
+
+    def entities(self, addresses):
+        """Cluster ids of many addresses (-1 for unseen ones)."""
+        with self.lock:
+            codes = np.array([self.codes.get(address, -1) for address in addresses], dtype=np.int64)
+            parent = self.sets.compress()
+            return np.where(codes >= 0, parent[np.maximum(codes, 0)], -1)
+
+    def _index(self):
+        if self._members is None:
+            parent = self.sets.compress()
+            order = np.argsort(parent, kind="stable")
+            self._members = (order, parent[order])
+        return self._members
+
+    def members(self, entity):
+        """Every address of the cluster `entity`."""
+        with self.lock:
+            order, roots = self._index()
+            start, end = np.searchsorted(roots, [entity, entity + 1])
+            return [self.addresses[code] for code in order[start:end].tolist()]
+
+    def sizes(self):
+        """Cluster sizes as a Series indexed by cluster id, largest first."""
+        with self.lock:
+            roots = self.sets.compress()
+            ids, counts = np.unique(roots, return_counts=True)
+            return pd.Series(counts, index=ids, name="addresses").sort_values(ascending=False, kind="stable")
+
+    def save(self, path):
+        with self.lock:
+            tmp_path = path + ".tmp.npz"
+            np.savez(tmp_path, addresses=np.asarray(self.addresses, dtype=str), parent=self.sets.compress(),
+                     blocks=np.asarray(sorted(self.blocks), dtype=str),
+                     change_heuristic=np.array([self.change_heuristic]))
+            os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        """Loads saved clusters, or returns None if there are none."""
+        try:
+            data = np.load(path)
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+        clusters = cls(change_heuristic=bool(data["change_heuristic"][0]))
+        clusters.addresses = data["addresses"].tolist()
+        clusters.codes = {address: code for code, address in enumerate(clusters.addresses)}
+        clusters.sets.parent = data["parent"].astype(np.int64)
+        clusters.blocks = set(data["blocks"].tolist())
+        return clusters
+
+
+_clusters = {}
+_clusters_lock = threading.Lock()
+
+
+def get_address_clusters(directory=WAREHOUSE_DIR, change_heuristic=False):
+    """
+    Returns the address clusters of the block warehouse at `directory`, persisted next to it.
+    Blocks ingested since the last call are clustered incrementally; None if the warehouse is empty.
+    """
+    warehouse = get_warehouse(directory)
+    if warehouse is None:
+        return None
+    path = os.path.join(directory, CLUSTERS_FILE if not change_heuristic else "clusters-change.npz")
+    with _clusters_lock:
+        clusters = _clusters.get(path)
+        if clusters is None:
+            clusters = AddressClusters.load(path) or AddressClusters(change_heuristic)
+            _clusters[path] = clusters
+    if clusters.add_warehouse(warehouse):
+        try:
+            clusters.save(path)
+        except OSError:
+            pass
+    return clusters
@@ -0,0 +1,277 @@
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from transaction_store import load_transactions, dataset_version
+
+SENDER_COLUMNS = ["address", "Sender Wallet"]
+RECEIVER_COLUMNS = ["recipient", "Receiver Wallet"]
+AMOUNT_COLUMNS = ["amount", "Amount Transacted"]
+
+# Analyses over a transaction dataset (sharded by wallet hash) and over block dumps (sharded by block range)
+TRANSACTION_ANALYSES = ["p2p", "wallets", "fraud", "reports"]
+BLOCK_ANALYSES = ["bursts", "blocks"]
+BATCH_OUTPUT_DIR = os.environ.get("BATCH_OUTPUT_DIR", "batch_output")
+SUMMARY_FILE = "summary.json"
+# Every result file name a run can write (fraud_scores comes with the fraud analysis)
+RESULT_NAMES = TRANSACTION_ANALYSES + BLOCK_ANALYSES + ["fraud_scores"]
+RESULT_EXTENSIONS = ["parquet", "json"]
+# Shards per worker: more, smaller shards even out skewed wallets at little extra cost
+SHARDS_PER_WORKER = 4
+
+
+def _column(df, names, required=True):
+    for name in names:
+        if name in df.columns:
+            return df[name]
+    if required:
+        raise KeyError(f"Expected one of the columns {names}")
+    return None
+
+
+def wallet_shards(wallets, n_shards):
+    """Shard of each wallet: a stable hash of its address (the same in every process) modulo n_shards."""
+    categorical = pd.Categorical(wallets)
+    hashes = pd.util.hash_array(categorical.categories.astype(str).to_numpy(dtype=object))
+    shards = (hashes % np.uint64(n_shards)).astype(np.int64)
+    # Missing wallets (code -1) go to shard 0
+    return np.append(shards, 0)[categorical.codes]
+
+
+def _sent_received(senders, receivers, amounts, sent, received):
+    wallets = pd.concat([
+        pd.DataFrame({"wallet": senders[sent], "sent_count": 1, "sent_amount": amounts[sent],
+                      "received_count": 0, "received_amount": 0.0, "counterparty": receivers[sent]}),
+        pd.DataFrame({"wallet": receivers[received], "sent_count": 0, "sent_amount": 0.0,
+                      "received_count": 1, "received_amount": amounts[received], "counterparty": senders[received]}),
+    ], ignore_index=True)
+    grouped = wallets.groupby("wallet", sort=False)
+    summary = grouped[["sent_count", "sent_amount", "received_count", "received_amount"]].sum()
+    summary["counterparties"] = grouped["counterparty"].nunique()
+    return summary.reset_index()
+
+
+def transaction_shard(path, shard, n_shards, analyses):
+    """
+    Runs `analyses` over the wallets of one shard of the dataset at `path`: pair counts and
+    fraud scores over the transactions the shard's wallets sent, wallet summaries over what
+    they sent and received. Shards are disjoint, so partial results only need concatenating.
+    """
+    start = time.perf_counter()
+    df = load_transactions(path)
+    senders = _column(df, SENDER_COLUMNS).astype(str).to_numpy()
+    receivers = _column(df, RECEIVER_COLUMNS).astype(str).to_numpy()
+    amount_column = _column(df, AMOUNT_COLUMNS, required=False)
+    amounts = np.zeros(len(df)) if amount_column is None else \
+        pd.to_numeric(amount_column, errors="coerce").fillna(0).to_numpy(dtype=np.float64)
+    sent = wallet_shards(senders, n_shards) == shard
+    results = {}
+    if "p2p" in analyses:
+        pairs = pd.DataFrame({"sender": senders[sent], "receiver": receivers[sent], "amount": amounts[sent]})
+        results["p2p"] = pairs.groupby(["sender", "receiver"], sort=False)["amount"] \
+            .agg(transaction_count="size", amount="sum").reset_index()
+    if "wallets" in analyses:
+        received = wallet_shards(receivers, n_shards) == shard
+        results["wallets"] = _sent_received(senders, receivers, amounts, sent, received)
+    if "fraud" in analyses:
+        # The model is found next to fraud_scoring.py, whatever the working directory
+        from fraud_scoring import score, FRAUD_THRESHOLD
+        rows = np.flatnonzero(sent)
+        part = df.iloc[rows]
+        if "fraud_probability" in df.columns:
+            probabilities = part["fraud_probability"].to_numpy()
+        else:
+            probabilities = score(part, n_jobs=1)
+        flagged = probabilities >= FRAUD_THRESHOLD
+        fraud = part[flagged].copy()
+        fraud.insert(0, "row", rows[flagged])
+        fraud["fraud_probability"] = probabilities[flagged]
+        results["fraud"] = fraud
+        # Every row's probability, so the app can reuse the scores instead of scoring again
+        results["fraud_scores"] = pd.DataFrame({"row": rows, "fraud_probability": probabilities})
+    return results, time.perf_counter() - start
+
+
+def block_range(paths, analyses):
+    """Runs `analyses` over a contiguous range of block dump files."""
+    from block_model import AddressTable, ColumnarBlock
+    start = time.perf_counter()
+    addresses = AddressTable()
+    bursts, blocks = [], []
+    for path in paths:
+        block = ColumnarBlock.from_file(path, addresses)
+        block_hash = block.header.get("hash")
+        if "bursts" in analyses:
+            for alert in block.large_output_bursts():
+                bursts.append({"block": block_hash, "address": alert.address, "transactions": alert.hashes,
+                               "amounts": alert.amounts, "first_time": min(alert.times), "last_time": max(alert.times)})
+        if "blocks" in analyses:
+            frame = block.transactions_frame()
+            frame.insert(0, "height", block.header.get("height", -1))
+            frame.insert(0, "block", block_hash)
+            blocks.append(frame)
+    results = {}
+    if "bursts" in analyses:
+        results["bursts"] = pd.DataFrame(bursts, columns=["block", "address", "transactions", "amounts",
+                                                          "first_time", "last_time"])
+    if "blocks" in analyses and blocks:
+        results["blocks"] = pd.concat(blocks, ignore_index=True)
+    return results, time.perf_counter() - start
+
+
+def _merge(partials):
+    """Concatenates the per-shard results of every analysis."""
+    merged = {}
+    for results in partials:
+        for name, frame in results.items():
+            merged.setdefault(name, []).append(frame)
+    return {name: pd.concat(frames, ignore_index=True) for name, frames in merged.items()}
+
+
+def _run(pool, function, tasks):
+    futures = [pool.submit(function, *task) for task in tasks]
+    partials, seconds = zip(*[future.result() for future in futures]) if futures else ((), ())
+    return _merge(partials), list(seconds)
+
+
+def _timing(seconds):
+    if not seconds:
+        return {}
+    return {"shards": len(seconds), "min": min(seconds), "median": float(np.median(seconds)), "max": max(seconds)}
+
+
+def write_result(frame, directory, name, output_format="parquet"):
+    """Writes one analysis result as <name>.parquet (or <name>.json, one record per line)."""
+    path = os.path.join(directory, f"{name}.{'json' if output_format == 'json' else 'parquet'}")
+    tmp_path = path + ".tmp"
+    if output_format == "json":
+        frame.to_json(tmp_path, orient="records", lines=True, date_format="iso")
+    else:
+        frame.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_result(name, directory=BATCH_OUTPUT_DIR, path=None):
+    """
+    Loads a result of the latest batch run, or returns None if that run did not produce it. With
+    `path`, only a result computed from the current version of that transaction dataset is returned.
+    """
+    try:
+        with open(os.path.join(directory, SUMMARY_FILE)) as f:
+            summary = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if path is not None and summary.get("transactions", {}).get("version") != list(dataset_version(path)):
+        return None
+    file_name = summary.get("analyses", {}).get(name, {}).get("file")
+    if not file_name:
+        return None
+    try:
+        if file_name.endswith(".json"):
+            return pd.read_json(os.path.join(directory, file_name), lines=True)
+        return pd.read_parquet(os.path.join(directory, file_name))
+    except (OSError, ValueError):
+        return None
+
+
+def run_batch(transactions=None, blocks_dir=None, output=BATCH_OUTPUT_DIR, analyses=None, workers=None,
+              shards=None, output_format="parquet"):
+    """
+    Runs the analyses over a transaction dataset and / or a directory of block JSON dumps in a
+    process pool, writes one file per analysis into `output` plus a JSON timing summary, and
+    returns the summary.
+    """
+    started = time.perf_counter()
+    workers = workers or os.cpu_count() or 1
+    shards = shards or workers * SHARDS_PER_WORKER
+    analyses = analyses or TRANSACTION_ANALYSES + BLOCK_ANALYSES
+    os.makedirs(output, exist_ok=True)
+    summary = {"started": time.strftime("%Y-%m-%d %H:%M:%S"), "workers": workers, "analyses": {}}
+    results, timings = {}, {}
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        table_analyses = [a for a in analyses if a in TRANSACTION_ANALYSES and a != "reports"]
+        if transactions and (table_analyses or "reports" in analyses):
+            start = time.perf_counter()
+            # Loaded (and converted to the columnar copy) once up front, so workers only read Parquet
+            version = dataset_version(transactions)
+            load_transactions(transactions)
+            load_seconds = time.perf_counter() - start
+            shard_analyses = table_analyses + (["p2p"] if "reports" in analyses and "p2p" not in table_analyses else [])
+            merged, seconds = _run(pool, transaction_shard,
+                                   [(transactions, shard, shards, shard_analyses) for shard in range(shards)])
+            summary["transactions"] = {"path": transactions, "version": list(version), "load_seconds": load_seconds,
+                                       "seconds": time.perf_counter() - start, "shard_seconds": _timing(seconds)}
+            results.update((name, merged[name]) for name in table_analyses + ["fraud_scores"] if name in merged)
+            if "reports" in analyses:
+                from report_service import write_pdf, address_list_report
+                start = time.perf_counter()
+                addresses = pd.unique(merged["p2p"]["sender"])
+                write_pdf(address_list_report(addresses), os.path.join(output, "unique_addresses.pdf"))
+                timings["reports"] = time.perf_counter() - start
+                summary["analyses"]["reports"] = {"files": ["unique_addresses.pdf"], "addresses": len(addresses),
+                                                  "seconds": timings["reports"]}
+        block_analyses = [a for a in analyses if a in BLOCK_ANALYSES]
+        if blocks_dir and block_analyses:
+            start = time.perf_counter()
+            paths = sorted(glob.glob(os.path.join(blocks_dir, "*.json")))
+            ranges = [r.tolist() for r in np.array_split(np.array(paths, dtype=object), min(shards, len(paths)))
+                      if len(r)] if paths else []
+            merged, seconds = _run(pool, block_range, [(r, block_analyses) for r in ranges])
+            summary["blocks"] = {"directory": blocks_dir, "files": len(paths), "seconds": time.perf_counter() - start,
+                                 "shard_seconds": _timing(seconds)}
+            results.update(merged)
+
+    for name, frame in results.items():
+        start = time.perf_counter()
+        path = write_result(frame, output, name, output_format)
+        summary["analyses"][name] = {"file": os.path.basename(path), "rows": len(frame),
+                                     "write_seconds": time.perf_counter() - start}
+    # Results an earlier run wrote (other analyses or the other format) would otherwise look current
+    written = {info["file"] for info in summary["analyses"].values() if "file" in info}
+    for name in RESULT_NAMES:
+        for extension in RESULT_EXTENSIONS:
+            stale = os.path.join(output, f"{name}.{extension}")
+            if os.path.basename(stale) not in written and os.path.exists(stale):
+                os.remove(stale)
+    summary["seconds"] = time.perf_counter() - started
+    summary_path = os.path.join(output, SUMMARY_FILE)
+    with open(summary_path + ".tmp", "w") as f:
+        json.dump(summary, f, indent=4)
+    os.replace(summary_path + ".tmp", summary_path)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the dashboard analyses headlessly over full ledgers.")
+    parser.add_argument("--transactions", help="transaction dataset (CSV) to analyse")
+    parser.add_argument("--blocks", help="directory of block JSON dumps to analyse")
+    parser.add_argument("--output", default=BATCH_OUTPUT_DIR, help="directory for the results and summary.json")
+    parser.add_argument("--analyses", default=",".join(TRANSACTION_ANALYSES + BLOCK_ANALYSES),
+                        help="comma-separated subset of: " + ", ".join(TRANSACTION_ANALYSES + BLOCK_ANALYSES))
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    parser.add_argument("--shards", type=int, help=f"shards (default: {SHARDS_PER_WORKER} per worker)")
+    parser.add_argument("--format", choices=["parquet", "json"], default="parquet", help="result file format")
+    args = parser.parse_args(argv)
+    if not args.transactions and not args.blocks:
+        parser.error("give --transactions and / or --blocks")
+    analyses = [a.strip() for a in args.analyses.split(",") if a.strip()]
+    unknown = set(analyses) - set(TRANSACTION_ANALYSES + BLOCK_ANALYSES)
+    if unknown:
+        parser.error(f"unknown analyses: {', '.join(sorted(unknown))}")
+
+    summary = run_batch(args.transactions, args.blocks, args.output, analyses, args.workers, args.shards, args.format)
+    for name, info in summary["analyses"].items():
+        print(f"{name}: {info.get('rows', info.get('addresses'))} rows -> {info.get('file', info.get('files'))}")
+    print(f"Finished in {summary['seconds']:.2f} s with {summary['workers']} workers; "
+          f"timings in {os.path.join(args.output, SUMMARY_FILE)}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
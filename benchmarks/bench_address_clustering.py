@@ -0,0 +1,50 @@
+"""
+Bulk and incremental clustering throughput of AddressClusters over millions of synthetic inputs.
+
+Run with: python -m benchmarks.bench_address_clustering [n_inputs] [n_addresses]
+"""
+import sys
+import time
+import numpy as np
+from address_clustering import AddressClusters
+
+
+def synthetic_spends(n_inputs, n_addresses, seed=42):
+    rng = np.random.default_rng(seed)
+    # 1 to 4 inputs per transaction, addresses drawn with a heavy tail like real reuse
+    tx_ids = np.repeat(np.arange(n_inputs), rng.integers(1, 5, n_inputs))[:n_inputs]
+    address_codes = np.where(rng.random(n_inputs) < 0.2, np.minimum(rng.zipf(1.5, n_inputs), n_addresses) - 1,
+                             rng.integers(0, n_addresses, n_inputs))
+    addresses = np.char.add("bc1q", address_codes.astype(str)).astype(object)
+    return tx_ids, addresses
+
+
+def main():
+    n_inputs = int(sys.argv[1]) if len(sys.argv) > 1 else 2000000
+    n_addresses = int(sys.argv[2]) if len(sys.argv) > 2 else 500000
+    tx_ids, addresses = synthetic_spends(n_inputs, n_addresses)
+
+    clusters = AddressClusters()
+    start = time.perf_counter()
+    clusters.add_spends(tx_ids, addresses)
+    elapsed = time.perf_counter() - start
+    sizes = clusters.sizes()
+    print(f"Bulk: {n_inputs:,} inputs, {len(clusters.addresses):,} addresses -> {len(sizes):,} entities "
+          f"(largest {sizes.iloc[0]:,}) in {elapsed:.2f} s, {n_inputs / elapsed:,.0f} inputs/s")
+
+    # Incremental: blocks of ~6,000 inputs arriving one at a time
+    block_tx, block_addresses = synthetic_spends(6000, n_addresses, seed=7)
+    start = time.perf_counter()
+    for i in range(20):
+        clusters.add_spends(block_tx + i * 10 ** 9, block_addresses)
+    print(f"Incremental: {(time.perf_counter() - start) / 20 * 1e3:.1f} ms per 6,000-input block")
+
+    sample = addresses[:100000].tolist()
+    start = time.perf_counter()
+    for address in sample:
+        clusters.entity(address)
+    print(f"entity(): {(time.perf_counter() - start) / len(sample) * 1e6:.2f} us per lookup")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Memory and latency of the columnar block model against the blockchain.info dict form.
+
+Run with: python -m benchmarks.bench_block_model [block.json]
+Without a recorded block, a synthetic 3,000-transaction block is generated.
+"""
+import sys
+import json
+import time
+import random
+import tracemalloc
+from block_model import ColumnarBlock
+from burst_detector import BurstDetector
+
+
+def synthetic_block(n_transactions=3000, n_addresses=2000, seed=42):
+    rng = random.Random(seed)
+    txs = []
+    for i in range(n_transactions):
+        inputs = [{"prev_out": {"addr": f"bc1q{rng.randrange(n_addresses):038d}", "value": rng.randint(1, 10 ** 9),
+                                "tx_index": rng.getrandbits(48), "n": rng.randint(0, 3)},
+                   "script": "", "witness": "02" + "ab" * 72, "sequence": 4294967295}
+                  for _ in range(rng.randint(1, 3))]
+        outputs = [{"addr": f"bc1q{rng.randrange(n_addresses):038d}", "value": rng.randint(1, 10 ** 9), "n": n,
+                    "script": "0014" + "cd" * 20, "spent": rng.random() < 0.5}
+                   for n in range(rng.randint(1, 4))]
+        txs.append({"hash": f"{rng.getrandbits(256):064x}", "time": 1700000000 + rng.randint(0, 3600),
+                    "inputs": inputs, "out": outputs})
+    return json.dumps({"hash": "00" * 32, "height": 800000, "time": 1700000000, "tx": txs})
+
+
+def dict_walk(block):
+    # What the page functions do per block: every output and input address and value
+    for tx in block.get("tx", []):
+        [(o.get("addr", "N/A"), o.get("value", 0) / 1e8) for o in tx.get("out", [])]
+        [i.get("prev_out", {}).get("addr", "N/A") for i in tx.get("inputs", [])]
+
+
+def columnar_walk(block):
+    block.addresses.lookup(block.out_address)
+    block.out_value / 1e8
+    block.addresses.lookup(block.in_address)
+
+
+def dict_find(block, tx_hash):
+    for tx in block.get("tx", []):
+        if tx.get("hash") == tx_hash:
+            return [o.get("addr", "N/A") for o in tx.get("out", [])]
+
+
+def columnar_find(block, tx_hash):
+    return block.beneficiaries(block.row(tx_hash))
+
+
+def timed(function, *args, repeat=5):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    if len(sys.argv) > 1:
+        with open(sys.argv[1]) as file:
+            text = file.read()
+    else:
+        text = synthetic_block()
+
+    tracemalloc.start()
+    block_dict = json.loads(text)
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # tracemalloc would miss strings the columnar form shares with the dict (hashes, scripts),
+    # so it is measured by what it holds: arrays, its own address table and its strings
+    block = ColumnarBlock.from_json(block_dict)
+    print(f"{len(block)} transactions, {len(block.out_value)} outputs, {len(block.in_value)} inputs")
+    print(f"Memory: dict form {dict_bytes / 1e6:.1f} MB, columnar {block.nbytes / 1e6:.1f} MB (nbytes)")
+    print(f"Parse: json.loads {timed(json.loads, text):.3f} s, "
+          f"to columnar {timed(lambda: ColumnarBlock.from_json(block_dict), repeat=3):.3f} s")
+
+    old = timed(lambda: BurstDetector(min_value=10 ** 8, count=3).process_block(block_dict))
+    new = timed(lambda: block.large_output_bursts(min_value=10 ** 8, count=3))
+    print(f"Burst analysis: dict {old * 1e3:.1f} ms, columnar {new * 1e3:.1f} ms")
+    print(f"All beneficiaries/sources: dict {timed(dict_walk, block_dict) * 1e3:.1f} ms, "
+          f"columnar {timed(columnar_walk, block) * 1e3:.1f} ms")
+    last_hash = block.hashes[-1]
+    print(f"One transaction's beneficiaries by hash: dict {timed(dict_find, block_dict, last_hash) * 1e6:.0f} us, "
+          f"columnar {timed(columnar_find, block, last_hash) * 1e6:.0f} us")
+    print(f"Transaction summary frame: {timed(block.transactions_frame) * 1e3:.1f} ms")
+    assert block.large_output_bursts(10 ** 8, 3) == BurstDetector(10 ** 8, 3).process_block(block_dict)
+
+
+if __name__ == "__main__":
+    main()
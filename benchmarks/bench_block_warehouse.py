@@ -0,0 +1,78 @@
+"""
+Ingestion throughput of the block warehouse, and local lookup latency against re-parsing the block JSON.
+
+Run with: python -m benchmarks.bench_block_warehouse [n_blocks] [txs_per_block] [workers]
+"""
+import os
+import sys
+import json
+import time
+import random
+import tempfile
+from block_warehouse import ingest, Warehouse
+
+
+def write_synthetic_blocks(directory, n_blocks, txs_per_block, seed=42):
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    paths, tx_hashes = [], []
+    for height in range(800000, 800000 + n_blocks):
+        txs = []
+        for i in range(txs_per_block):
+            tx_hash = f"{rng.getrandbits(256):064x}"
+            inputs = [{"prev_out": {"addr": f"bc1q{rng.randrange(100000):06d}", "value": rng.randint(1, 10 ** 8),
+                                    "tx_index": rng.getrandbits(48), "n": rng.randint(0, 3)},
+                       "script": "00" * 36, "witness": "02" + "ab" * 72, "sequence": 4294967295}
+                      for _ in range(rng.randint(1, 3))]
+            outputs = [{"addr": f"bc1q{rng.randrange(100000):06d}", "value": rng.randint(1, 10 ** 8), "n": n,
+                        "script": "0014" + "cd" * 20, "spent": rng.random() < 0.5}
+                       for n in range(rng.randint(1, 4))]
+            txs.append({"hash": tx_hash, "block_height": height, "time": 1700000000 + height, "size": 250,
+                        "fee": rng.randint(0, 10000), "inputs": inputs, "out": outputs})
+            tx_hashes.append(tx_hash)
+        block = {"hash": f"{rng.getrandbits(256):064x}", "height": height, "time": 1700000000 + height,
+                 "size": 250 * txs_per_block, "n_tx": txs_per_block, "prev_block": "00" * 32, "tx": txs}
+        path = os.path.join(directory, f"block-{height}.json")
+        with open(path, "w") as file:
+            json.dump(block, file)
+        paths.append(path)
+    return paths, tx_hashes
+
+
+def main():
+    n_blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    txs_per_block = int(sys.argv[2]) if len(sys.argv) > 2 else 2500
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    with tempfile.TemporaryDirectory() as workdir:
+        paths, tx_hashes = write_synthetic_blocks(os.path.join(workdir, "dumps"), n_blocks, txs_per_block)
+        megabytes = sum(os.path.getsize(p) for p in paths) / 1e6
+        n_ingested, n_txs, seconds = ingest(paths, os.path.join(workdir, "warehouse"), workers)
+        print(f"Ingest: {n_ingested} blocks, {n_txs} transactions, {megabytes:.0f} MB of JSON in {seconds:.2f} s")
+        print(f"        {n_ingested / seconds:.1f} blocks/s, {n_txs / seconds:,.0f} tx/s")
+
+        start = time.perf_counter()
+        warehouse = Warehouse(os.path.join(workdir, "warehouse"))
+        print(f"Load and index: {time.perf_counter() - start:.2f} s")
+
+        sample = random.Random(1).sample(tx_hashes, 1000)
+        start = time.perf_counter()
+        for tx_hash in sample:
+            warehouse.get_transaction(tx_hash)
+        print(f"get_transaction: {(time.perf_counter() - start) / len(sample) * 1e6:.0f} us per lookup")
+
+        start = time.perf_counter()
+        block = warehouse.get_block(800000)
+        print(f"get_block ({len(block['tx'])} txs) from the warehouse: {time.perf_counter() - start:.3f} s")
+        start = time.perf_counter()
+        with open(paths[0]) as file:
+            json.load(file)
+        print(f"json.load of the same block dump: {time.perf_counter() - start:.3f} s")
+
+        start = time.perf_counter()
+        for i in range(1000):
+            warehouse.address_outputs(f"bc1q{i:06d}")
+        print(f"address_outputs: {(time.perf_counter() - start) / 1000 * 1e6:.0f} us per lookup")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Cold-cache vs warm-cache latency of BlockchainClient against the local stub server.
+
+Run with: python -m benchmarks.bench_blockchain_client [recordings_dir] [latency_ms]
+Without a recordings directory, synthetic transactions are generated.
+"""
+import os
+import sys
+import json
+import time
+import random
+import tempfile
+from blockchain_client import BlockchainClient
+from benchmarks.stub_api_server import start_stub_server
+
+
+def write_synthetic_recordings(directory, n_transactions):
+    os.makedirs(os.path.join(directory, "rawtx"), exist_ok=True)
+    hashes = []
+    for i in range(n_transactions):
+        tx_hash = f"{random.getrandbits(256):064x}"
+        tx = {"hash": tx_hash, "block_height": 800000, "time": 1700000000 + i,
+              "inputs": [{"prev_out": {"addr": f"addr{i}", "value": 1000}}],
+              "out": [{"addr": f"addr{i + 1}", "value": 900}]}
+        with open(os.path.join(directory, "rawtx", tx_hash + ".json"), "w") as file:
+            json.dump(tx, file)
+        hashes.append(tx_hash)
+    return hashes
+
+
+def main():
+    latency = float(sys.argv[2]) / 1000 if len(sys.argv) > 2 else 0.02
+    with tempfile.TemporaryDirectory() as workdir:
+        if len(sys.argv) > 1:
+            recordings = sys.argv[1]
+            hashes = [name[:-5] for name in os.listdir(os.path.join(recordings, "rawtx"))]
+        else:
+            recordings = os.path.join(workdir, "recordings")
+            hashes = write_synthetic_recordings(recordings, 200)
+        # Repeat some hashes the way the eval.py suspicious-transaction loop does
+        requested = hashes + random.sample(hashes, len(hashes) // 2)
+        server, url = start_stub_server(recordings, latency=latency)
+
+        serial = BlockchainClient(base_url=url, cache_dir=None)
+        start = time.perf_counter()
+        for tx_hash in requested:
+            serial.get_transaction(tx_hash)
+        serial_time = time.perf_counter() - start
+
+        client = BlockchainClient(base_url=url, cache_dir=os.path.join(workdir, "cache"))
+        start = time.perf_counter()
+        client.fetch_transactions(requested)
+        cold_time = time.perf_counter() - start
+        start = time.perf_counter()
+        client.fetch_transactions(requested)
+        warm_time = time.perf_counter() - start
+        server.shutdown()
+
+    print(f"{len(requested)} lookups ({len(set(requested))} distinct), stub latency {latency * 1000:.0f} ms")
+    print(f"serial, no cache:     {serial_time:8.3f} s")
+    print(f"batch, cold cache:    {cold_time:8.3f} s")
+    print(f"batch, warm cache:    {warm_time:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""
+Throughput of BurstDetector over a large synthetic transaction stream.
+
+Run with: python -m benchmarks.bench_burst_detector [n_transactions] [n_addresses]
+"""
+import sys
+import time
+import random
+from burst_detector import BurstDetector
+
+
+def synthetic_stream(n_transactions, n_addresses, seed=42):
+    rng = random.Random(seed)
+    tx_time = 1700000000
+    for i in range(n_transactions):
+        tx_time += rng.randint(0, 2)
+        outputs = [{"addr": f"addr{rng.randrange(n_addresses)}", "value": rng.randint(0, 100000000)}
+                   for _ in range(rng.randint(1, 3))]
+        yield {"hash": f"{i:064x}", "time": tx_time, "out": outputs}
+
+
+def main():
+    n_transactions = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    n_addresses = int(sys.argv[2]) if len(sys.argv) > 2 else 50000
+    stream = list(synthetic_stream(n_transactions, n_addresses))
+    detector = BurstDetector()
+    start = time.perf_counter()
+    n_alerts = sum(1 for _ in detector.process_stream(stream))
+    elapsed = time.perf_counter() - start
+    print(f"{n_transactions} transactions, {n_addresses} addresses: {n_alerts} alerts")
+    print(f"{elapsed:.2f} s, {n_transactions / elapsed:,.0f} tx/s, {len(detector.recent)} addresses buffered at end")
+
+
+if __name__ == "__main__":
+    main()
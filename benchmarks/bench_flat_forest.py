@@ -0,0 +1,52 @@
+"""
+Load time and p50/p99 scoring latency of the flattened forest against the pickled model.
+
+Run with: python -m benchmarks.bench_flat_forest [batch_rows]
+"""
+import sys
+import time
+import pickle
+import numpy as np
+from flat_forest import FlatForest, FOREST_PATH
+from fraud_scoring import MODEL_PATH, load_forest
+
+
+def latencies(predict, X, repeats):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        predict(X)
+        times.append(time.perf_counter() - start)
+    times = np.array(times) * 1000
+    return np.percentile(times, 50), np.percentile(times, 99)
+
+
+def main():
+    batch_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    # Export (or refresh) the flattened copy before timing its load
+    load_forest()
+    start = time.perf_counter()
+    with open(MODEL_PATH, "rb") as file:
+        model = pickle.load(file)["model"]
+    pickle_load = time.perf_counter() - start
+    start = time.perf_counter()
+    forest = FlatForest.load(FOREST_PATH)
+    forest_load = time.perf_counter() - start
+    print(f"load: pickle {pickle_load * 1000:.1f} ms, flattened {forest_load * 1000:.1f} ms")
+
+    rng = np.random.default_rng(42)
+    X = np.column_stack([rng.uniform(0, 1400, batch_rows), rng.uniform(0, 1000, batch_rows),
+                         rng.integers(0, 100, batch_rows)]).astype(np.float64)
+    expected = model.predict_proba(X)[:, list(model.classes_).index(1)]
+    print(f"identical probabilities: {np.array_equal(expected, forest.predict_proba(X))}")
+
+    sklearn_predict = lambda rows: model.predict_proba(rows)
+    for label, rows, repeats in (("single row", X[:1], 200), (f"{batch_rows} rows", X, 20)):
+        p50, p99 = latencies(sklearn_predict, rows, repeats)
+        print(f"{label:>12} sklearn:   p50 {p50:8.2f} ms  p99 {p99:8.2f} ms")
+        p50, p99 = latencies(forest.predict_proba, rows, repeats)
+        print(f"{label:>12} flattened: p50 {p50:8.2f} ms  p99 {p99:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
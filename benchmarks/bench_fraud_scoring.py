@@ -0,0 +1,47 @@
+"""
+Throughput of fraud_scoring.score in rows per second, for single rows and large batches.
+
+Run with: python -m benchmarks.bench_fraud_scoring [batch_rows]
+"""
+import sys
+import time
+import numpy as np
+import pandas as pd
+from fraud_scoring import load_model, score
+
+
+def synthetic_transactions(n_rows, seed=42):
+    rng = np.random.default_rng(seed)
+    wallets = np.array([f"wallet{i:05d}" for i in range(50000)])
+    return pd.DataFrame({
+        "Sender Wallet": wallets[rng.integers(0, len(wallets), n_rows)],
+        "Amount Transacted": rng.uniform(0, 1000, n_rows).round(2),
+        "Timestamp": pd.Timestamp("2024-11-09") + pd.to_timedelta(rng.integers(0, 30 * 86400, n_rows), unit="s"),
+    })
+
+
+def main():
+    batch_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    start = time.perf_counter()
+    load_model()
+    print(f"model load: {time.perf_counter() - start:.3f} s")
+
+    single = synthetic_transactions(1)
+    latencies = []
+    for _ in range(50):
+        start = time.perf_counter()
+        score(single)
+        latencies.append(time.perf_counter() - start)
+    latencies = np.array(latencies) * 1000
+    print(f"single row: p50 {np.percentile(latencies, 50):.2f} ms, p99 {np.percentile(latencies, 99):.2f} ms, "
+          f"{1000 / latencies.mean():,.0f} rows/s")
+
+    batch = synthetic_transactions(batch_rows)
+    start = time.perf_counter()
+    score(batch)
+    elapsed = time.perf_counter() - start
+    print(f"{batch_rows} rows: {elapsed:.2f} s, {batch_rows / elapsed:,.0f} rows/s")
+
+
+if __name__ == "__main__":
+    main()
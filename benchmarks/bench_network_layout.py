@@ -0,0 +1,38 @@
+"""
+Layout time and Plotly payload size of network_layout versus the number of wallets.
+
+Run with: python -m benchmarks.bench_network_layout [payload_bytes]
+"""
+import sys
+import time
+import numpy as np
+import pandas as pd
+from network_layout import build_layout, network_figure, DEFAULT_PAYLOAD_BYTES
+
+
+def synthetic_transactions(n_wallets, n_rows, seed=42):
+    rng = np.random.default_rng(seed)
+    # Zipf-like activity so a few wallets dominate, as on real ledgers
+    weights = 1.0 / np.arange(1, n_wallets + 1)
+    weights /= weights.sum()
+    senders = rng.choice(n_wallets, n_rows, p=weights)
+    receivers = rng.choice(n_wallets, n_rows, p=weights)
+    return pd.DataFrame({"address": senders.astype(str), "recipient": receivers.astype(str)})
+
+
+def main():
+    payload_bytes = int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_PAYLOAD_BYTES
+    print(f"payload budget: {payload_bytes} bytes")
+    for n_wallets in (1000, 10000, 100000, 1000000):
+        df = synthetic_transactions(n_wallets, n_wallets * 3)
+        start = time.perf_counter()
+        layout = build_layout(df, payload_bytes)
+        elapsed = time.perf_counter() - start
+        fraud_nodes = layout.nodes_of(df["address"].iloc[:100])
+        payload = len(network_figure(layout, fraud_nodes).to_json())
+        print(f"{n_wallets:>8} wallets: layout {elapsed:7.2f} s, {len(layout.labels):>5} nodes, "
+              f"{len(layout.edges):>5} edges, payload {payload:>9,} bytes")
+
+
+if __name__ == "__main__":
+    main()
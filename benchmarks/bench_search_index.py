@@ -0,0 +1,59 @@
+"""
+Build time, memory and query latency of SearchIndex over millions of synthetic keys.
+
+Run with: python -m benchmarks.bench_search_index [n_keys]
+"""
+import sys
+import time
+import random
+import numpy as np
+from search_index import SearchIndex, WALLET, TRANSACTION
+
+ALPHABET = np.frombuffer(b"0123456789abcdefghijklmnopqrstuvwxyz", dtype="S1")
+
+
+def synthetic_keys(n_keys, seed=42):
+    rng = np.random.default_rng(seed)
+    n_wallets = n_keys * 3 // 4
+    wallets = ALPHABET[rng.integers(0, 36, (n_wallets, 34))].view("S34").ravel()
+    transactions = np.char.upper(ALPHABET[rng.integers(0, 36, (n_keys - n_wallets, 10))].view("S10").ravel())
+    keys = np.concatenate([wallets.astype(object), transactions.astype(object)])
+    keys = [key.decode() for key in keys]
+    kinds = np.r_[np.full(n_wallets, WALLET), np.full(n_keys - n_wallets, TRANSACTION)]
+    return keys, kinds
+
+
+def timed_queries(index, queries):
+    start = time.perf_counter()
+    for query in queries:
+        index.search(query)
+    return (time.perf_counter() - start) / len(queries) * 1e3
+
+
+def main():
+    n_keys = int(sys.argv[1]) if len(sys.argv) > 1 else 10000000
+    keys, kinds = synthetic_keys(n_keys)
+    start = time.perf_counter()
+    index = SearchIndex(keys, kinds)
+    elapsed = time.perf_counter() - start
+    main = index.main
+    size = len(main.buffer) + len(main.lower) + main.offsets.nbytes + main.kinds.nbytes + main.trigram_blocks.nbytes
+    print(f"Build: {n_keys:,} keys in {elapsed:.1f} s, index {size / 1e6:.0f} MB")
+
+    rng = random.Random(1)
+    sample = rng.sample(keys, 200)
+    print(f"Exact: {timed_queries(index, sample):.3f} ms per query")
+    print(f"Prefix (6 chars): {timed_queries(index, [k[:6] for k in sample]):.3f} ms per query")
+    print(f"Prefix (2 chars, many hits): {timed_queries(index, [k[:2] for k in sample]):.3f} ms per query")
+    print(f"Substring (3 chars, many hits): {timed_queries(index, [k[10:13] for k in sample[:50]]):.3f} ms per query")
+    print(f"Substring (8 chars, rare): {timed_queries(index, [k[5:13] for k in sample[:20]]):.3f} ms per query")
+
+    start = time.perf_counter()
+    for i in range(10000):
+        index.add(f"newwallet{i:08d}", WALLET)
+    print(f"Incremental add: {(time.perf_counter() - start) / 10000 * 1e6:.1f} us per key")
+    print(f"Prefix with a 10,000-key delta: {timed_queries(index, [k[:6] for k in sample]):.3f} ms per query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Input signatures verified per second, per core and across a process pool, on a synthetic block of
+signed P2PKH and P2WPKH spends (sighash, DER parsing and ECDSA included), against the bare
+cryptography verify call for reference.
+
+Run with: python -m benchmarks.bench_signature_verification [n_transactions] [workers]
+"""
+import os
+import sys
+import time
+import random
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import ec, utils
+from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
+from signature_verification import (SignatureVerifier, Sighasher, Transaction, TxInput, verify_inputs, hash160,
+                                    p2pkh_script, VALID, SIGHASH_ALL, PARALLEL_AFTER_INPUTS)
+
+ALGORITHM = ec.ECDSA(utils.Prehashed(hashes.SHA256()))
+
+
+def _push(data):
+    return bytes([len(data)]) + data
+
+
+def synthetic_block(n_transactions=2000, n_keys=200, seed=7):
+    """Signed transactions (two inputs each, alternating P2PKH and P2WPKH) and what they spend."""
+    rng = random.Random(seed)
+    keys = [ec.generate_private_key(ec.SECP256K1()) for _ in range(n_keys)]
+    pubkeys = [key.public_key().public_bytes(Encoding.X962, PublicFormat.CompressedPoint) for key in keys]
+    transactions, prevouts = [], []
+    for t in range(n_transactions):
+        owners = [rng.randrange(n_keys) for _ in range(2)]
+        spent = []
+        for i, owner in enumerate(owners):
+            key_hash = hash160(pubkeys[owner])
+            script = p2pkh_script(key_hash) if (t + i) % 2 == 0 else b"\x00\x14" + key_hash
+            spent.append((rng.randint(10 ** 4, 10 ** 9), script))
+        inputs = [TxInput(rng.getrandbits(256).to_bytes(32, "little"), rng.randrange(4), b"", 0xffffffff, [])
+                  for _ in owners]
+        outputs = [(rng.randint(10 ** 4, 10 ** 8), p2pkh_script(rng.getrandbits(160).to_bytes(20, "little")))]
+        tx = Transaction(f"{t:064x}", 2, inputs, outputs, 0)
+        sighasher = Sighasher(tx)
+        signed = []
+        for i, owner in enumerate(owners):
+            amount, script = spent[i]
+            if script[0] == 0:
+                digest = sighasher.segwit(i, p2pkh_script(script[2:]), amount, SIGHASH_ALL)
+            else:
+                digest = sighasher.legacy(i, script, SIGHASH_ALL)
+            signature = keys[owner].sign(digest, ALGORITHM) + bytes([SIGHASH_ALL])
+            if script[0] == 0:
+                signed.append(inputs[i]._replace(witness=[signature, pubkeys[owner]]))
+            else:
+                signed.append(inputs[i]._replace(script_sig=_push(signature) + _push(pubkeys[owner])))
+        transactions.append(tx._replace(inputs=signed))
+        prevouts.append(spent)
+    return transactions, prevouts, keys
+
+
+def main():
+    n_transactions = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    transactions, prevouts, keys = synthetic_block(n_transactions)
+    n_inputs = sum(len(tx.inputs) for tx in transactions)
+    print(f"{n_transactions} transactions, {n_inputs} signed inputs")
+
+    public_key = keys[0].public_key()
+    digest = os.urandom(32)
+    signature = keys[0].sign(digest, ALGORITHM)
+    start = time.perf_counter()
+    for _ in range(2000):
+        public_key.verify(signature, digest, ALGORITHM)
+    print(f"bare cryptography ECDSA verify: {2000 / (time.perf_counter() - start):.0f} signatures/s")
+
+    start = time.perf_counter()
+    results = verify_inputs(list(zip(transactions, prevouts)))
+    elapsed = time.perf_counter() - start
+    assert all(result.status == VALID for result in results)
+    print(f"verify_inputs, 1 core: {n_inputs / elapsed:.0f} signatures/s")
+
+    verifier = SignatureVerifier(workers=workers)
+    # The first call also starts the worker processes
+    verifier.verify(transactions[:PARALLEL_AFTER_INPUTS], prevouts[:PARALLEL_AFTER_INPUTS])
+    verifier.results.clear()
+    start = time.perf_counter()
+    results = verifier.verify(transactions, prevouts)
+    elapsed = time.perf_counter() - start
+    assert len(results) == n_inputs and all(result.status == VALID for result in results.values())
+    print(f"SignatureVerifier, {workers} workers: {n_inputs / elapsed:.0f} signatures/s "
+          f"({n_inputs / elapsed / workers:.0f} per core), block checked in {elapsed:.2f} s")
+
+    start = time.perf_counter()
+    verifier.verify(transactions, prevouts)
+    print(f"cached re-check: {(time.perf_counter() - start) * 1e3:.1f} ms")
+
+    tampered = [tx._replace(locktime=1) for tx in transactions[:100]]
+    invalid = sum(result.status != VALID for result in verify_inputs(list(zip(tampered, prevouts[:100]))))
+    print(f"tampered transactions: {invalid} of {sum(len(tx.inputs) for tx in tampered)} inputs rejected")
+
+
+if __name__ == "__main__":
+    main()
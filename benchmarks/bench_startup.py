@@ -0,0 +1,118 @@
+"""
+Cold-start cost of the Streamlit app, each measured in a fresh interpreter: time to import 0.py,
+time to run the home page script once (as `python 0.py`, which Streamlit executes in bare mode
+with default widget values), and time until `streamlit run 0.py` answers its health check.
+Only APIs present in the pinned Streamlit (1.12) are used.
+Pass a git revision to measure that revision as well (checked out in a temporary worktree),
+e.g. the commit before the app was split into per-page modules.
+
+Run with: python -m benchmarks.bench_startup [revision] [repeats]
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import socket
+import tempfile
+import statistics
+import subprocess
+import urllib.request
+
+APP_SCRIPT = "0.py"
+# /healthz up to Streamlit 1.2x, /_stcore/health afterwards
+HEALTH_PATHS = ["/healthz", "/_stcore/health"]
+SERVER_TIMEOUT_SECONDS = 120
+
+IMPORT_PROBE = """
+import sys, time, json, runpy
+start = time.perf_counter()
+runpy.run_path({script!r}, run_name={run_name!r})
+heavy = [m for m in ("pandas", "numpy", "reportlab", "plotly", "qrcode", "cryptography", "requests") if m in sys.modules]
+print(json.dumps({{"seconds": time.perf_counter() - start, "heavy": heavy}}))
+"""
+
+
+def probe(code, directory):
+    result = subprocess.run([sys.executable, "-c", code], cwd=directory, capture_output=True, text=True,
+                            env=dict(os.environ, PYTHONPATH=directory))
+    if result.returncode != 0:
+        return {"error": (result.stderr.strip().splitlines() or ["failed"])[-1]}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def server_probe(directory):
+    """Seconds from `streamlit run` to the first successful health check."""
+    port = free_port()
+    start = time.perf_counter()
+    server = subprocess.Popen([sys.executable, "-m", "streamlit", "run", APP_SCRIPT, "--server.headless", "true",
+                               "--server.port", str(port), "--browser.gatherUsageStats", "false"],
+                              cwd=directory, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                              env=dict(os.environ, PYTHONPATH=directory))
+    try:
+        while time.perf_counter() - start < SERVER_TIMEOUT_SECONDS:
+            if server.poll() is not None:
+                return {"error": (server.stderr.read().decode().strip().splitlines() or ["exited"])[-1]}
+            for path in HEALTH_PATHS:
+                try:
+                    with urllib.request.urlopen(f"http://127.0.0.1:{port}{path}", timeout=1) as response:
+                        if response.status == 200:
+                            return {"seconds": time.perf_counter() - start}
+                except OSError:
+                    pass
+            time.sleep(0.02)
+        return {"error": "no health check answer"}
+    finally:
+        server.terminate()
+        try:
+            server.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            server.kill()
+
+
+def report(label, runs):
+    if "error" in runs[0]:
+        print(f"{label}: failed ({runs[0]['error']})")
+        return None
+    print(f"{label}: {statistics.median(r['seconds'] for r in runs) * 1e3:.0f} ms")
+    return runs[0]
+
+
+def measure(directory, label, repeats):
+    print(f"== {label}")
+    runs = [probe(IMPORT_PROBE.format(script=APP_SCRIPT, run_name="bench_startup"), directory)
+            for _ in range(repeats)]
+    first = report(f"import {APP_SCRIPT}", runs)
+    if first is not None:
+        print(f"  heavy modules loaded: {', '.join(first['heavy']) or 'none'}")
+    runs = [probe(IMPORT_PROBE.format(script=APP_SCRIPT, run_name="__main__"), directory) for _ in range(repeats)]
+    first = report("home page script run (bare mode)", runs)
+    if first is not None:
+        print(f"  heavy modules loaded: {', '.join(first['heavy']) or 'none'}")
+    report("streamlit run until healthy", [server_probe(directory) for _ in range(repeats)])
+
+
+def main():
+    revision = sys.argv[1] if len(sys.argv) > 1 else None
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if revision:
+        worktree = tempfile.mkdtemp()
+        subprocess.run(["git", "worktree", "add", "--detach", worktree, revision], cwd=root, check=True,
+                       capture_output=True)
+        try:
+            measure(worktree, f"revision {revision}", repeats)
+        finally:
+            subprocess.run(["git", "worktree", "remove", "--force", worktree], cwd=root, capture_output=True)
+            shutil.rmtree(worktree, ignore_errors=True)
+    measure(root, "working tree", repeats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Timestamp handling over 10M transactions: the old per-value convert_utc_to_ist (datetime +
+pytz + strftime for every timestamp, timed on a sample and extrapolated) against vectorized
+conversion of int64 epochs to the display time zone, parsing of the CSV timestamp strings,
+and formatting of only the rendered page.
+
+Run with: python -m benchmarks.bench_time_columns [n_timestamps] [n_strings]
+"""
+import sys
+import time
+from datetime import datetime, timezone
+import numpy as np
+import pytz
+from time_columns import to_utc, localize, epoch_ns, format_times
+
+SAMPLE = 100000
+PAGE_ROWS = 50
+
+
+def convert_utc_to_ist(unix_time):
+    # The per-call conversion eval.py used before
+    utc_time = datetime.fromtimestamp(unix_time, timezone.utc).replace(tzinfo=None)
+    ist_time_zone = pytz.timezone('Asia/Kolkata')
+    ist_time = utc_time.replace(tzinfo=pytz.utc).astimezone(ist_time_zone)
+    return ist_time.strftime('%Y-%m-%d %H:%M:%S %Z')
+
+
+def timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return result, time.perf_counter() - start
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 10000000
+    n_strings = int(sys.argv[2]) if len(sys.argv) > 2 else 2000000
+    rng = np.random.default_rng(0)
+    # A year of block times, in epoch seconds
+    epochs = rng.integers(1700000000, 1700000000 + 365 * 86400, size=n, dtype=np.int64)
+
+    sample = epochs[:SAMPLE].tolist()
+    _, seconds = timed(lambda: [convert_utc_to_ist(t) for t in sample])
+    print(f"old convert_utc_to_ist: {seconds / SAMPLE * 1e6:.2f} us per timestamp, "
+          f"{seconds / SAMPLE * n:.1f} s for {n:,} (extrapolated)")
+
+    utc, seconds = timed(to_utc, epochs)
+    print(f"epoch seconds -> datetime64[ns, UTC], {n:,} rows: {seconds:.2f} s")
+    _, seconds = timed(localize, utc)
+    print(f"UTC -> display time zone, {n:,} rows: {seconds:.2f} s")
+    _, seconds = timed(epoch_ns, utc)
+    print(f"stored column -> int64 epoch ns, {n:,} rows: {seconds * 1e3:.1f} ms")
+
+    # Laid out like the Timestamp column of transactions.csv
+    strings = np.datetime_as_string(epochs[:n_strings].astype("datetime64[s]"))
+    strings = np.char.replace(strings, "T", " ").astype(object)
+    parsed, seconds = timed(to_utc, strings)
+    assert (epoch_ns(parsed) == epochs[:n_strings] * 10 ** 9).all()
+    print(f"CSV timestamp strings -> datetime64[ns, UTC], {n_strings:,} rows: {seconds:.2f} s "
+          f"({seconds / n_strings * n:.1f} s per {n:,})")
+
+    page = utc.iloc[n // 2:n // 2 + PAGE_ROWS]
+    _, seconds = timed(format_times, page)
+    print(f"format one rendered page ({PAGE_ROWS} rows): {seconds * 1e3:.2f} ms")
+    _, seconds = timed(format_times, utc.iloc[:SAMPLE])
+    print(f"format every row instead: {seconds / SAMPLE * n:.1f} s for {n:,} (extrapolated)")
+    expected = [convert_utc_to_ist(t) for t in epochs[n // 2:n // 2 + PAGE_ROWS].tolist()]
+    assert format_times(page).tolist() == expected
+
+
+if __name__ == "__main__":
+    main()
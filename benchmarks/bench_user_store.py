@@ -0,0 +1,69 @@
+"""
+Logins per second through UserStore.verify under concurrent sessions, and the cost of the
+old approach (re-parsing user_data.json and comparing plaintext on every click) for reference.
+
+Run with: python -m benchmarks.bench_user_store [n_users] [sessions]
+"""
+import os
+import sys
+import json
+import time
+import random
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from user_store import UserStore, hash_password, LoginBusy
+
+
+def main():
+    n_users = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    sessions = int(sys.argv[2]) if len(sys.argv) > 2 else 32
+    directory = tempfile.mkdtemp()
+    path = os.path.join(directory, "user_data.json")
+    # Hashing every user through register() would take minutes, so the file is written directly
+    stored = hash_password("password")
+    with open(path, "w") as f:
+        json.dump({f"user{i}": stored for i in range(n_users)}, f)
+    store = UserStore(path)
+
+    rng = random.Random(1)
+    attempts = [(f"user{rng.randrange(n_users)}", "password" if rng.random() < 0.9 else "wrong")
+                for _ in range(sessions * 8)]
+    for workers in (1, sessions):
+        busy = 0
+
+        def login(attempt):
+            nonlocal busy
+            try:
+                return store.verify(*attempt)
+            except LoginBusy:
+                busy += 1
+                return False
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as sessions_pool:
+            results = list(sessions_pool.map(login, attempts))
+        elapsed = time.perf_counter() - start
+        print(f"{workers:3d} concurrent sessions: {len(attempts) / elapsed:.1f} logins/s "
+              f"({sum(results)} accepted, {busy} turned away as busy)")
+
+    n_checks = 2000
+    plaintext = {f"user{i}": "password" for i in range(n_users)}
+    with open(path + ".plain", "w") as f:
+        json.dump(plaintext, f, indent=4)
+    start = time.perf_counter()
+    for i in range(n_checks):
+        username, password = attempts[i % len(attempts)]
+        with open(path + ".plain") as f:
+            users = json.load(f)
+        users.get(username) == password
+    elapsed = time.perf_counter() - start
+    print(f"old JSON re-parse per login ({n_users} users): {elapsed / n_checks * 1e3:.2f} ms per login")
+
+    start = time.perf_counter()
+    for i in range(200):
+        "user1" in store
+    print(f"cached user lookup: {(time.perf_counter() - start) / 200 * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
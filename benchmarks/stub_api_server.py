@@ -0,0 +1,60 @@
+"""
+Local stand-in for blockchain.info that replays recorded JSON.
+
+Recordings live in <directory>/block/<hash>.json and <directory>/rawtx/<hash>.json.
+Run with: python -m benchmarks.stub_api_server <directory> [port] [latency_ms]
+and set BLOCKCHAIN_API_URL=http://127.0.0.1:<port> before starting the app.
+"""
+import os
+import sys
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+
+def make_handler(directory, latency):
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            parts = urlparse(self.path).path.strip("/").split("/")
+            path = os.path.join(directory, *parts) + ".json" if len(parts) == 2 else None
+            if latency:
+                time.sleep(latency)
+            if path is None or not os.path.isfile(path):
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            with open(path, "rb") as file:
+                body = file.read()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return StubHandler
+
+
+def start_stub_server(directory, port=0, latency=0.0):
+    """Starts the stub server in a daemon thread and returns (server, base_url)."""
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(directory, latency))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 8000
+    latency = float(sys.argv[3]) / 1000 if len(sys.argv) > 3 else 0.0
+    server, url = start_stub_server(sys.argv[1], port, latency)
+    print(f"Replaying {sys.argv[1]} at {url}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
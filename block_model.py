@@ -0,0 +1,248 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from burst_detector import BurstAlert, LARGE_AMOUNT_SATOSHI, BURST_COUNT, BURST_WINDOW_SECONDS
+
+SATOSHI_PER_BTC = 100000000
+# Parsed blocks kept in memory across Streamlit reruns
+MAX_CACHED_BLOCKS = 16
+
+
+class AddressTable:
+    """Interned address strings of one block (freed with it); the block stores int32 codes into it."""
+
+    def __init__(self):
+        self.codes = {}
+        self.addresses = []
+        self.lock = threading.Lock()
+
+    def intern(self, addresses):
+        """Codes of `addresses` (None -> -1), adding unseen ones to the table."""
+        codes = np.empty(len(addresses), dtype=np.int32)
+        with self.lock:
+            for i, address in enumerate(addresses):
+                if address is None:
+                    codes[i] = -1
+                    continue
+                code = self.codes.get(address)
+                if code is None:
+                    code = self.codes[address] = len(self.addresses)
+                    self.addresses.append(address)
+                codes[i] = code
+        return codes
+
+    def lookup(self, codes):
+        """Address strings of `codes` ("N/A" for -1)."""
+        return [self.addresses[code] if code >= 0 else "N/A" for code in np.asarray(codes).tolist()]
+
+    @property
+    def nbytes(self):
+        """Approximate bytes held by the interned strings."""
+        return sum(len(address) + 49 for address in self.addresses)
+
+
+def _offsets(counts):
+    offsets = np.zeros(len(counts) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return offsets
+
+
+class ColumnarBlock:
+    """
+    A parsed block as flat NumPy arrays: one row per transaction, output and input, with
+    CSR offsets from each transaction to its inputs and outputs and interned address codes.
+    """
+
+    def __init__(self, header, transactions, addresses=None):
+        self.header = {key: value for key, value in header.items() if key != "tx"}
+        self.addresses = addresses if addresses is not None else AddressTable()
+        hashes, times, n_inputs, n_outputs = [], [], [], []
+        out_value, out_addr, out_n, out_spent = [], [], [], []
+        in_value, in_addr, in_prev_tx, in_prev_n, in_prev_script, scripts, witnesses = [], [], [], [], [], [], []
+        for tx in transactions:
+            hashes.append(tx.get("hash"))
+            times.append(tx.get("time") or 0)
+            tx_inputs, tx_outputs = tx.get("inputs", []), tx.get("out", [])
+            n_inputs.append(len(tx_inputs))
+            n_outputs.append(len(tx_outputs))
+            for output in tx_outputs:
+                out_value.append(output.get("value", 0))
+                out_addr.append(output.get("addr"))
+                out_n.append(output.get("n", len(out_n)))
+                out_spent.append(bool(output.get("spent", False)))
+            for tx_input in tx_inputs:
+                prev_out = tx_input.get("prev_out") or {}
+                in_value.append(prev_out.get("value", 0))
+                in_addr.append(prev_out.get("addr"))
+                in_prev_tx.append(prev_out.get("tx_index", -1))
+                in_prev_n.append(prev_out.get("n", -1))
+                in_prev_script.append(prev_out.get("script"))
+                scripts.append(tx_input.get("script", "No scriptSig available"))
+                witnesses.append(tx_input.get("witness"))
+
+        self.hashes = np.array(hashes, dtype=object)
+        self.times = np.array(times, dtype=np.int64)
+        self.output_offsets = _offsets(np.array(n_outputs, dtype=np.int64))
+        self.input_offsets = _offsets(np.array(n_inputs, dtype=np.int64))
+        self.out_value = np.array(out_value, dtype=np.int64)
+        self.out_address = self.addresses.intern(out_addr)
+        self.out_tx = np.repeat(np.arange(len(hashes), dtype=np.int32), n_outputs)
+        self.out_n = np.array(out_n, dtype=np.int32)
+        self.out_spent = np.array(out_spent, dtype=bool)
+        self.in_value = np.array(in_value, dtype=np.int64)
+        self.in_address = self.addresses.intern(in_addr)
+        self.in_tx = np.repeat(np.arange(len(hashes), dtype=np.int32), n_inputs)
+        self.in_prev_tx = np.array(in_prev_tx, dtype=np.int64)
+        self.in_prev_n = np.array(in_prev_n, dtype=np.int32)
+        self.in_prev_script = np.array(in_prev_script, dtype=object)
+        self.in_script = np.array(scripts, dtype=object)
+        self.in_witness = np.array(witnesses, dtype=object)
+        self._rows = None
+
+    @classmethod
+    def from_json(cls, block_info, addresses=None):
+        """Builds the columnar form of a blockchain.info block dict."""
+        return cls(block_info, block_info.get("tx", []), addresses)
+
+    @classmethod
+    def from_file(cls, path, addresses=None):
+        """Builds the columnar form straight from a block JSON file, never holding the dict form."""
+        from block_warehouse import stream_block
+        transactions = stream_block(path)
+        header = {}
+
+        def body():
+            for item in transactions:
+                if isinstance(item, tuple):
+                    header.update(item[1])
+                    return
+                yield item
+
+        block = cls({}, body(), addresses)
+        block.header = {key: value for key, value in header.items() if key != "tx"}
+        return block
+
+    def __len__(self):
+        return len(self.hashes)
+
+    @property
+    def nbytes(self):
+        """Bytes held by the block: arrays, interned addresses and hash, script and witness strings."""
+        total = sum(value.nbytes for value in vars(self).values() if isinstance(value, np.ndarray))
+        strings = [self.hashes, self.in_script, self.in_witness, self.in_prev_script]
+        return total + self.addresses.nbytes + sum(len(s) + 49 for array in strings for s in array.tolist()
+                                                   if isinstance(s, str))
+
+    def row(self, tx_hash):
+        """Row of the transaction `tx_hash` in this block, or -1."""
+        if self._rows is None:
+            self._rows = {tx_hash: row for row, tx_hash in enumerate(self.hashes.tolist())}
+        return self._rows.get(tx_hash.strip(), -1)
+
+    def _outputs(self, row):
+        return slice(self.output_offsets[row], self.output_offsets[row + 1])
+
+    def _inputs(self, row):
+        return slice(self.input_offsets[row], self.input_offsets[row + 1])
+
+    def is_mining(self, row):
+        return self.input_offsets[row + 1] == self.input_offsets[row]
+
+    def beneficiaries(self, row):
+        """(address, BTC amount) of every output of the transaction at `row`."""
+        outputs = self._outputs(row)
+        return list(zip(self.addresses.lookup(self.out_address[outputs]),
+                        (self.out_value[outputs] / SATOSHI_PER_BTC).tolist()))
+
+    def sources(self, row):
+        """Spent-from addresses of the transaction at `row`."""
+        return self.addresses.lookup(self.in_address[self._inputs(row)])
+
+    def prevouts(self, row):
+        """(amount in satoshi, scriptPubKey hex or None) spent by every input of the transaction at `row`."""
+        inputs = self._inputs(row)
+        return list(zip(self.in_value[inputs].tolist(), self.in_prev_script[inputs].tolist()))
+
+    def scriptsigs(self, row):
+        return self.in_script[self._inputs(row)].tolist()
+
+    def witnesses(self, row):
+        """(input number, witness) of the inputs of the transaction at `row` that carry a witness."""
+        witnesses = self.in_witness[self._inputs(row)].tolist()
+        return [(i, witness) for i, witness in enumerate(witnesses) if witness is not None]
+
+    def transactions_frame(self):
+        """One row per transaction: hash, time, input/output counts and totals in satoshi."""
+        n_tx = len(self)
+        return pd.DataFrame({
+            "hash": self.hashes,
+            "time": self.times,
+            "n_inputs": np.diff(self.input_offsets),
+            "n_outputs": np.diff(self.output_offsets),
+            "input_value": np.bincount(self.in_tx, weights=self.in_value, minlength=n_tx).astype(np.int64),
+            "output_value": np.bincount(self.out_tx, weights=self.out_value, minlength=n_tx).astype(np.int64),
+        })
+
+    def large_output_bursts(self, min_value=LARGE_AMOUNT_SATOSHI, count=BURST_COUNT, window=BURST_WINDOW_SECONDS):
+        """
+        Vectorized BurstDetector.process_block: each time an address receives `count` outputs
+        above `min_value` within `window` seconds (once per burst, an address alerting again only
+        after a window without outputs), in the order the alerts would fire.
+        """
+        selected = np.flatnonzero((self.out_value > min_value) & (self.out_address >= 0))
+        if len(selected) < count:
+            return []
+        # Transactions are visited in (stable) time order, outputs in block order within each
+        tx_rank = np.empty(len(self), dtype=np.int64)
+        tx_rank[np.argsort(self.times, kind="stable")] = np.arange(len(self))
+        event_order = tx_rank[self.out_tx[selected]] * (len(self.out_value) + 1) + selected
+        selected = selected[np.argsort(event_order, kind="stable")]
+        address = self.out_address[selected]
+        by_address = np.argsort(address, kind="stable")
+        events = selected[by_address]
+        address = address[by_address]
+        times = self.times[self.out_tx[events]]
+
+        # Event j fires if the `count` events ending at j belong to one address and fit in the window
+        first = np.arange(len(events)) - (count - 1)
+        valid = first >= 0
+        valid[valid] = (address[first[valid]] == address[valid]) & \
+                       (times[valid] - times[first[valid]] <= window)
+        fired = np.flatnonzero(valid)
+        # Only the first alert per address and session (alert_once): a session ends once the address
+        # has had no output for `window` seconds, which is when the streaming detector forgets it
+        session = np.cumsum(np.r_[True, (address[1:] != address[:-1]) | (times[1:] - times[:-1] > window)])
+        fired = fired[np.r_[True, session[fired[1:]] != session[fired[:-1]]]] if len(fired) else fired
+        fired = fired[np.argsort(by_address[fired], kind="stable")]
+        alerts = []
+        for end in fired.tolist():
+            window_events = events[end - count + 1:end + 1]
+            alerts.append(BurstAlert(self.addresses.addresses[address[end]],
+                                     self.hashes[self.out_tx[window_events]].tolist(),
+                                     self.out_value[window_events].tolist(),
+                                     self.times[self.out_tx[window_events]].tolist()))
+        return alerts
+
+
+_blocks = OrderedDict()
+_blocks_lock = threading.Lock()
+
+
+def get_block_model(block_hash, fetch):
+    """
+    Returns the columnar form of `block_hash`, calling `fetch(block_hash)` (which returns a block
+    dict) only when it is not among the MAX_CACHED_BLOCKS most recent blocks. Pass the actual
+    fetch, not an already fetched block, so that a cached block saves the request.
+    """
+    key = block_hash.strip()
+    with _blocks_lock:
+        if key in _blocks:
+            _blocks.move_to_end(key)
+            return _blocks[key]
+    block = ColumnarBlock.from_json(fetch(key))
+    with _blocks_lock:
+        _blocks[key] = block
+        while len(_blocks) > MAX_CACHED_BLOCKS:
+            _blocks.popitem(last=False)
+    return block
@@ -0,0 +1,367 @@
+"""
+Local warehouse of blockchain.info block JSON.
+
+Recorded block dumps (one JSON document per file, as returned by /block/<hash>?format=json)
+are streamed transaction by transaction in a process pool and written as normalized Parquet
+tables: blocks, txs, inputs and outputs, with satoshi values as int64. The Warehouse class
+loads the tables with hash, address and height indexes so blocks and transactions can be
+served locally in blockchain.info's JSON shape.
+
+Run with: python block_warehouse.py <dumps_dir> [warehouse_dir] [workers]
+"""
+import os
+import sys
+import glob
+import json
+import time
+import threading
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+WAREHOUSE_DIR = os.environ.get("BLOCK_WAREHOUSE_DIR", "warehouse")
+TABLES = ["blocks", "txs", "inputs", "outputs"]
+# Transactions buffered per Parquet part while a block is streamed
+FLUSH_EVERY_TXS = 2000
+READ_CHUNK_BYTES = 1 << 20
+
+BLOCK_FIELDS = ["hash", "height", "time", "size", "n_tx", "prev_block", "mrkl_root", "fee", "weight"]
+
+
+class _Reader:
+    """Buffered character reader over a text file, refilled on demand."""
+
+    def __init__(self, file):
+        self.file = file
+        self.buffer = ""
+        self.position = 0
+        self.eof = False
+
+    def more(self):
+        data = self.file.read(READ_CHUNK_BYTES)
+        if not data:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.position:] + data
+        self.position = 0
+        return True
+
+    def peek(self):
+        while self.position >= len(self.buffer):
+            if not self.more():
+                return ""
+        return self.buffer[self.position]
+
+    def skip_whitespace(self, also=""):
+        while True:
+            char = self.peek()
+            if not char or not (char.isspace() or char in also):
+                return char
+            self.position += 1
+
+
+def stream_block(path):
+    """
+    Yields the transactions of a block JSON file one at a time, without loading the whole document,
+    and finally yields ("header", fields) with the block's other top-level fields.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as file:
+        reader = _Reader(file)
+        header_text = []
+        depth, in_string, escaped, key = 0, False, False, []
+        found = False
+        # Scan the top level until the "tx" key, tracking nesting and strings
+        while not found:
+            char = reader.peek()
+            if not char:
+                break
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif char == "\\":
+                    escaped = True
+                elif char == '"':
+                    in_string = False
+                    found = depth == 1 and "".join(key) == "tx"
+                else:
+                    key.append(char)
+            elif char == '"':
+                in_string, key = True, []
+            elif char in "{[":
+                depth += 1
+            elif char in "}]":
+                depth -= 1
+            reader.position += 1
+            if reader.position >= len(reader.buffer):
+                # Keep the consumed header text before the buffer is refilled
+                header_text.append(reader.buffer)
+                reader.buffer, reader.position = "", 0
+        header_text.append(reader.buffer[:reader.position])
+        reader.buffer, reader.position = reader.buffer[reader.position:], 0
+        if found:
+            reader.skip_whitespace(":")
+            reader.position += 1  # the opening "["
+            while reader.skip_whitespace(",") not in ("]", ""):
+                while True:
+                    try:
+                        tx, end = decoder.raw_decode(reader.buffer, reader.position)
+                        break
+                    except json.JSONDecodeError:
+                        if not reader.more():
+                            raise
+                reader.position = end
+                yield tx
+            reader.position += 1
+            header_text.append(": []")
+        rest = reader.buffer[reader.position:] + file.read()
+        yield "header", json.loads("".join(header_text) + rest)
+
+
+class _TableWriter:
+    """Column buffers for one block, flushed to Parquet parts every FLUSH_EVERY_TXS transactions."""
+
+    def __init__(self, directory, key):
+        self.directory = directory
+        self.key = key
+        self.part = 0
+        self.columns = {table: {} for table in TABLES}
+
+    def add(self, table, row):
+        columns = self.columns[table]
+        if not columns:
+            columns.update({name: [] for name in row})
+        for name, value in row.items():
+            columns[name].append(value)
+
+    def flush(self):
+        for table, columns in self.columns.items():
+            if columns and next(iter(columns.values())):
+                frame = pd.DataFrame(columns)
+                for name in ("value", "height", "block_height", "time", "size", "n", "tx_position",
+                             "prev_tx_index", "prev_n", "fee"):
+                    if name in frame.columns:
+                        frame[name] = pd.to_numeric(frame[name]).fillna(-1).astype(np.int64)
+                folder = os.path.join(self.directory, table)
+                os.makedirs(folder, exist_ok=True)
+                frame.to_parquet(os.path.join(folder, f"{self.key}-{self.part:04d}.parquet"), index=False)
+                self.columns[table] = {}
+        self.part += 1
+
+
+def ingest_block_file(path, directory):
+    """Streams one block dump into the warehouse tables. Returns the number of transactions."""
+    key = os.path.splitext(os.path.basename(path))[0]
+    writer = _TableWriter(directory, key)
+    n_txs = 0
+    height = -1
+    for item in stream_block(path):
+        if isinstance(item, tuple):
+            header = item[1]
+            block = {field: header.get(field) for field in BLOCK_FIELDS}
+            if block["height"] is None:
+                block["height"] = height
+            writer.add("blocks", block)
+            break
+        tx = item
+        tx_hash = tx.get("hash")
+        height = tx.get("block_height", height)
+        writer.add("txs", {"hash": tx_hash, "block_height": height,
+                           "tx_position": n_txs, "time": tx.get("time"), "size": tx.get("size"),
+                           "fee": tx.get("fee"), "n_inputs": len(tx.get("inputs", [])),
+                           "n_outputs": len(tx.get("out", []))})
+        for n, tx_input in enumerate(tx.get("inputs", [])):
+            prev_out = tx_input.get("prev_out") or {}
+            writer.add("inputs", {"tx_hash": tx_hash, "n": n, "addr": prev_out.get("addr"),
+                                  "value": prev_out.get("value"), "prev_tx_index": prev_out.get("tx_index"),
+                                  "prev_n": prev_out.get("n"), "script": tx_input.get("script"),
+                                  "witness": tx_input.get("witness"), "sequence": tx_input.get("sequence")})
+        for output in tx.get("out", []):
+            writer.add("outputs", {"tx_hash": tx_hash, "n": output.get("n"), "addr": output.get("addr"),
+                                   "value": output.get("value"), "script": output.get("script"),
+                                   "spent": bool(output.get("spent", False))})
+        n_txs += 1
+        if n_txs % FLUSH_EVERY_TXS == 0:
+            writer.flush()
+    writer.flush()
+    return n_txs
+
+
+def ingest(dump_paths, directory=WAREHOUSE_DIR, workers=None):
+    """
+    Ingests block dumps in a process pool. Returns (blocks, transactions, seconds).
+    Re-ingesting a file replaces its parts.
+    """
+    dump_paths = list(dump_paths)
+    for path in dump_paths:
+        key = os.path.splitext(os.path.basename(path))[0]
+        for table in TABLES:
+            for part in glob.glob(os.path.join(directory, table, f"{key}-*.parquet")):
+                os.remove(part)
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        n_txs = sum(pool.map(ingest_block_file, dump_paths, [directory] * len(dump_paths), chunksize=4))
+    return len(dump_paths), n_txs, time.perf_counter() - start
+
+
+def _read_table(directory, table):
+    parts = sorted(glob.glob(os.path.join(directory, table, "*.parquet")))
+    if not parts:
+        return pd.DataFrame()
+    return pd.concat([pd.read_parquet(part) for part in parts], ignore_index=True)
+
+
+def _csr(codes, n_groups):
+    """Row order grouped by code, and group offsets into it. Codes equal to n_groups are left out."""
+    order = np.argsort(codes, kind="stable")
+    offsets = np.zeros(n_groups + 1, dtype=np.int64)
+    np.cumsum(np.bincount(codes, minlength=n_groups + 1)[:n_groups], out=offsets[1:])
+    return offsets, order
+
+
+class Warehouse:
+    """The warehouse tables in memory, with indexes on tx hash, block hash/height and address."""
+
+    def __init__(self, directory=WAREHOUSE_DIR):
+        self.directory = directory
+        self.blocks = _read_table(directory, "blocks")
+        self.txs = _read_table(directory, "txs")
+        self.inputs = _read_table(directory, "inputs")
+        self.outputs = _read_table(directory, "outputs")
+        if not self.txs.empty:
+            self.txs = self.txs.sort_values(["block_height", "tx_position"], kind="stable", ignore_index=True)
+        self.tx_index = pd.Index(self.txs["hash"] if not self.txs.empty else [])
+        self.block_index = pd.Index(self.blocks["hash"] if not self.blocks.empty else [])
+        self.height_index = pd.Index(self.blocks["height"] if not self.blocks.empty else [])
+        n_txs = len(self.txs)
+        self._arrays = {table: {name: frame[name].to_numpy() for name in frame.columns}
+                        for table, frame in (("txs", self.txs), ("inputs", self.inputs), ("outputs", self.outputs))}
+
+        # Inputs and outputs grouped by transaction row (CSR)
+        self.input_offsets, self.input_order = _csr(self._tx_rows(self.inputs), n_txs)
+        self.output_offsets, self.output_order = _csr(self._tx_rows(self.outputs), n_txs)
+
+        # Output and input rows grouped by address (CSR over factorized addresses)
+        addresses = pd.concat([self.outputs.get("addr", pd.Series(dtype=object)),
+                               self.inputs.get("addr", pd.Series(dtype=object))], ignore_index=True)
+        codes, self.addresses = pd.factorize(addresses)
+        self.address_index = pd.Index(self.addresses)
+        n_outputs, n_addresses = len(self.outputs), len(self.addresses)
+        codes = np.where(codes >= 0, codes, n_addresses)
+        self.address_output_offsets, self.address_output_order = _csr(codes[:n_outputs], n_addresses)
+        self.address_input_offsets, self.address_input_order = _csr(codes[n_outputs:], n_addresses)
+        # Block row -> range of its transactions (txs are sorted by height and position)
+        heights = self.txs["block_height"].to_numpy() if n_txs else np.empty(0, dtype=np.int64)
+        self.block_tx_start = np.searchsorted(heights, self.blocks["height"].to_numpy()) if n_txs else None
+        self.block_tx_end = np.searchsorted(heights, self.blocks["height"].to_numpy(), side="right") if n_txs \
+            else None
+
+    def _tx_rows(self, table):
+        if table.empty:
+            return np.empty(0, dtype=np.int64)
+        rows = self.tx_index.get_indexer(table["tx_hash"])
+        return np.where(rows >= 0, rows, len(self.tx_index))
+
+    def __len__(self):
+        return len(self.blocks)
+
+    def _rows(self, table, offsets, order, group):
+        rows = order[offsets[group]:offsets[group + 1]]
+        return table.iloc[rows]
+
+    def _slice(self, table, offsets, order, group):
+        # Plain Python lists of every column for one group; much cheaper than DataFrame row access
+        rows = order[offsets[group]:offsets[group + 1]]
+        return {name: values[rows].tolist() for name, values in self._arrays[table].items()}
+
+    def _transaction_dict(self, row):
+        tx = {name: values[row].item() if hasattr(values[row], "item") else values[row]
+              for name, values in self._arrays["txs"].items()}
+        inputs = self._slice("inputs", self.input_offsets, self.input_order, row)
+        outputs = self._slice("outputs", self.output_offsets, self.output_order, row)
+        return {
+            "hash": tx["hash"], "block_height": tx["block_height"], "time": tx["time"],
+            "size": tx["size"], "fee": tx["fee"],
+            "inputs": [{"prev_out": {"addr": addr, "value": value, "tx_index": tx_index, "n": n} if value >= 0 else {},
+                        "script": script, "witness": witness, "sequence": sequence}
+                       for addr, value, tx_index, n, script, witness, sequence in
+                       zip(inputs["addr"], inputs["value"], inputs["prev_tx_index"], inputs["prev_n"],
+                           inputs["script"], inputs["witness"], inputs["sequence"])],
+            "out": [{"addr": addr, "value": value, "n": n, "script": script, "spent": spent}
+                    for addr, value, n, script, spent in
+                    zip(outputs["addr"], outputs["value"], outputs["n"], outputs["script"], outputs["spent"])],
+        }
+
+    @staticmethod
+    def _lookup(index, key):
+        try:
+            row = index.get_loc(key)
+        except KeyError:
+            return -1
+        return row if isinstance(row, int) else -1
+
+    def get_transaction(self, tx_hash):
+        """The transaction in blockchain.info /rawtx JSON shape, or None if it is not in the warehouse."""
+        row = self._lookup(self.tx_index, tx_hash.strip())
+        return None if row < 0 else self._transaction_dict(row)
+
+    def _block_row(self, block_hash_or_height):
+        if isinstance(block_hash_or_height, str):
+            return self._lookup(self.block_index, block_hash_or_height.strip())
+        return self._lookup(self.height_index, block_hash_or_height)
+
+    def get_block(self, block_hash_or_height):
+        """The block in blockchain.info /block JSON shape, or None if it is not in the warehouse."""
+        row = self._block_row(block_hash_or_height)
+        if row < 0:
+            return None
+        block = {field: self.blocks[field].iloc[row] for field in BLOCK_FIELDS if field in self.blocks.columns}
+        block = {k: (v.item() if hasattr(v, "item") else v) for k, v in block.items()}
+        tx_rows = range(self.block_tx_start[row], self.block_tx_end[row]) if self.block_tx_start is not None else []
+        block["tx"] = [self._transaction_dict(tx_row) for tx_row in tx_rows]
+        return block
+
+    def address_outputs(self, address):
+        """Outputs paid to `address`, across every ingested block."""
+        code = self._lookup(self.address_index, address)
+        if code < 0:
+            return self.outputs.iloc[0:0]
+        return self._rows(self.outputs, self.address_output_offsets, self.address_output_order, code)
+
+    def address_inputs(self, address):
+        """Inputs spending from `address`, across every ingested block."""
+        code = self._lookup(self.address_index, address)
+        if code < 0:
+            return self.inputs.iloc[0:0]
+        return self._rows(self.inputs, self.address_input_offsets, self.address_input_order, code)
+
+
+_warehouses = {}
+_lock = threading.Lock()
+
+
+def _warehouse_version(directory):
+    # Adding or replacing parts changes the table directories' mtimes
+    return tuple(os.stat(os.path.join(directory, table)).st_mtime_ns
+                 if os.path.isdir(os.path.join(directory, table)) else 0 for table in TABLES)
+
+
+def get_warehouse(directory=WAREHOUSE_DIR):
+    """Returns the process-wide warehouse for `directory` (reloaded when parts change), or None if empty."""
+    if not os.path.isdir(directory):
+        return None
+    version = _warehouse_version(directory)
+    with _lock:
+        cached = _warehouses.get(directory)
+        if cached is None or cached[0] != version:
+            cached = _warehouses[directory] = (version, Warehouse(directory) if any(version) else None)
+        return cached[1]
+
+
+if __name__ == "__main__":
+    dumps = sorted(glob.glob(os.path.join(sys.argv[1], "*.json")))
+    target = sys.argv[2] if len(sys.argv) > 2 else WAREHOUSE_DIR
+    workers = int(sys.argv[3]) if len(sys.argv) > 3 else None
+    n_blocks, n_txs, seconds = ingest(dumps, target, workers)
+    print(f"Ingested {n_blocks} blocks ({n_txs} transactions) in {seconds:.2f} s: "
+          f"{n_blocks / seconds:.1f} blocks/s, {n_txs / seconds:,.0f} tx/s")
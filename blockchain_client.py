@@ -0,0 +1,128 @@
+import os
+import json
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from block_warehouse import WAREHOUSE_DIR, get_warehouse
+
+# Point this at a local stub server (see benchmarks/stub_api_server.py) to replay recorded JSON offline
+API_BASE_URL = os.environ.get("BLOCKCHAIN_API_URL", "https://blockchain.info")
+CACHE_DIR = os.environ.get("BLOCKCHAIN_CACHE_DIR", ".api_cache")
+
+
+class BlockchainClient:
+    """
+    Shared blockchain.info client: one pooled keep-alive session, bounded concurrency,
+    retries with backoff and an on-disk cache of immutable block and transaction JSON.
+    Blocks and transactions ingested into the local warehouse (see block_warehouse.py) are
+    served from it without any request.
+    """
+
+    def __init__(self, base_url=API_BASE_URL, cache_dir=CACHE_DIR, max_connections=8, timeout=10, retries=3,
+                 warehouse_dir=WAREHOUSE_DIR):
+        self.base_url = base_url.rstrip("/")
+        self.cache_dir = cache_dir
+        self.warehouse_dir = warehouse_dir
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_connections)
+        self.session = requests.Session()
+        retry = Retry(total=retries, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=["GET"])
+        adapter = HTTPAdapter(pool_connections=max_connections, pool_maxsize=max_connections, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _cache_path(self, kind, key):
+        # Block and tx hashes already address their content; hash anything else into a safe file name
+        key = key.strip().lower()
+        if not key or not all(c in "0123456789abcdef" for c in key):
+            key = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, kind, key[-2:], key + ".json")
+
+    def _read_cache(self, path):
+        try:
+            with open(path, "r") as file:
+                return json.load(file)
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _write_cache(self, path, data):
+        if self.cache_dir is None:
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(data, file)
+        os.replace(tmp_path, path)
+
+    def _local(self, kind, key):
+        warehouse = get_warehouse(self.warehouse_dir) if self.warehouse_dir else None
+        if warehouse is None:
+            return None
+        return warehouse.get_block(key) if kind == "block" else warehouse.get_transaction(key)
+
+    def _get(self, kind, key, cacheable, response_format="json"):
+        data = self._local(kind, key) if response_format == "json" else None
+        if data is not None:
+            return data
+        path = self._cache_path(kind, key) if self.cache_dir else None
+        if path:
+            data = self._read_cache(path)
+            if data is not None:
+                return data
+        with self._slots:
+            response = self.session.get(f"{self.base_url}/{kind}/{key.strip()}", params={"format": response_format},
+                                        timeout=self.timeout)
+        response.raise_for_status()
+        data = response.json() if response_format == "json" else response.text.strip()
+        if path and cacheable(data):
+            self._write_cache(path, data)
+        return data
+
+    def get_block(self, block_hash):
+        """Returns the block JSON for `block_hash`. Raises requests exceptions on failure."""
+        return self._get("block", block_hash, lambda data: True)
+
+    def get_raw_block(self, block_hash):
+        """Returns the serialized block `block_hash` as hex (what signature verification needs)."""
+        return self._get("rawblock", block_hash, lambda data: True, response_format="hex")
+
+    def get_transaction(self, tx_hash):
+        """Returns the transaction JSON for `tx_hash`. Only confirmed transactions are cached."""
+        return self._get("rawtx", tx_hash, lambda data: data.get("block_height") is not None)
+
+    def fetch_transactions(self, hashes, max_workers=None):
+        """
+        Fetches many transactions in parallel, requesting each distinct hash once.
+        Returns a dict of hash -> transaction JSON (None for hashes that failed).
+        """
+        unique_hashes = list(dict.fromkeys(h.strip() for h in hashes))
+        results = {}
+
+        def fetch(tx_hash):
+            try:
+                return self.get_transaction(tx_hash)
+            except requests.exceptions.RequestException:
+                return None
+
+        with ThreadPoolExecutor(max_workers=max_workers or self.max_connections) as pool:
+            for tx_hash, data in zip(unique_hashes, pool.map(fetch, unique_hashes)):
+                results[tx_hash] = data
+        return results
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Returns the process-wide client shared by every Streamlit session."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = BlockchainClient()
+        return _client
@@ -0,0 +1,90 @@
+from collections import deque, namedtuple
+
+# An address that received `count` large outputs within `window` seconds
+BurstAlert = namedtuple("BurstAlert", ["address", "hashes", "amounts", "times"])
+
+LARGE_AMOUNT_SATOSHI = 50000000
+BURST_COUNT = 5
+BURST_WINDOW_SECONDS = 600
+
+
+class BurstDetector:
+    """
+    Incremental detector for bursts of large transfers to the same address.
+    Each address keeps at most `count` recent outputs and is dropped once it has been
+    idle for longer than `window`, so memory depends on the active addresses only. With
+    alert_once, an alerted address stays silent while it keeps receiving large outputs and
+    may alert again once it has been idle for a whole window.
+    Transactions are expected in (roughly) time order; process_block sorts each block.
+    """
+
+    def __init__(self, min_value=LARGE_AMOUNT_SATOSHI, count=BURST_COUNT, window=BURST_WINDOW_SECONDS,
+                 alert_once=True, sweep_every=10000):
+        self.min_value = min_value
+        self.count = count
+        self.window = window
+        self.alert_once = alert_once
+        self.sweep_every = sweep_every
+        self.recent = {}
+        # Alerted address -> time of its latest large output, kept until its window empties
+        self.alerted = {}
+        self.latest_time = 0
+        self.processed = 0
+
+    def process(self, tx):
+        """Consumes one blockchain.info transaction dict and returns the alerts it triggers."""
+        alerts = []
+        tx_time = tx.get("time") or 0
+        tx_hash = tx.get("hash")
+        for output in tx.get("out", []):
+            value = output.get("value", 0)
+            address = output.get("addr")
+            if value > self.min_value and address is not None:
+                alert = self._add(address, tx_time, value, tx_hash)
+                if alert is not None:
+                    alerts.append(alert)
+        self.latest_time = max(self.latest_time, tx_time)
+        self.processed += 1
+        if self.processed % self.sweep_every == 0:
+            self.sweep()
+        return alerts
+
+    def _add(self, address, tx_time, value, tx_hash):
+        if self.alert_once and address in self.alerted:
+            if self.alerted[address] >= tx_time - self.window:
+                self.alerted[address] = max(self.alerted[address], tx_time)
+                return None
+            del self.alerted[address]
+        events = self.recent.get(address)
+        if events is None:
+            events = self.recent[address] = deque(maxlen=self.count)
+        events.append((tx_time, value, tx_hash))
+        while events and events[0][0] < tx_time - self.window:
+            events.popleft()
+        if len(events) < self.count:
+            return None
+        alert = BurstAlert(address, [e[2] for e in events], [e[1] for e in events], [e[0] for e in events])
+        del self.recent[address]
+        if self.alert_once:
+            self.alerted[address] = tx_time
+        return alert
+
+    def sweep(self):
+        """Drops addresses (alerted ones included) with no output inside the current window."""
+        cutoff = self.latest_time - self.window
+        for address in [a for a, events in self.recent.items() if events[-1][0] < cutoff]:
+            del self.recent[address]
+        for address in [a for a, latest in self.alerted.items() if latest < cutoff]:
+            del self.alerted[address]
+
+    def process_block(self, block_info):
+        """Consumes every transaction of a block (in time order) and returns the alerts."""
+        alerts = []
+        for tx in sorted(block_info.get("tx", []), key=lambda tx: tx.get("time") or 0):
+            alerts.extend(self.process(tx))
+        return alerts
+
+    def process_stream(self, transactions):
+        """Yields alerts from an unbounded iterable of transactions as soon as each window fills."""
+        for tx in transactions:
+            yield from self.process(tx)
@@ -0,0 +1,8 @@
+import os
+
+# Dataset locations. They are only read when a page needs them; set the environment
+# variables to point the app at other files without editing the code.
+DATA_FILE_PATH = os.environ.get("CRYPTO_DATA_FILE", r"C:\Users\sugan\Desktop\Apps\Block Chain_Project\Datas.csv")
+WALLET_DATA_FILE_PATH = os.environ.get("CRYPTO_WALLET_DATA_FILE", r"C:\Users\sugan\Desktop\random_wallet_transactions.csv")
+# Time zone timestamps are shown in (they are stored and computed on in UTC)
+DISPLAY_TIMEZONE = os.environ.get("CRYPTO_DISPLAY_TIMEZONE", "Asia/Kolkata")
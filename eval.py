@@ -1,36 +1,36 @@
 import requests
 import streamlit as st
-from datetime import datetime
-import pytz
-from collections import defaultdict
 import pandas as pd
-
-def convert_utc_to_ist(unix_time):
-    """Converts UNIX timestamp to IST (Indian Standard Time) and formats it."""
-    utc_time = datetime.utcfromtimestamp(unix_time)
-    ist_time_zone = pytz.timezone('Asia/Kolkata')
-    ist_time = utc_time.replace(tzinfo=pytz.utc).astimezone(ist_time_zone)
-    return ist_time.strftime('%Y-%m-%d %H:%M:%S %Z')
+from blockchain_client import get_client
+from burst_detector import LARGE_AMOUNT_SATOSHI, BURST_COUNT, BURST_WINDOW_SECONDS
+from block_model import get_block_model
+from views.widgets import background_job
+from time_columns import format_time, format_times
 
 def get_block_info(hash_id):
-    """Fetch block information using the block hash."""
+    """Fetch block information using the block hash; returns the block's columnar model."""
     sanitized_hash_id = hash_id.strip()
-    API_URL = f"https://blockchain.info/block/{sanitized_hash_id}?format=json"
     st.info("Connecting to server...")
     try:
-        response = requests.get(API_URL)
-        response.raise_for_status()
-        block_info = response.json()
+        # Fetched in the background, once for every session asking for this block, and only
+        # when the block is not already among the recently parsed ones
+        block = background_job(("block", sanitized_hash_id),
+                               lambda job: get_block_model(sanitized_hash_id, get_client().get_block),
+                               "Fetching the block")
+        if block is None:
+            return None
+
+        block_info = block.header
 
         st.success("Block data loaded successfully!")
         st.subheader("Block Information")
         st.text(f"Hash: {block_info.get('hash')}")
         st.text(f"Height (Block Number): {block_info.get('height', 'Unknown')}")
-        st.text(f"Time: {convert_utc_to_ist(block_info.get('time', 0))}")
+        st.text(f"Time: {format_time(block_info.get('time', 0))}")
         st.text(f"Block Size: {block_info.get('size')} bytes")
-        st.text(f"Number of Transactions: {len(block_info.get('tx', []))}")
+        st.text(f"Number of Transactions: {len(block)}")
 
-        return block_info
+        return block
     except requests.exceptions.HTTPError as e:
         st.error(f"HTTP Error: {e.response.status_code} - {e.response.reason}")
     except requests.exceptions.ConnectionError:
@@ -39,50 +39,11 @@ def get_block_info(hash_id):
         st.error(f"An unexpected error occurred: {e}")
     return None
 
-def get_transaction_details(tx_id):
-    """Fetch details of a specific transaction using its transaction hash."""
-    API_URL = f"https://blockchain.info/rawtx/{tx_id}?format=json"
-    st.info(f"Requesting details for transaction {tx_id}...")
-    try:
-        response = requests.get(API_URL)
-        response.raise_for_status()
-        transaction_info = response.json()
-        st.success("Transaction data loaded successfully!")
-        return transaction_info
-    except requests.exceptions.RequestException as e:
-        st.error(f"Error fetching transaction details: {e}")
-        return None
-
-def analyze_frequent_transactions(block_info):
+def analyze_frequent_transactions(block, min_value=LARGE_AMOUNT_SATOSHI, count=BURST_COUNT,
+                                  window=BURST_WINDOW_SECONDS):
     """Analyze transactions for frequent transactions within the same wallet over 10 minutes."""
-    transactions = block_info.get('tx', [])
-    addr_transactions = defaultdict(list)
-    suspicious_details = []
-
-    # Collect transactions by address and timestamp
-    for tx in transactions:
-        outputs = tx.get('out', [])
-        inputs = tx.get('inputs', [])
-        for output in outputs:
-            if output.get('value', 0) > 50000000:  # Threshold for "larger amount"
-                addr_transactions[output.get('addr')].append((tx.get('time'), output.get('value'), tx.get('hash')))
-
-    # Filter for addresses with transactions more than 5 times in 10 minutes
-    for addr, details in addr_transactions.items():
-        times = [time for time, _, _ in details]
-        if len(times) < 5:
-            continue
-
-        # Sort and check the interval
-        details.sort()  # Sort by time
-        for i in range(len(times) - 4):
-            if (times[i + 4] - times[i]) <= 600:  # 10 minutes in seconds
-                transaction_hashes = [tx_hash for _, _, tx_hash in details[i:i+5]]
-                transaction_amounts = [value for _, value, _ in details[i:i+5]]
-                suspicious_details.append((addr, transaction_hashes, transaction_amounts))
-                break
-
-    return suspicious_details
+    return [(alert.address, alert.hashes, alert.amounts)
+            for alert in block.large_output_bursts(min_value=min_value, count=count, window=window)]
 
 # Streamlit user interface for blockchain fraud detection
 st.title("AI Insights in Blockchain Transactions")
@@ -108,21 +69,20 @@ if not block_hash_input:
 
 if block_hash_input:
     st.subheader("Analyzing Transactions for Frequent Large Transfers")
-    block_info = get_block_info(block_hash_input)
-    if block_info:
-        suspicious_transactions = analyze_frequent_transactions(block_info)
+    block = get_block_info(block_hash_input)
+    if block is not None:
+        suspicious_transactions = analyze_frequent_transactions(block)
         if suspicious_transactions:
-            suspicious_data = []
+            suspicious_data, suspicious_times = [], []
+            # Senders and receivers come from the block itself, so no per-transaction requests are needed
             for addr, hashes, amounts in suspicious_transactions:
                 for tx_hash, amount in zip(hashes, amounts):
                     # Convert amount from Satoshis to Bitcoin
                     amount_btc = amount / 100000000.0
-                    transaction_details = get_transaction_details(tx_hash)
-                    if transaction_details:
-                        inputs = transaction_details.get('inputs', [])
-                        outputs = transaction_details.get('out', [])
-                        sender = ', '.join([inp['prev_out']['addr'] for inp in inputs if 'prev_out' in inp])
-                        receiver = ', '.join([out['addr'] for out in outputs if 'addr' in out])
+                    row = block.row(tx_hash)
+                    if row >= 0:
+                        sender = ', '.join(address for address in block.sources(row) if address != "N/A")
+                        receiver = ', '.join(address for address, _ in block.beneficiaries(row) if address != "N/A")
                         suspicious_data.append({
                             "Transaction Hash": tx_hash,
                             "Amount (BTC)": f"{amount_btc:.8f} BTC",  # Format as Bitcoin
@@ -130,10 +90,13 @@ if block_hash_input:
                             "Receiver": receiver,
                             "Address Involved": addr
                         })
+                        suspicious_times.append(block.times[row])
             
             # Display the table with suspicious transactions
             if suspicious_data:
                 df = pd.DataFrame(suspicious_data)
+                # Only the displayed rows are converted and formatted, in one vectorized call
+                df.insert(1, "Time", format_times(suspicious_times).to_numpy())
                 st.table(df)  # Display as a table
                 st.write(f"Total suspicious transactions: {len(suspicious_data)}")
             else:
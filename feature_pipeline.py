@@ -0,0 +1,270 @@
+import threading
+import numpy as np
+import pandas as pd
+from transaction_store import cached_derived
+from transaction_log import get_transaction_log
+from time_columns import epoch_ns
+from fraud_scoring import FEATURE_SOURCES, model_feature_names, transaction_feature_row, predict
+
+# Half-life of the decayed ("rolling") per-wallet volume
+ROLLING_HALF_LIFE_SECONDS = 24 * 3600
+_DECAY_RATE = np.log(2) / ROLLING_HALF_LIFE_SECONDS
+
+# Engineered per-wallet features, computed from the sender's history before each transaction
+WALLET_FEATURES = [
+    "sender_tx_count", "sender_volume", "sender_rolling_volume",
+    "sender_counterparties", "sender_velocity", "seconds_since_last",
+]
+
+SENDER_COLUMNS = ["Sender Wallet", "address"]
+RECEIVER_COLUMNS = ["Receiver Wallet", "recipient"]
+
+
+def _field(record, names):
+    for name in names:
+        if name in record:
+            return record[name]
+    raise KeyError(f"Expected one of {names}")
+
+
+def _epoch_seconds(value):
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return float(value)
+    return pd.Timestamp(value).value / 1e9
+
+
+class FeaturePipeline:
+    """
+    Per-wallet running aggregates kept in parallel NumPy arrays indexed by wallet code.
+    append() updates them in O(1) per transaction and backfill() computes them for a
+    whole frame with vectorized operations.
+    """
+
+    def __init__(self, capacity=1024):
+        self.codes = {}
+        self.tx_count = np.zeros(capacity, dtype=np.int64)
+        self.volume = np.zeros(capacity)
+        self.rolling_volume = np.zeros(capacity)
+        self.first_seen = np.zeros(capacity)
+        self.last_seen = np.zeros(capacity)
+        self.counterparties = np.zeros(capacity, dtype=np.int64)
+        # Unordered wallet pairs seen so far, packed as low_code << 32 | high_code
+        self.pairs = set()
+        # Transaction-log records folded in so far
+        self.log_applied = 0
+        self.lock = threading.Lock()
+
+    def _grow(self, size):
+        capacity = max(size, 2 * len(self.tx_count))
+        for name in ("tx_count", "volume", "rolling_volume", "first_seen", "last_seen", "counterparties"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def code(self, wallet):
+        code = self.codes.get(wallet)
+        if code is None:
+            code = self.codes[wallet] = len(self.codes)
+            if code >= len(self.tx_count):
+                self._grow(code + 1)
+        return code
+
+    def wallet_features(self, wallet, epoch):
+        """The engineered features of `wallet` at time `epoch`, from its history so far."""
+        code = self.codes.get(wallet)
+        if code is None or self.tx_count[code] == 0:
+            return np.zeros(len(WALLET_FEATURES))
+        elapsed = epoch - self.last_seen[code]
+        active_hours = max((epoch - self.first_seen[code]) / 3600, 1.0)
+        return np.array([
+            self.tx_count[code],
+            self.volume[code],
+            self.rolling_volume[code] * np.exp(-_DECAY_RATE * max(elapsed, 0.0)),
+            self.counterparties[code],
+            self.tx_count[code] / active_hours,
+            elapsed,
+        ], dtype=np.float64)
+
+    def _update_wallet(self, code, amount, epoch):
+        if self.tx_count[code] == 0:
+            self.first_seen[code] = epoch
+            self.last_seen[code] = epoch
+        elapsed = max(epoch - self.last_seen[code], 0.0)
+        self.rolling_volume[code] = self.rolling_volume[code] * np.exp(-_DECAY_RATE * elapsed) + amount
+        self.last_seen[code] = max(self.last_seen[code], epoch)
+        self.tx_count[code] += 1
+        self.volume[code] += amount
+
+    def update(self, sender, receiver, amount, epoch):
+        """Adds one transaction to the running aggregates of both wallets in O(1)."""
+        sender_code, receiver_code = self.code(sender), self.code(receiver)
+        self._update_wallet(sender_code, amount, epoch)
+        if receiver_code != sender_code:
+            self._update_wallet(receiver_code, amount, epoch)
+        pair = min(sender_code, receiver_code) << 32 | max(sender_code, receiver_code)
+        if pair not in self.pairs:
+            self.pairs.add(pair)
+            self.counterparties[sender_code] += 1
+            if receiver_code != sender_code:
+                self.counterparties[receiver_code] += 1
+
+    def _update_record(self, transaction):
+        self.update(_field(transaction, SENDER_COLUMNS), _field(transaction, RECEIVER_COLUMNS),
+                    float(_field(transaction, FEATURE_SOURCES["amount"])),
+                    _epoch_seconds(_field(transaction, FEATURE_SOURCES["timestamp"])))
+
+    def transaction_row(self, transaction):
+        """
+        The model input row for a transaction record (a dict) followed by its wallet features,
+        without folding the transaction into the aggregates.
+        """
+        epoch = _epoch_seconds(_field(transaction, FEATURE_SOURCES["timestamp"]))
+        model_row = transaction_feature_row(transaction, model_feature_names())[0]
+        with self.lock:
+            return np.concatenate([model_row, self.wallet_features(_field(transaction, SENDER_COLUMNS), epoch)])
+
+    def append(self, transaction):
+        """
+        Returns the model input row for a transaction record (a dict) followed by its wallet
+        features, then folds the transaction into the aggregates.
+        """
+        row = self.transaction_row(transaction)
+        with self.lock:
+            self._update_record(transaction)
+        return row
+
+    def sync_log(self, log):
+        """Folds in the transaction-log records appended since the last sync."""
+        compacted, records = log.snapshot()
+        with self.lock:
+            if self.log_applied < len(compacted):
+                for transaction in compacted.iloc[self.log_applied:].to_dict("records"):
+                    self._update_record(transaction)
+                self.log_applied = len(compacted)
+            new_records = records[self.log_applied - len(compacted):]
+            for transaction in new_records:
+                self._update_record(transaction)
+            self.log_applied += len(new_records)
+
+    def backfill(self, df):
+        """
+        Computes the wallet features of every row of `df` (in time order, from each sender's prior
+        history) with vectorized operations, and leaves the pipeline holding the final aggregates.
+        Returns a (len(df), len(WALLET_FEATURES)) array aligned with the rows of `df`.
+        """
+        senders = pd.Series(_field(df, SENDER_COLUMNS)).astype(str).to_numpy()
+        receivers = pd.Series(_field(df, RECEIVER_COLUMNS)).astype(str).to_numpy()
+        amounts = pd.to_numeric(_field(df, FEATURE_SOURCES["amount"]), errors="coerce").fillna(0).to_numpy(float)
+        times = _field(df, FEATURE_SOURCES["timestamp"])
+        if pd.api.types.is_numeric_dtype(times):
+            epochs = np.asarray(times, dtype=np.float64)
+        else:
+            epochs = epoch_ns(times) / 1e9
+        n_rows = len(df)
+
+        codes, wallets = pd.factorize(np.concatenate([senders, receivers]))
+        sender_codes, receiver_codes = codes[:n_rows], codes[n_rows:]
+
+        # One event per (wallet, transaction) side; self-transfers count once
+        keep = np.concatenate([np.ones(n_rows, bool), receiver_codes != sender_codes])
+        wallet = np.concatenate([sender_codes, receiver_codes])[keep]
+        counterparty = np.concatenate([receiver_codes, sender_codes])[keep]
+        row = np.concatenate([np.arange(n_rows), np.arange(n_rows)])[keep]
+        is_sender = np.concatenate([np.ones(n_rows, bool), np.zeros(n_rows, bool)])[keep]
+        amount = amounts[row]
+        epoch = epochs[row]
+
+        order = np.lexsort((~is_sender, row, epoch, wallet))
+        wallet, counterparty, row, is_sender, amount, epoch = (
+            a[order] for a in (wallet, counterparty, row, is_sender, amount, epoch))
+        group_start = np.r_[True, wallet[1:] != wallet[:-1]]
+        start_index = np.maximum.accumulate(np.where(group_start, np.arange(len(wallet)), 0))
+        groups = pd.Series(wallet)
+
+        # Running totals after each event, restarted at every wallet
+        position = np.arange(len(wallet)) - start_index
+        count_after = position + 1
+        volume_after = pd.Series(amount).groupby(groups).cumsum().to_numpy()
+        pair_key = np.minimum(wallet, counterparty).astype(np.int64) << 32 | np.maximum(wallet, counterparty)
+        first_pair = np.zeros(len(wallet), dtype=bool)
+        first_pair[np.unique(wallet.astype(np.int64) << 32 | counterparty, return_index=True)[1]] = True
+        counterparties_after = pd.Series(first_pair.astype(np.int64)).groupby(groups).cumsum().to_numpy()
+        first_seen = epoch[start_index]
+        rolling_after = _decayed_running_sum(amount, epoch, start_index, groups)
+
+        # Sender-side events, read as the history *before* the transaction
+        prior = np.zeros((n_rows, len(WALLET_FEATURES)))
+        sender_events = np.flatnonzero(is_sender)
+        has_history = position[sender_events] > 0
+        previous = sender_events[has_history] - 1
+        target = row[sender_events[has_history]]
+        now = epoch[sender_events[has_history]]
+        elapsed = np.maximum(now - epoch[previous], 0.0)
+        active_hours = np.maximum((now - first_seen[previous]) / 3600, 1.0)
+        prior[target, 0] = count_after[previous]
+        prior[target, 1] = volume_after[previous]
+        prior[target, 2] = rolling_after[previous] * np.exp(-_DECAY_RATE * elapsed)
+        prior[target, 3] = counterparties_after[previous]
+        prior[target, 4] = count_after[previous] / active_hours
+        prior[target, 5] = elapsed
+
+        # Final aggregates become the pipeline state
+        last = np.r_[np.flatnonzero(group_start)[1:] - 1, len(wallet) - 1] if len(wallet) else np.empty(0, int)
+        self.__init__(capacity=max(len(wallets), 1))
+        self.codes = {w: c for c, w in enumerate(wallets.tolist())}
+        final_wallets = wallet[last]
+        self.tx_count[final_wallets] = count_after[last]
+        self.volume[final_wallets] = volume_after[last]
+        self.rolling_volume[final_wallets] = rolling_after[last]
+        self.first_seen[final_wallets] = first_seen[last]
+        self.last_seen[final_wallets] = epoch[last]
+        self.counterparties[final_wallets] = counterparties_after[last]
+        self.pairs = set(np.unique(pair_key).tolist())
+        return prior
+
+
+def _decayed_running_sum(amount, epoch, start_index, groups):
+    """rolling[i] = sum of amount[j] * exp(-rate * (epoch[i] - epoch[j])) over events j <= i of the same wallet."""
+    # Exponents are taken relative to the wallet's first event; wallets whose history is too long
+    # for that to stay finite fall back to the O(1) recurrence
+    offset = (epoch - epoch[start_index]) * _DECAY_RATE
+    scaled = pd.Series(amount * np.exp(np.minimum(offset, 700))).groupby(groups).cumsum().to_numpy()
+    rolling = scaled * np.exp(-offset)
+    for start in np.unique(start_index[offset > 700]):
+        value = 0.0
+        for i in np.flatnonzero(start_index == start):
+            if i > start:
+                value *= np.exp(-_DECAY_RATE * max(epoch[i] - epoch[i - 1], 0.0))
+            value += amount[i]
+            rolling[i] = value
+    return rolling
+
+
+def get_feature_pipeline(path):
+    """
+    Returns the feature pipeline of the dataset at `path` plus its transaction log: backfilled
+    once per dataset version, with log records appended since the previous call folded in.
+    """
+    def build(df):
+        pipeline = FeaturePipeline()
+        pipeline.backfill(df)
+        return pipeline
+
+    pipeline = cached_derived(path, "feature_pipeline", build)
+    pipeline.sync_log(get_transaction_log(path))
+    return pipeline
+
+
+def score_appended(pipeline, transaction):
+    """
+    Scores a transaction about to be appended to the log, from the wallet history before it, and
+    returns (fraud probability, wallet features). The transaction is folded in by the next
+    sync_log(), once it is in the log. The model was trained on model_feature_names() only, so the
+    probability comes from those; the wallet features are returned for display and for a model
+    trained on them.
+    """
+    row = pipeline.transaction_row(transaction)
+    n_model_features = len(model_feature_names())
+    probability = float(predict(row[None, :n_model_features])[0])
+    return probability, dict(zip(WALLET_FEATURES, row[n_model_features:].tolist()))
@@ -0,0 +1,148 @@
+"""
+Flattened random-forest inference.
+
+export_forest() copies every tree's arrays out of a fitted RandomForestClassifier into one
+contiguous structure-of-arrays .npy file (plus a small JSON header) that loads with a memory map.
+FlatForest evaluates all trees for a batch with vectorized NumPy and gives the same
+probabilities as the scikit-learn model, without unpickling it.
+The export is generated, not committed: the header records the SHA-256 of the pickle it was
+made from, and fraud_scoring.load_forest() rebuilds it when that no longer matches.
+
+Run with: python flat_forest.py [model.pkl] [output.npy]
+"""
+import os
+import sys
+import json
+import pickle
+import hashlib
+import numpy as np
+
+FOREST_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fraud_forest.npy")
+
+# Rows of the exported (5, n_nodes) float64 array
+LEFT, RIGHT, FEATURE, THRESHOLD, PROBABILITY = range(5)
+
+
+def _header_path(path):
+    return os.path.splitext(path)[0] + ".json"
+
+
+def file_digest(path):
+    """SHA-256 of a file, recorded in the header to tie an export to its pickle."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_header(path=FOREST_PATH):
+    """The JSON header of an export, or None if there is none."""
+    try:
+        with open(_header_path(path), "r") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def export_forest(model, path=FOREST_PATH, feature_names=None, positive_class=1, model_sha256=None):
+    """Writes the trees of a fitted RandomForestClassifier to `path` and its JSON header."""
+    class_index = list(model.classes_).index(positive_class)
+    arrays, roots, offset, max_depth = [], [], 0, 0
+    for estimator in model.estimators_:
+        tree = estimator.tree_
+        left = tree.children_left.astype(np.int64)
+        right = tree.children_right.astype(np.int64)
+        leaf = left < 0
+        # Same normalisation as DecisionTreeClassifier.predict_proba
+        values = tree.value[:, 0, :]
+        normalizer = values.sum(axis=1)
+        normalizer[normalizer == 0.0] = 1.0
+        probability = values[:, class_index] / normalizer
+        arrays.append(np.vstack([
+            np.where(leaf, -1, left + offset),
+            np.where(leaf, -1, right + offset),
+            np.where(leaf, -1, tree.feature),
+            tree.threshold,
+            probability,
+        ]).astype(np.float64))
+        roots.append(offset)
+        offset += tree.node_count
+        max_depth = max(max_depth, tree.max_depth)
+    # Write both files aside and swap them in, header last, so a reader never pairs a new array
+    # with an old header
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as file:
+        np.save(file, np.ascontiguousarray(np.hstack(arrays)))
+    os.replace(temporary, path)
+    if feature_names is None:
+        feature_names = [str(name) for name in getattr(model, "feature_names_in_", range(model.n_features_in_))]
+    with open(temporary, "w") as file:
+        json.dump({"roots": roots, "max_depth": max_depth, "feature_names": list(feature_names),
+                   "positive_class": int(positive_class), "model_sha256": model_sha256}, file)
+    os.replace(temporary, _header_path(path))
+    return path
+
+
+class FlatForest:
+    """A random forest evaluated from the exported structure-of-arrays file."""
+
+    def __init__(self, nodes, roots, max_depth, feature_names):
+        self.nodes = nodes
+        # children[node] is (right, left), indexed by the outcome of `value <= threshold`
+        self.children = np.ascontiguousarray(np.stack([nodes[RIGHT], nodes[LEFT]], axis=1).astype(np.int64))
+        self.feature = nodes[FEATURE].astype(np.int64)
+        self.threshold = nodes[THRESHOLD]
+        self.probability = nodes[PROBABILITY]
+        self.roots = np.asarray(roots, dtype=np.int64)
+        self.max_depth = max_depth
+        self.feature_names = feature_names
+
+    @classmethod
+    def load(cls, path=FOREST_PATH, mmap=True):
+        header = read_header(path)
+        if header is None:
+            raise FileNotFoundError(f"No forest header next to {path}")
+        nodes = np.load(path, mmap_mode="r" if mmap else None)
+        return cls(nodes, header["roots"], header["max_depth"], header["feature_names"])
+
+    def apply(self, X):
+        """Returns the leaf reached in every tree, shape (n_samples, n_trees)."""
+        # scikit-learn compares float32 inputs against float64 thresholds
+        X = np.asarray(X, dtype=np.float32).astype(np.float64)
+        n_samples, n_features = X.shape
+        nodes = np.tile(self.roots, n_samples)
+        # Flat offset of each (sample, tree) pair's row in X, so X.flat[base + feature] is the split value
+        base = np.repeat(np.arange(n_samples, dtype=np.int64) * n_features, len(self.roots))
+        active = np.arange(len(nodes))
+        values = X.ravel()
+        for _ in range(self.max_depth + 1):
+            current = nodes[active]
+            feature = self.feature[current]
+            internal = feature >= 0
+            if not internal.all():
+                active, current, feature = active[internal], current[internal], feature[internal]
+            if not len(active):
+                break
+            go_left = values[base[active] + feature] <= self.threshold[current]
+            nodes[active] = self.children[current, go_left.view(np.int8)]
+        return nodes.reshape(n_samples, len(self.roots))
+
+    def predict_proba(self, X):
+        """Probability of the positive class for every row of X."""
+        leaf_probability = self.probability[self.apply(X)]
+        # Accumulate tree by tree, in the same order as RandomForestClassifier.predict_proba
+        total = np.zeros(len(leaf_probability))
+        for column in leaf_probability.T:
+            total += column
+        return total / len(self.roots)
+
+
+if __name__ == "__main__":
+    model_path = sys.argv[1] if len(sys.argv) > 1 else \
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "fraud_detection_model.pkl")
+    output_path = sys.argv[2] if len(sys.argv) > 2 else FOREST_PATH
+    with open(model_path, "rb") as file:
+        bundle = pickle.load(file)
+    export_forest(bundle["model"], output_path, bundle.get("feature_names"), model_sha256=file_digest(model_path))
+    print(f"Exported {model_path} to {output_path}")
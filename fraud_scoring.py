@@ -0,0 +1,218 @@
+import copy
+import os
+import pickle
+import threading
+import zlib
+import numpy as np
+import pandas as pd
+from transaction_store import load_transactions, attach_columns, cached_derived
+from flat_forest import FlatForest, FOREST_PATH, export_forest, file_digest, read_header
+from time_columns import epoch_ns, NAT
+
+# Next to this module, so scoring works from any working directory (batch jobs, tests)
+MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fraud_detection_model.pkl")
+FRAUD_THRESHOLD = 0.5
+SCORING_CHUNK_SIZE = 100000
+# Batches up to this size are scored with the flattened forest instead of the pickled model
+FOREST_MAX_ROWS = 500
+
+# Placeholder encodings: the notebook that trained the model is not in the repo, so the origin of its
+# `timestamp` feature (hours) and its wallet -> `user_id` mapping are assumptions. Numeric columns are
+# passed to the model unchanged; only strings, datetimes and wallet addresses go through these.
+FEATURE_TIME_ORIGIN = pd.Timestamp("2024-11-01")
+USER_ID_BUCKETS = 100
+
+# Raw column names accepted for each model feature (transactions.csv first, uploaded datasets second)
+FEATURE_SOURCES = {
+    "timestamp": ["Timestamp", "timestamp", "date"],
+    "amount": ["Amount Transacted", "amount"],
+    "user_id": ["Sender Wallet", "address", "user_id"],
+}
+
+_models = {}
+_forests = {}
+_lock = threading.Lock()
+
+
+def _load_model(path):
+    if path not in _models:
+        with open(path, "rb") as file:
+            bundle = pickle.load(file)
+        model = bundle["model"]
+        feature_names = list(bundle.get("feature_names", getattr(model, "feature_names_in_", [])))
+        _models[path] = (model, feature_names)
+    return _models[path]
+
+
+def load_model(path=MODEL_PATH):
+    """Unpickles the fraud model once per process and returns (model, feature_names)."""
+    with _lock:
+        return _load_model(path)
+
+
+def forest_path(model_path=MODEL_PATH):
+    """Where the flattened export of the pickle at `model_path` is kept (next to it for other models)."""
+    if os.path.abspath(model_path) == MODEL_PATH:
+        return FOREST_PATH
+    return os.path.splitext(os.path.abspath(model_path))[0] + ".forest.npy"
+
+
+def load_forest(path=None, model_path=MODEL_PATH):
+    """
+    Memory-maps the flattened forest of the pickle at `model_path` once per process, exporting it
+    (to `path`, by default forest_path(model_path)) first if it is missing or was made from a
+    different pickle. Returns None if there is no model to export.
+    """
+    path = path or forest_path(model_path)
+    with _lock:
+        if path not in _forests:
+            if not os.path.exists(model_path):
+                _forests[path] = None
+                return None
+            digest = file_digest(model_path)
+            header = read_header(path)
+            if header is None or header.get("model_sha256") != digest or not os.path.exists(path):
+                model, feature_names = _load_model(model_path)
+                export_forest(model, path, feature_names, model_sha256=digest)
+            _forests[path] = FlatForest.load(path)
+        return _forests[path]
+
+
+def _source_column(df, feature):
+    for column in FEATURE_SOURCES.get(feature, [feature]):
+        if column in df.columns:
+            return df[column]
+    raise KeyError(f"No column for model feature '{feature}' (expected one of {FEATURE_SOURCES[feature]})")
+
+
+def wallet_user_id(wallet):
+    """Maps one wallet address to its user id."""
+    return float(zlib.crc32(str(wallet).encode("utf-8")) % USER_ID_BUCKETS)
+
+
+def hours_since_origin(value):
+    """Converts a timestamp (string, datetime or epoch seconds) to the model's `timestamp` feature."""
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        value = pd.Timestamp(value, unit="s")
+    timestamp = pd.Timestamp(value)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_convert("UTC").tz_localize(None)
+    return (timestamp - FEATURE_TIME_ORIGIN) / pd.Timedelta(hours=1)
+
+
+def wallet_user_ids(wallets):
+    """Maps wallet addresses to stable user ids, hashing each distinct wallet only once."""
+    categorical = pd.Categorical(wallets)
+    buckets = np.array([wallet_user_id(c) for c in categorical.categories] + [np.nan], dtype=np.float64)
+    # Missing wallets have code -1, which picks the trailing NaN
+    return buckets[categorical.codes]
+
+
+def build_features(df, feature_names):
+    """Builds the model's input matrix from a transactions.csv-shaped frame."""
+    features = np.empty((len(df), len(feature_names)), dtype=np.float64)
+    for i, feature in enumerate(feature_names):
+        values = _source_column(df, feature)
+        if feature == "timestamp" and not pd.api.types.is_numeric_dtype(values):
+            ns = epoch_ns(values)
+            features[:, i] = np.where(ns == NAT, np.nan, (ns - FEATURE_TIME_ORIGIN.value) / 3.6e12)
+        elif feature == "user_id" and not pd.api.types.is_numeric_dtype(values):
+            features[:, i] = wallet_user_ids(values)
+        else:
+            features[:, i] = pd.to_numeric(values, errors="coerce").to_numpy(dtype=np.float64)
+    return np.nan_to_num(features)
+
+
+def transaction_feature_row(transaction, feature_names):
+    """Builds one model input row from a transaction record (a dict), without a DataFrame."""
+    row = np.zeros((1, len(feature_names)), dtype=np.float64)
+    for i, feature in enumerate(feature_names):
+        column = next((c for c in FEATURE_SOURCES.get(feature, [feature]) if c in transaction), None)
+        if column is None:
+            raise KeyError(f"No field for model feature '{feature}' (expected one of {FEATURE_SOURCES[feature]})")
+        value = transaction[column]
+        if feature == "timestamp" and (isinstance(value, str) or hasattr(value, "year")):
+            value = hours_since_origin(value)
+        elif feature == "user_id" and isinstance(value, str):
+            value = wallet_user_id(value)
+        row[0, i] = float(value)
+    return np.nan_to_num(row)
+
+
+def model_feature_names(model_path=MODEL_PATH):
+    """The model's input features, in order (read from the flattened export when available)."""
+    forest = load_forest(model_path=model_path)
+    return forest.feature_names if forest is not None else load_model(model_path)[1]
+
+
+def score(df, chunk_size=SCORING_CHUNK_SIZE, n_jobs=-1, model_path=MODEL_PATH, engine="auto"):
+    """Returns the fraud probability of every row of `df`, predicted in chunks with `n_jobs` workers."""
+    features = build_features(df, model_feature_names(model_path))
+    return predict(features, chunk_size, n_jobs, model_path, engine)
+
+
+def predict(features, chunk_size=SCORING_CHUNK_SIZE, n_jobs=-1, model_path=MODEL_PATH, engine="auto"):
+    """
+    Returns the fraud probability of every row of a model input matrix (columns in
+    model_feature_names() order).
+    engine="forest" uses the flattened export (flat_forest.py) and engine="sklearn" the pickled model.
+    Both give identical probabilities; "auto" picks the export for small batches, where the pickled
+    model's per-call overhead dominates, and the pickled model for large ones.
+    """
+    if engine == "auto":
+        engine = "forest" if len(features) <= FOREST_MAX_ROWS and load_forest(model_path=model_path) is not None \
+            else "sklearn"
+    if engine == "forest":
+        forest = load_forest(model_path=model_path)
+        if forest is None:
+            raise FileNotFoundError(f"{model_path} not found; there is no model to flatten")
+        return forest.predict_proba(features)
+
+    shared, _ = load_model(model_path)
+    # Shallow copy (the trees are shared) so concurrent callers don't change each other's n_jobs
+    model = copy.copy(shared)
+    fraud_class = list(model.classes_).index(1)
+    probabilities = np.empty(len(features), dtype=np.float64)
+    model.n_jobs = n_jobs
+    for start in range(0, len(features), chunk_size):
+        chunk = features[start:start + chunk_size]
+        probabilities[start:start + chunk_size] = model.predict_proba(chunk)[:, fraud_class]
+    return probabilities
+
+
+def score_transaction(transaction):
+    """Returns the fraud probability of a single transaction record (a dict of column -> value)."""
+    return float(predict(transaction_feature_row(transaction, model_feature_names()))[0])
+
+
+def add_fraud_scores(df, threshold=FRAUD_THRESHOLD):
+    """Returns a copy of `df` with `fraud_probability` and `is_fraudulent` columns."""
+    scored = df.copy()
+    scored["fraud_probability"] = score(df)
+    scored["is_fraudulent"] = scored["fraud_probability"] >= threshold
+    return scored
+
+
+def score_store(path, threshold=FRAUD_THRESHOLD):
+    """
+    Scores the dataset at `path` once per dataset version (reusing a batch run's scores of the
+    same version when there are any) and writes `fraud_probability` and `is_fraudulent` back into
+    the transaction store. Returns the scored store frame.
+    """
+    def build(df):
+        if "fraud_probability" in df.columns:
+            # Already persisted in the columnar copy by an earlier run
+            return True
+        from batch_analytics import read_result
+        precomputed = read_result("fraud_scores", path=path)
+        if precomputed is not None and len(precomputed) == len(df):
+            # Scored by a batch run over this very dataset version
+            probabilities = np.empty(len(df), dtype=np.float64)
+            probabilities[precomputed["row"].to_numpy()] = precomputed["fraud_probability"].to_numpy()
+        else:
+            probabilities = score(df)
+        attach_columns(path, {"fraud_probability": probabilities, "is_fraudulent": probabilities >= threshold})
+        return True
+
+    cached_derived(path, "fraud_scores", build)
+    return load_transactions(path)
@@ -0,0 +1,230 @@
+import time
+import threading
+import multiprocessing
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import numpy as np
+import pandas as pd
+from transaction_store import cached_derived
+from time_columns import epoch_seconds
+
+SENDER_COLUMNS = ["address", "Sender Wallet"]
+RECEIVER_COLUMNS = ["recipient", "Receiver Wallet"]
+AMOUNT_COLUMNS = ["amount", "Amount Transacted"]
+TIME_COLUMNS = ["timestamp", "Timestamp"]
+TX_ID_COLUMNS = ["Transaction ID", "transaction_id", "hash"]
+
+DEFAULT_MAX_HOPS = 3
+DEFAULT_MAX_RESULTS = 1000
+# Per-query latency budget; a trace that runs out returns what it found so far
+DEFAULT_TIME_BUDGET_SECONDS = 0.5
+# Edges expanded between two checks of the result limit and the latency budget
+CHUNK_EDGES = 65536
+# Up to this many seeds are traced in the calling process; larger batches go to the worker pool
+INLINE_SEEDS = 8
+
+# edges: one row per followed transfer (hop, sender, receiver, amount, time, transaction id)
+# stopped: None when the trace finished, else "max_results" or "time_budget"
+TraceResult = namedtuple("TraceResult", ["seed", "direction", "edges", "wallets", "stopped"])
+
+
+def _column(df, names, required=True):
+    for name in names:
+        if name in df.columns:
+            return df[name]
+    if required:
+        raise KeyError(f"Expected one of the columns {names}")
+    return None
+
+
+def _csr(codes, n_nodes, times):
+    """Edge indices grouped by node, each group in time order, plus the group offsets."""
+    order = np.lexsort((times, codes))
+    offsets = np.zeros(n_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(codes, minlength=n_nodes), out=offsets[1:])
+    return offsets, order
+
+
+def _gather(offsets, order, nodes):
+    """Edge indices of every node in `nodes`, and the position in `nodes` each one came from."""
+    starts, ends = offsets[nodes], offsets[nodes + 1]
+    lengths = ends - starts
+    owner = np.repeat(np.arange(len(nodes)), lengths)
+    position = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    return order[starts[owner] + position], owner
+
+
+class FlowGraph:
+    """
+    The transfer graph of a dataset in CSR form: edges grouped by sender (forward) and by
+    receiver (backward), each node's edges in time order.
+    """
+
+    def __init__(self, df):
+        senders = _column(df, SENDER_COLUMNS).astype(str).to_numpy()
+        receivers = _column(df, RECEIVER_COLUMNS).astype(str).to_numpy()
+        codes, wallets = pd.factorize(np.concatenate([senders, receivers]))
+        n_rows = len(df)
+        self.wallets = pd.Index(wallets)
+        self.src = codes[:n_rows].astype(np.int64)
+        self.dst = codes[n_rows:].astype(np.int64)
+        amounts = _column(df, AMOUNT_COLUMNS, required=False)
+        self.amount = np.zeros(n_rows) if amounts is None else \
+            pd.to_numeric(amounts, errors="coerce").fillna(0).to_numpy(dtype=np.float64)
+        times = _column(df, TIME_COLUMNS, required=False)
+        if times is None:
+            self.time = np.full(n_rows, np.nan)
+        elif pd.api.types.is_numeric_dtype(times):
+            self.time = times.to_numpy(dtype=np.float64)
+        else:
+            self.time = epoch_seconds(times)
+        tx_ids = _column(df, TX_ID_COLUMNS, required=False)
+        self.tx_ids = pd.Index((tx_ids if tx_ids is not None else pd.Series(np.arange(n_rows))).astype(str))
+        n_wallets = len(wallets)
+        self.forward = _csr(self.src, n_wallets, self.time)
+        self.backward = _csr(self.dst, n_wallets, self.time)
+
+    def _seed(self, seed, direction):
+        """(wallet code, time funds are at the wallet) for a wallet address or transaction id."""
+        if seed in self.wallets:
+            return self.wallets.get_loc(seed), np.nan
+        if seed in self.tx_ids:
+            edge = self.tx_ids.get_indexer_for([seed])[0]
+            node = self.dst[edge] if direction == "forward" else self.src[edge]
+            return node, self.time[edge]
+        raise KeyError(f"Unknown wallet or transaction: {seed}")
+
+    def trace(self, seed, direction="forward", max_hops=DEFAULT_MAX_HOPS, min_amount=0.0, start_time=None,
+              end_time=None, max_results=DEFAULT_MAX_RESULTS, time_budget=DEFAULT_TIME_BUDGET_SECONDS):
+        """
+        Follows funds from `seed` (a wallet or a transaction id) `max_hops` transfers forward (to
+        receivers) or backward (to senders). Only transfers of at least `min_amount`, inside
+        [start_time, end_time] (epoch seconds) and consistent in time with the previous hop
+        (forward: not before the funds arrived; backward: not after they left) are followed.
+        Each wallet is expanded once, at its earliest hop.
+        """
+        deadline = time.perf_counter() + time_budget
+        forward = direction == "forward"
+        offsets, order = self.forward if forward else self.backward
+        node, at = self._seed(seed, direction)
+        frontier, frontier_time = np.array([node]), np.array([at])
+        visited = np.zeros(len(self.wallets), dtype=bool)
+        visited[node] = True
+        found, stopped, n_found = [], None, 0
+
+        for hop in range(1, max_hops + 1):
+            if len(frontier) == 0 or stopped:
+                break
+            # Expand the frontier in chunks of about CHUNK_EDGES edges, checking limits between chunks
+            degree = offsets[frontier + 1] - offsets[frontier]
+            bounds = np.searchsorted(np.cumsum(degree), np.arange(CHUNK_EDGES, degree.sum(), CHUNK_EDGES))
+            reached, reached_time = [], []
+            for nodes, node_time in zip(np.split(frontier, bounds), np.split(frontier_time, bounds)):
+                edges, owner = _gather(offsets, order, nodes)
+                keep = self.amount[edges] >= min_amount
+                edge_time = self.time[edges]
+                if start_time is not None:
+                    keep &= ~(edge_time < start_time)
+                if end_time is not None:
+                    keep &= ~(edge_time > end_time)
+                # Missing times never exclude a transfer
+                keep &= ~(edge_time < node_time[owner]) if forward else ~(edge_time > node_time[owner])
+                edges = edges[keep]
+                if len(edges) >= max_results - n_found:
+                    edges, stopped = edges[:max_results - n_found], "max_results"
+                found.append((hop, edges))
+                n_found += len(edges)
+                reached.append(self.dst[edges] if forward else self.src[edges])
+                reached_time.append(self.time[edges])
+                if stopped:
+                    break
+                if time.perf_counter() > deadline:
+                    stopped = "time_budget"
+                    break
+
+            # Next frontier: newly reached wallets, at their earliest (forward) / latest (backward) time
+            reached, reached_time = np.concatenate(reached), np.concatenate(reached_time)
+            fresh = ~visited[reached]
+            reached, reached_time = reached[fresh], reached_time[fresh]
+            sort_time = np.where(np.isnan(reached_time), -np.inf if forward else np.inf, reached_time)
+            by_node = np.lexsort((sort_time if forward else -sort_time, reached))
+            reached, reached_time = reached[by_node], reached_time[by_node]
+            first = np.r_[True, reached[1:] != reached[:-1]] if len(reached) else np.empty(0, dtype=bool)
+            frontier, frontier_time = reached[first], reached_time[first]
+            visited[frontier] = True
+        return TraceResult(seed, direction, self._edges_frame(found), self.wallets[np.flatnonzero(visited)].tolist(),
+                           stopped)
+
+    def _edges_frame(self, found):
+        hops = np.concatenate([np.full(len(edges), hop) for hop, edges in found]) if found else np.empty(0, int)
+        edges = np.concatenate([edges for _, edges in found]) if found else np.empty(0, dtype=np.int64)
+        return pd.DataFrame({
+            "hop": hops,
+            "from": self.wallets[self.src[edges]],
+            "to": self.wallets[self.dst[edges]],
+            "amount": self.amount[edges],
+            "time": pd.to_datetime(self.time[edges], unit="s"),
+            "transaction_id": self.tx_ids[edges],
+        })
+
+
+def get_flow_graph(path):
+    """Returns the transfer graph of the dataset at `path`, built once per dataset version."""
+    return cached_derived(path, "flow_graph", FlowGraph)
+
+
+def _trace_worker(path, seed, kwargs):
+    try:
+        return get_flow_graph(path).trace(seed, **kwargs)
+    except KeyError:
+        return None
+
+
+_pool = None
+_pool_key = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool(path, workers):
+    """
+    The worker pool for the dataset at `path`, created on first use and kept across calls. Each
+    worker loads the graph once, in its initializer (and again only if the dataset changes).
+    """
+    global _pool, _pool_key
+    with _pool_lock:
+        if _pool is None or _pool_key != (path, workers):
+            if _pool is not None:
+                _pool.shutdown(wait=False)
+            # Spawned, not forked: this runs on Streamlit's threads
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"),
+                                        initializer=get_flow_graph, initargs=(path,))
+            _pool_key = (path, workers)
+        return _pool
+
+
+def _reset_pool(pool):
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+
+
+def trace_many(path, seeds, workers=None, **kwargs):
+    """
+    Traces many seed wallets / transactions of the dataset at `path`: a few in this process,
+    larger batches in a persistent process pool. Returns a dict of seed -> TraceResult (None for
+    unknown seeds).
+    """
+    seeds = list(dict.fromkeys(seeds))
+    if len(seeds) <= INLINE_SEEDS or workers == 1:
+        return {seed: _trace_worker(path, seed, kwargs) for seed in seeds}
+    pool = _get_pool(path, workers)
+    try:
+        results = pool.map(_trace_worker, [path] * len(seeds), seeds, [kwargs] * len(seeds),
+                           chunksize=max(1, len(seeds) // 64))
+        return dict(zip(seeds, results))
+    except BrokenProcessPool:
+        # A worker died; start a fresh pool next time and trace this batch here
+        _reset_pool(pool)
+        return {seed: _trace_worker(path, seed, kwargs) for seed in seeds}
@@ -0,0 +1,171 @@
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+JOB_WORKERS = 4
+# Finished jobs (and their results) kept for reuse, least recently used dropped first; expired
+# ones are dropped on the next submit
+MAX_FINISHED_JOBS = 32
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = "queued", "running", "done", "failed", "cancelled"
+
+
+class JobCancelled(Exception):
+    """Raised inside a job's work function by Job.check() once the job has been cancelled."""
+
+
+class Job:
+    """
+    One unit of background work. The work function receives the job and may call
+    job.report(fraction) to publish progress and job.check() to stop early once cancelled.
+    """
+
+    def __init__(self, key, work, ttl):
+        self.key = key
+        self.id = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()[:16]
+        self.work = work
+        self.state = QUEUED
+        self.progress = 0.0
+        self.result = None
+        self.error = None
+        self.submitted = time.time()
+        self.finished = None
+        self.ttl = ttl
+        # Sessions waiting for this job; it is only cancelled once all of them have given up
+        self.owners = set()
+        self.future = None
+        self._cancel = threading.Event()
+        self._done = threading.Event()
+
+    def report(self, fraction):
+        self.progress = min(max(fraction, 0.0), 1.0)
+
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    def check(self):
+        if self._cancel.is_set():
+            raise JobCancelled(self.key)
+
+    def wait(self, timeout=None):
+        """Blocks until the job finishes (or `timeout` seconds pass); returns True if it finished."""
+        return self._done.wait(timeout)
+
+    def expired(self):
+        return self.ttl is not None and self.finished is not None and time.time() - self.finished > self.ttl
+
+    def _run(self):
+        if self._cancel.is_set():
+            self._finish(CANCELLED)
+            return
+        self.state = RUNNING
+        try:
+            self.result = self.work(self)
+            self._finish(DONE)
+        except JobCancelled:
+            self._finish(CANCELLED)
+        except Exception as e:
+            self.error = e
+            self._finish(FAILED)
+
+    def _finish(self, state):
+        if state == DONE:
+            self.progress = 1.0
+        self.state = state
+        self.finished = time.time()
+        self.work = None
+        self._done.set()
+
+
+class JobQueue:
+    """
+    In-process job scheduler on a thread pool. Jobs are identified by a key: submitting a key
+    that is queued, running or finished (and not expired) returns the existing job, so identical
+    work requested by several sessions runs once and its result is cached for later requests.
+    """
+
+    def __init__(self, workers=JOB_WORKERS):
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="job")
+        self.jobs = OrderedDict()
+        self.by_id = {}
+        self.lock = threading.Lock()
+
+    def submit(self, key, work, owner=None, ttl=None):
+        """
+        Runs work(job) in the background unless a job for `key` exists already; returns the job.
+        Results are reused for `ttl` seconds (forever if None); failed and cancelled jobs are retried.
+        """
+        with self.lock:
+            job = self.jobs.get(key)
+            if job is not None and job.state not in (FAILED, CANCELLED) and not job.expired():
+                self.jobs.move_to_end(key)
+                if owner is not None:
+                    job.owners.add(owner)
+                return job
+            if job is not None:
+                del self.by_id[job.id]
+            job = Job(key, work, ttl)
+            if owner is not None:
+                job.owners.add(owner)
+            self.jobs[key] = job
+            self.by_id[job.id] = job
+            self._evict()
+            job.future = self.pool.submit(job._run)
+        return job
+
+    def _evict(self):
+        for key in [key for key, job in self.jobs.items() if job.expired()]:
+            del self.by_id[self.jobs.pop(key).id]
+        finished = [key for key, job in self.jobs.items() if job.finished is not None]
+        for key in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self.by_id[self.jobs.pop(key).id]
+
+    def get(self, job_id):
+        with self.lock:
+            return self.by_id.get(job_id)
+
+    def cancel(self, job_id, owner=None):
+        """
+        Withdraws `owner` from the job (everyone if owner is None) and cancels it once nobody is
+        waiting for it: queued jobs never start, running ones stop at their next check().
+        Returns True if the job was cancelled.
+        """
+        with self.lock:
+            job = self.by_id.get(job_id)
+            if job is None or job.finished is not None:
+                return False
+            if owner is None:
+                job.owners.clear()
+            else:
+                job.owners.discard(owner)
+            if job.owners:
+                return False
+            job._cancel.set()
+            if job.future.cancel():
+                job._finish(CANCELLED)
+            return True
+
+    def run(self, key, work, owner=None, ttl=None, timeout=None):
+        """Submits (or reuses) the job for `key` and waits for its result; raises its error if it failed."""
+        job = self.submit(key, work, owner, ttl)
+        if not job.wait(timeout):
+            raise TimeoutError(f"Job {job.id} did not finish within {timeout} s")
+        if job.state == FAILED:
+            raise job.error
+        if job.state == CANCELLED:
+            raise JobCancelled(key)
+        return job.result
+
+
+_queue = None
+_lock = threading.Lock()
+
+
+def get_job_queue():
+    """Returns the process-wide job queue shared by every session."""
+    global _queue
+    with _lock:
+        if _queue is None:
+            _queue = JobQueue()
+        return _queue
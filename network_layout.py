@@ -0,0 +1,224 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from transaction_store import cached_derived
+
+SENDER_COLUMNS = ["address", "Sender Wallet"]
+RECEIVER_COLUMNS = ["recipient", "Receiver Wallet"]
+
+# Budget for the Plotly figure sent to the browser, and the rough JSON cost of one node / edge
+DEFAULT_PAYLOAD_BYTES = 1500000
+BYTES_PER_NODE = 110
+BYTES_PER_EDGE = 170
+# Above this many nodes, repulsion is estimated from a random sample of nodes instead of all pairs
+EXACT_REPULSION_NODES = 2000
+REPULSION_SAMPLE = 256
+OTHER_WALLETS = "Other wallets"
+
+
+def _column(df, names):
+    for name in names:
+        if name in df.columns:
+            return df[name]
+    raise KeyError(f"Expected one of the columns {names}")
+
+
+def _aggregate_edges(sources, targets, weights, n_nodes):
+    """Merges parallel and reversed edges into undirected (low, high) edges with summed weights."""
+    keep = sources != targets
+    low = np.minimum(sources[keep], targets[keep]).astype(np.int64)
+    high = np.maximum(sources[keep], targets[keep]).astype(np.int64)
+    keys, inverse = np.unique(low * n_nodes + high, return_inverse=True)
+    return np.column_stack([keys // n_nodes, keys % n_nodes]), np.bincount(inverse, weights=weights[keep])
+
+
+def _adjacency_product(edges, weights, vectors):
+    """Sparse (symmetric) adjacency matrix times `vectors`, from the edge list."""
+    result = np.zeros_like(vectors)
+    for column in range(vectors.shape[1]):
+        result[:, column] = (np.bincount(edges[:, 0], weights=weights * vectors[edges[:, 1], column],
+                                         minlength=len(vectors))
+                             + np.bincount(edges[:, 1], weights=weights * vectors[edges[:, 0], column],
+                                           minlength=len(vectors)))
+    return result
+
+
+def spectral_layout(n_nodes, edges, weights, dimensions=3, iterations=100, seed=42):
+    """3D coordinates from the leading non-trivial eigenvectors of the normalized adjacency matrix."""
+    rng = np.random.default_rng(seed)
+    if len(edges) == 0 or n_nodes <= dimensions + 1:
+        return rng.random((n_nodes, dimensions))
+    degree = np.bincount(edges.ravel(), weights=np.repeat(weights, 2), minlength=n_nodes)
+    scale = 1.0 / np.sqrt(np.maximum(degree, 1e-12))
+    normalized = weights * scale[edges[:, 0]] * scale[edges[:, 1]]
+    trivial = np.sqrt(degree) / np.linalg.norm(np.sqrt(degree))
+    vectors = rng.standard_normal((n_nodes, dimensions))
+    for _ in range(iterations):
+        # Shifted subspace iteration on (I + A_norm) / 2, keeping vectors orthogonal to the trivial one
+        vectors = (vectors + _adjacency_product(edges, normalized, vectors)) / 2
+        vectors -= np.outer(trivial, trivial @ vectors)
+        vectors, _ = np.linalg.qr(vectors)
+    return vectors / np.maximum(np.abs(vectors).max(axis=0), 1e-12)
+
+
+def force_directed_layout(positions, edges, weights, iterations=30, chunk_size=512, seed=42):
+    """
+    Fruchterman-Reingold refinement of `positions`, with vectorized pairwise repulsion
+    (sampled, and scaled up, for graphs above EXACT_REPULSION_NODES).
+    """
+    rng = np.random.default_rng(seed)
+    n_nodes = len(positions)
+    positions = positions.copy()
+    k = 1.0 / np.cbrt(max(n_nodes, 1))
+    temperature = 0.1
+    log_weights = np.log1p(weights)
+    for _ in range(iterations):
+        displacement = np.zeros_like(positions)
+        if n_nodes > EXACT_REPULSION_NODES:
+            others, scale = positions[rng.choice(n_nodes, REPULSION_SAMPLE, replace=False)], n_nodes / REPULSION_SAMPLE
+        else:
+            others, scale = positions, 1.0
+        for start in range(0, n_nodes, chunk_size):
+            delta = positions[start:start + chunk_size, None, :] - others[None, :, :]
+            squared = np.maximum(np.einsum("ijk,ijk->ij", delta, delta), 1e-6)
+            displacement[start:start + chunk_size] = scale * k * k * np.einsum("ijk,ij->ik", delta, 1.0 / squared)
+        delta = positions[edges[:, 0]] - positions[edges[:, 1]]
+        distance = np.maximum(np.linalg.norm(delta, axis=1), 1e-3)
+        pull = delta * (distance * log_weights / k)[:, None]
+        for axis in range(3):
+            displacement[:, axis] -= np.bincount(edges[:, 0], weights=pull[:, axis], minlength=n_nodes)
+            displacement[:, axis] += np.bincount(edges[:, 1], weights=pull[:, axis], minlength=n_nodes)
+        length = np.maximum(np.linalg.norm(displacement, axis=1), 1e-9)
+        positions += displacement / length[:, None] * np.minimum(length, temperature)[:, None]
+        temperature *= 0.92
+    return positions
+
+
+class NetworkLayout:
+    """
+    A level-of-detail 3D layout of the wallet graph: the highest-degree wallets as nodes, every
+    other wallet folded into its strongest kept neighbour (or an "Other wallets" node), and
+    only the heaviest edges kept for drawing.
+    """
+
+    def __init__(self, df, max_nodes, max_edges, seed=42):
+        senders = _column(df, SENDER_COLUMNS).astype(str).to_numpy()
+        receivers = _column(df, RECEIVER_COLUMNS).astype(str).to_numpy()
+        codes, wallets = pd.factorize(np.concatenate([senders, receivers]))
+        n_wallets, n_rows = len(wallets), len(df)
+        edges, weights = _aggregate_edges(codes[:n_rows], codes[n_rows:], np.ones(n_rows), max(n_wallets, 1))
+        degree = np.bincount(edges.ravel(), weights=np.repeat(weights, 2), minlength=n_wallets)
+
+        # Level of detail: keep the top wallets by degree, cluster the rest onto kept neighbours
+        n_kept = min(max_nodes - 1, n_wallets)
+        kept = np.argsort(-degree, kind="stable")[:n_kept]
+        node_of = np.full(n_wallets, -1, dtype=np.int64)
+        node_of[kept] = np.arange(n_kept)
+        minor, target, link = [], [], []
+        for a, b in ((0, 1), (1, 0)):
+            minor_to_kept = (node_of[edges[:, a]] < 0) & (node_of[edges[:, b]] >= 0)
+            minor.append(edges[minor_to_kept, a])
+            target.append(edges[minor_to_kept, b])
+            link.append(weights[minor_to_kept])
+        minor, target, link = np.concatenate(minor), np.concatenate(target), np.concatenate(link)
+        if len(minor):
+            # The heaviest link of each minor wallet is the last one after sorting by (wallet, weight)
+            order = np.lexsort((link, minor))
+            minor, target = minor[order], target[order]
+            last = np.r_[minor[1:] != minor[:-1], True]
+            node_of[minor[last]] = node_of[target[last]]
+        other = node_of < 0
+        n_nodes = n_kept + int(other.any())
+        node_of[other] = n_kept
+
+        self.wallets = wallets
+        self.node_of = node_of
+        self.is_kept = np.zeros(n_wallets, dtype=bool)
+        self.is_kept[kept] = True
+        self.labels = np.concatenate([wallets[kept].astype(object), [OTHER_WALLETS] if other.any() else []])
+        self.sizes = np.bincount(node_of, minlength=n_nodes)
+
+        node_edges, node_weights = _aggregate_edges(node_of[edges[:, 0]], node_of[edges[:, 1]], weights,
+                                                    max(n_nodes, 1))
+        positions = spectral_layout(n_nodes, node_edges, node_weights, seed=seed)
+        if len(node_edges):
+            positions = force_directed_layout(positions, node_edges, node_weights, seed=seed)
+        self.positions = positions
+        strongest = np.argsort(-node_weights, kind="stable")[:max_edges]
+        self.edges = node_edges[strongest]
+        self.edge_weights = node_weights[strongest]
+        self._wallet_codes = None
+
+    def _codes(self, wallets):
+        if self._wallet_codes is None:
+            self._wallet_codes = pd.Index(self.wallets)
+        codes = self._wallet_codes.get_indexer(pd.Index(wallets).astype(str))
+        return np.unique(codes[codes >= 0])
+
+    def nodes_of(self, wallets):
+        """
+        Layout node indices of the given wallet addresses that are drawn as their own node. Folded
+        wallets are skipped rather than mapped to the neighbour (or "Other wallets") they were
+        merged into, so flagging one never marks a node standing for someone else.
+        """
+        codes = self._codes(wallets)
+        return np.unique(self.node_of[codes[self.is_kept[codes]]])
+
+    def folded_count(self, wallets):
+        """How many of the given wallet addresses are folded into another node."""
+        codes = self._codes(wallets)
+        return int((~self.is_kept[codes]).sum())
+
+    def _transaction_wallets(self, df):
+        return pd.concat([_column(df, SENDER_COLUMNS).astype(str), _column(df, RECEIVER_COLUMNS).astype(str)])
+
+    def nodes_of_transactions(self, df):
+        """Layout node indices of every sender and receiver in `df` that has its own node."""
+        return self.nodes_of(self._transaction_wallets(df))
+
+    def folded_count_of_transactions(self, df):
+        """How many distinct senders and receivers in `df` are folded into another node."""
+        return self.folded_count(self._transaction_wallets(df))
+
+
+def payload_limits(payload_bytes):
+    """Splits a payload budget evenly between nodes and edges."""
+    return max(int(payload_bytes / 2 / BYTES_PER_NODE), 2), int(payload_bytes / 2 / BYTES_PER_EDGE)
+
+
+def build_layout(df, payload_bytes=DEFAULT_PAYLOAD_BYTES):
+    max_nodes, max_edges = payload_limits(payload_bytes)
+    return NetworkLayout(df, max_nodes, max_edges)
+
+
+def get_network_layout(path, payload_bytes=DEFAULT_PAYLOAD_BYTES):
+    """Returns the layout of the dataset at `path`, computed once per dataset version and budget."""
+    return cached_derived(path, f"network_layout:{payload_bytes}",
+                          lambda df: build_layout(df, payload_bytes))
+
+
+def network_figure(layout, fraud_nodes=()):
+    """The Plotly 3D figure of a layout, with the nodes in `fraud_nodes` highlighted in red."""
+    positions = np.round(layout.positions, 4)
+    edge_points = np.full((len(layout.edges) * 3, 3), np.nan)
+    edge_points[0::3] = positions[layout.edges[:, 0]]
+    edge_points[1::3] = positions[layout.edges[:, 1]]
+    marker_size = np.round(4 + 2 * np.log1p(layout.sizes), 1)
+    hover = [f"{label} ({size} wallets)" if size > 1 else label for label, size in zip(layout.labels, layout.sizes)]
+
+    fig = go.Figure()
+    fig.add_trace(go.Scatter3d(x=edge_points[:, 0], y=edge_points[:, 1], z=edge_points[:, 2], mode='lines',
+                               line=dict(color='lightgray', width=1), hoverinfo='skip', name="Transfers"))
+    fig.add_trace(go.Scatter3d(x=positions[:, 0], y=positions[:, 1], z=positions[:, 2], mode='markers',
+                               marker=dict(size=marker_size, color='blue', opacity=0.6),
+                               text=hover, hoverinfo='text', name="Wallets"))
+    fraud_nodes = np.asarray(fraud_nodes, dtype=np.int64)
+    if len(fraud_nodes):
+        fig.add_trace(go.Scatter3d(x=positions[fraud_nodes, 0], y=positions[fraud_nodes, 1],
+                                   z=positions[fraud_nodes, 2], mode='markers',
+                                   marker=dict(size=marker_size[fraud_nodes], color='red', opacity=0.8),
+                                   text=[hover[i] for i in fraud_nodes], hoverinfo='text',
+                                   name="Fraudulent Transactions"))
+    fig.update_layout(scene=dict(xaxis_title='X', yaxis_title='Y', zaxis_title='Z'),
+                      title="3D Blockchain Network Visualization")
+    return fig
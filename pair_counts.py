@@ -0,0 +1,233 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+from transaction_store import cached_derived, dataset_version, store_location
+from transaction_log import get_transaction_log
+
+SENDER_COLUMNS = ["address", "Sender Wallet"]
+RECEIVER_COLUMNS = ["recipient", "Receiver Wallet"]
+AMOUNT_COLUMNS = ["amount", "Amount Transacted"]
+
+# Pending updates are folded into the sorted arrays once this many pairs have accumulated
+FOLD_AFTER_PAIRS = 10000
+
+
+def _column(df, names, required=True):
+    for name in names:
+        if name in df.columns:
+            return df[name]
+    if required:
+        raise KeyError(f"Expected one of the columns {names}")
+    return None
+
+
+def _field(record, names, default=None):
+    for name in names:
+        if name in record:
+            return record[name]
+    if default is None:
+        raise KeyError(f"Expected one of the fields {names}")
+    return default
+
+
+def _pair_key(sender_codes, receiver_codes):
+    return np.asarray(sender_codes, dtype=np.int64) << 32 | np.asarray(receiver_codes, dtype=np.int64)
+
+
+class PairCounts:
+    """
+    Transaction count and amount per (sender, receiver) pair, stored as a sparse COO matrix:
+    sorted int64 keys (sender_code << 32 | receiver_code) with parallel count and amount arrays.
+    New transactions go into a small pending dict that is folded in periodically.
+    """
+
+    def __init__(self):
+        self.wallets = []
+        self.codes = {}
+        self.keys = np.empty(0, dtype=np.int64)
+        self.counts = np.empty(0, dtype=np.int64)
+        self.amounts = np.empty(0, dtype=np.float64)
+        self.by_receiver = np.empty(0, dtype=np.int64)
+        self.receivers_sorted = np.empty(0, dtype=np.int64)
+        self.pending = {}
+        # Number of transaction-log records already counted
+        self.log_applied = 0
+        self.lock = threading.RLock()
+
+    def code(self, wallet):
+        code = self.codes.get(wallet)
+        if code is None:
+            code = self.codes[wallet] = len(self.wallets)
+            self.wallets.append(wallet)
+        return code
+
+    def add(self, sender, receiver, amount=0.0):
+        """Counts one more transaction from `sender` to `receiver` in O(1)."""
+        with self.lock:
+            key = self.code(sender) << 32 | self.code(receiver)
+            count, total = self.pending.get(key, (0, 0.0))
+            self.pending[key] = (count + 1, total + float(amount))
+            if len(self.pending) >= FOLD_AFTER_PAIRS:
+                self._fold()
+
+    def add_frame(self, df):
+        """Counts every transaction of `df` with one vectorized group-by-key pass."""
+        senders = _column(df, SENDER_COLUMNS).astype(str).to_numpy()
+        receivers = _column(df, RECEIVER_COLUMNS).astype(str).to_numpy()
+        amount_column = _column(df, AMOUNT_COLUMNS, required=False)
+        amounts = np.zeros(len(df)) if amount_column is None else \
+            pd.to_numeric(amount_column, errors="coerce").fillna(0).to_numpy(dtype=np.float64)
+        with self.lock:
+            codes, uniques = pd.factorize(np.concatenate([senders, receivers]))
+            mapping = np.array([self.code(wallet) for wallet in uniques], dtype=np.int64)
+            keys = _pair_key(mapping[codes[:len(df)]], mapping[codes[len(df):]])
+            unique_keys, inverse = np.unique(keys, return_inverse=True)
+            self._merge(unique_keys, np.bincount(inverse, minlength=len(unique_keys)),
+                        np.bincount(inverse, weights=amounts, minlength=len(unique_keys)))
+
+    def _merge(self, keys, counts, amounts):
+        # keys are sorted and unique
+        position = np.searchsorted(self.keys, keys)
+        found = position < len(self.keys)
+        found[found] = self.keys[position[found]] == keys[found]
+        np.add.at(self.counts, position[found], counts[found])
+        np.add.at(self.amounts, position[found], amounts[found])
+        if found.all():
+            return
+        # Insert the new pairs in place (O(pairs), no re-sort) and shift the receiver index to match
+        new = ~found
+        insert_at = position[new]
+        new_keys = keys[new]
+        old_size = len(self.keys)
+        self.keys = np.insert(self.keys, insert_at, new_keys)
+        self.counts = np.insert(self.counts, insert_at, counts[new])
+        self.amounts = np.insert(self.amounts, insert_at, amounts[new])
+        shifted = np.arange(old_size) + np.searchsorted(insert_at, np.arange(old_size), side="right")
+        new_indices = insert_at + np.arange(len(new_keys))
+        new_receivers = new_keys & 0xFFFFFFFF
+        order = np.argsort(new_receivers, kind="stable")
+        receiver_at = np.searchsorted(self.receivers_sorted, new_receivers[order], side="right")
+        self.by_receiver = np.insert(shifted[self.by_receiver], receiver_at, new_indices[order])
+        self.receivers_sorted = np.insert(self.receivers_sorted, receiver_at, new_receivers[order])
+
+    def _index_receivers(self):
+        receiver_major = (self.keys & 0xFFFFFFFF) << 32 | self.keys >> 32
+        self.by_receiver = np.argsort(receiver_major, kind="stable")
+        self.receivers_sorted = self.keys[self.by_receiver] & 0xFFFFFFFF
+
+    def _fold(self):
+        if not self.pending:
+            return
+        keys = np.fromiter(self.pending.keys(), dtype=np.int64, count=len(self.pending))
+        values = list(self.pending.values())
+        counts = np.array([v[0] for v in values], dtype=np.int64)
+        amounts = np.array([v[1] for v in values], dtype=np.float64)
+        order = np.argsort(keys)
+        self.pending = {}
+        self._merge(keys[order], counts[order], amounts[order])
+
+    def __len__(self):
+        with self.lock:
+            self._fold()
+            return len(self.keys)
+
+    def _frame(self, indices):
+        keys = self.keys[indices]
+        return pd.DataFrame({
+            "address": [self.wallets[code] for code in (keys >> 32).tolist()],
+            "recipient": [self.wallets[code] for code in (keys & 0xFFFFFFFF).tolist()],
+            "transaction_count": self.counts[indices],
+            "amount": self.amounts[indices],
+        })
+
+    def top(self, k=20, by="transaction_count"):
+        """The k pairs with the most transactions (or the largest total amount with by="amount")."""
+        with self.lock:
+            self._fold()
+            values = self.counts if by == "transaction_count" else self.amounts
+            k = min(k, len(values))
+            if k == 0:
+                return self._frame(np.empty(0, dtype=np.int64))
+            indices = np.argpartition(-values, k - 1)[:k]
+            indices = indices[np.argsort(-values[indices], kind="stable")]
+            return self._frame(indices)
+
+    def neighbours(self, wallet):
+        """Every pair `wallet` takes part in, as sender or receiver, in O(log pairs + degree)."""
+        with self.lock:
+            self._fold()
+            code = self.codes.get(wallet)
+            if code is None:
+                return self._frame(np.empty(0, dtype=np.int64))
+            sent = np.arange(*np.searchsorted(self.keys, [code << 32, (code + 1) << 32]))
+            start, end = np.searchsorted(self.receivers_sorted, [code, code + 1])
+            received = self.by_receiver[start:end]
+            return self._frame(np.union1d(sent, received))
+
+    def to_frame(self):
+        with self.lock:
+            self._fold()
+            return self._frame(np.arange(len(self.keys)))
+
+    def save(self, path, version):
+        with self.lock:
+            self._fold()
+            tmp_path = path + ".tmp.npz"
+            np.savez(tmp_path, wallets=np.asarray(self.wallets, dtype=str), keys=self.keys, counts=self.counts,
+                     amounts=self.amounts, version=np.array([version[1], version[2]], dtype=np.int64))
+            os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, version):
+        """Loads a saved aggregate, or returns None if it belongs to another dataset version."""
+        try:
+            data = np.load(path)
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+        if list(data["version"]) != [version[1], version[2]]:
+            return None
+        counts = cls()
+        counts.wallets = data["wallets"].tolist()
+        counts.codes = {wallet: code for code, wallet in enumerate(counts.wallets)}
+        counts.keys, counts.counts, counts.amounts = data["keys"], data["counts"], data["amounts"]
+        counts._index_receivers()
+        return counts
+
+    def sync_log(self, log):
+        """Counts the transaction-log records appended since the last sync."""
+        compacted, records = log.snapshot()
+        with self.lock:
+            if self.log_applied < len(compacted):
+                self.add_frame(compacted.iloc[self.log_applied:])
+                self.log_applied = len(compacted)
+            new_records = records[self.log_applied - len(compacted):]
+            for record in new_records:
+                self.add(_field(record, SENDER_COLUMNS), _field(record, RECEIVER_COLUMNS),
+                         float(_field(record, AMOUNT_COLUMNS, default=0.0)))
+            self.log_applied += len(new_records)
+
+
+def get_pair_counts(path):
+    """
+    Returns the pair-count aggregate of the dataset at `path` plus its transaction log.
+    The base part is persisted next to the dataset and rebuilt only when the file changes;
+    log records appended since the previous call are counted incrementally.
+    """
+    def build(df):
+        version = dataset_version(path)
+        saved_path = store_location(path, ".pairs.npz")
+        counts = PairCounts.load(saved_path, version)
+        if counts is None:
+            counts = PairCounts()
+            counts.add_frame(df)
+            try:
+                os.makedirs(os.path.dirname(saved_path), exist_ok=True)
+                counts.save(saved_path, version)
+            except OSError:
+                pass
+        return counts
+
+    counts = cached_derived(path, "pair_counts", build)
+    counts.sync_log(get_transaction_log(path))
+    return counts
@@ -0,0 +1,173 @@
+import os
+import hashlib
+import threading
+from transaction_store import dataset_version, store_location
+from transaction_log import get_transaction_log
+
+# Finished reports kept per dataset (oldest removed first)
+MAX_CACHED_REPORTS = 32
+# Reports with more items than this are built by a background worker
+BACKGROUND_AFTER_ITEMS = 20000
+
+
+def write_pdf(render, path, progress=lambda fraction: None):
+    """
+    Renders a report with render(canvas, progress) into `path`, saving it to a temporary file next
+    to it and publishing it with a rename so readers never see a partly written file.
+    ReportLab keeps the whole document in memory until save(), which then writes the file once.
+    """
+    # ReportLab is only loaded once a report is actually built
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        c = canvas.Canvas(tmp_path, pagesize=letter, pageCompression=1)
+        render(c, progress)
+        c.save()
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def address_list_report(addresses, title="Unique Blockchain Addresses (Pseudonymous Properties):"):
+    """Render function listing `addresses`, one per line, with the title repeated on every page."""
+    def render(c, progress):
+        from reportlab.lib.pagesizes import letter
+        width, height = letter
+        c.setFont("Helvetica", 12)
+        c.drawString(30, height - 30, title)
+        y_position = height - 50
+        for i, address in enumerate(addresses):
+            c.drawString(30, y_position, str(address))
+            y_position -= 20
+            if y_position < 50:
+                c.showPage()
+                c.setFont("Helvetica", 12)
+                c.drawString(30, height - 30, title)
+                y_position = height - 50
+                progress(i / len(addresses))
+    return render
+
+
+def transaction_type_report(transaction_counts):
+    """Render function for the per-transaction-type counts (a frame of transaction_type, count)."""
+    def render(report, progress):
+        report.drawString(100, 750, "Blockchain Analysis Report")
+        report.drawString(100, 730, f"Total Transactions: {transaction_counts['count'].sum()}")
+        y_position = 700
+        for index, row in transaction_counts.iterrows():
+            report.drawString(100, y_position, f"{row['transaction_type']}: {row['count']} transactions")
+            y_position -= 20
+            if y_position < 50:  # Add a new page if needed
+                report.showPage()
+                y_position = 750
+    return render
+
+
+class ReportJob:
+    """One report build: state is "running", "done" or "failed"; progress goes from 0 to 1."""
+
+    def __init__(self, key, path):
+        self.key = key
+        self.path = path
+        self.state = "running"
+        self.progress = 0.0
+        self.error = None
+
+
+class ReportService:
+    """
+    Builds PDF reports on request and caches the finished files in `directory`, keyed by the
+    dataset version and the report parameters, so a report is rendered at most once per version.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.jobs = {}
+        self.lock = threading.Lock()
+
+    def key(self, version, name, params=()):
+        """Cache key of report `name` with `params` for one dataset version."""
+        return hashlib.sha1(repr((version, name, tuple(params))).encode("utf-8")).hexdigest()
+
+    def _file(self, key):
+        return os.path.join(self.directory, key + ".pdf")
+
+    def job(self, key):
+        """The build of `key` (running, finished or failed), or None if it was never requested."""
+        with self.lock:
+            job = self.jobs.get(key)
+        if job is None and os.path.exists(self._file(key)):
+            job = ReportJob(key, self._file(key))
+            job.state, job.progress = "done", 1.0
+            with self.lock:
+                self.jobs[key] = job
+        return job
+
+    def submit(self, key, render, background=False):
+        """
+        Builds report `key` with render(canvas, progress), where progress(fraction) reports how far
+        it got. Runs inline unless `background`; a build already running or finished is reused.
+        """
+        with self.lock:
+            job = self.jobs.get(key)
+            if job is not None and job.state != "failed":
+                return job
+            job = self.jobs[key] = ReportJob(key, self._file(key))
+        if background:
+            from job_queue import get_job_queue
+            get_job_queue().submit(("report", self.directory, key), lambda queued: self._build(job, render))
+        else:
+            self._build(job, render)
+        return job
+
+    def _build(self, job, render):
+        def progress(fraction):
+            job.progress = min(max(fraction, 0.0), 1.0)
+
+        try:
+            write_pdf(render, job.path, progress)
+            self._evict()
+            job.progress, job.state = 1.0, "done"
+        except Exception as e:
+            job.error, job.state = e, "failed"
+
+    def _evict(self):
+        reports = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".pdf"):
+                path = os.path.join(self.directory, name)
+                try:
+                    reports.append((os.path.getmtime(path), path))
+                except OSError:
+                    # Removed meanwhile (e.g. by another process evicting)
+                    pass
+        reports.sort()
+        for _, path in reports[:-MAX_CACHED_REPORTS]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        with self.lock:
+            for key in [key for key, job in self.jobs.items() if job.state == "done" and not os.path.exists(job.path)]:
+                del self.jobs[key]
+
+
+_services = {}
+_lock = threading.Lock()
+
+
+def report_version(path):
+    """Version of the dataset at `path` a report depends on: the source file plus its appended log."""
+    return dataset_version(path) + (len(get_transaction_log(path)),)
+
+
+def get_report_service(path):
+    """Returns the process-wide report service caching the reports of the dataset at `path`."""
+    directory = store_location(path, ".reports")
+    with _lock:
+        if directory not in _services:
+            _services[directory] = ReportService(directory)
+        return _services[directory]
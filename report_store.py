@@ -0,0 +1,145 @@
+import os
+import json
+import sqlite3
+import threading
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from transaction_store import cached_derived
+
+REPORTS_DB_PATH = "reports.db"
+# Reports saved by earlier versions, imported once when the database is created
+LEGACY_REPORTS_PATH = "reports.json"
+PAGE_SIZE = 50
+TX_ID_COLUMNS = ["Transaction ID", "transaction_id"]
+# Seconds a writer waits for another writer's lock before giving up
+BUSY_TIMEOUT_SECONDS = 10
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY,
+    transaction_id TEXT NOT NULL,
+    reported_by TEXT NOT NULL,
+    notes TEXT NOT NULL,
+    timestamp TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS reports_transaction_id ON reports (transaction_id);
+CREATE INDEX IF NOT EXISTS reports_reported_by ON reports (reported_by);
+CREATE INDEX IF NOT EXISTS reports_timestamp ON reports (timestamp, id);
+"""
+
+
+class ReportStore:
+    """
+    Analyst reports in an SQLite table (WAL mode, so readers never block the writer), indexed
+    by transaction id, reporter and time. Each submission is one insert, concurrent writers
+    from any process are serialised by SQLite, and reads are paginated.
+    """
+
+    def __init__(self, path=REPORTS_DB_PATH, legacy_path=LEGACY_REPORTS_PATH):
+        self.path = path
+        self.local = threading.local()
+        # Reported transaction ids, kept up to date by reading only the rows added since
+        self.reported = set()
+        self.reported_through = 0
+        self.lock = threading.Lock()
+        created = not os.path.exists(path)
+        with self._connection() as db:
+            db.executescript(_SCHEMA)
+        if created and legacy_path and os.path.exists(legacy_path):
+            with open(legacy_path, "r") as f:
+                self.add_many(json.load(f))
+
+    def _connection(self):
+        # SQLite connections may not be shared between threads, so each thread opens its own
+        db = getattr(self.local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_SECONDS)
+            db.row_factory = sqlite3.Row
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self.local.db = db
+        return db
+
+    def add(self, transaction_id, reported_by, notes, timestamp=None):
+        """Saves one report and returns its id."""
+        timestamp = timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self._connection() as db:
+            cursor = db.execute("INSERT INTO reports (transaction_id, reported_by, notes, timestamp) VALUES (?, ?, ?, ?)",
+                                (str(transaction_id), reported_by, notes, timestamp))
+        return cursor.lastrowid
+
+    def add_many(self, reports):
+        """Saves a list of report dicts in one transaction."""
+        with self._connection() as db:
+            db.executemany("INSERT INTO reports (transaction_id, reported_by, notes, timestamp) VALUES (?, ?, ?, ?)",
+                           [(str(r["transaction_id"]), r["reported_by"], r["notes"], r["timestamp"]) for r in reports])
+
+    def _where(self, transaction_id, reported_by):
+        clauses, params = [], []
+        if transaction_id:
+            clauses.append("transaction_id = ?")
+            params.append(str(transaction_id))
+        if reported_by:
+            clauses.append("reported_by = ?")
+            params.append(reported_by)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def count(self, transaction_id=None, reported_by=None):
+        where, params = self._where(transaction_id, reported_by)
+        return self._connection().execute("SELECT COUNT(*) FROM reports" + where, params).fetchone()[0]
+
+    def n_pages(self, page_size=PAGE_SIZE, **filters):
+        return max(1, -(-self.count(**filters) // page_size))
+
+    def page(self, number=1, page_size=PAGE_SIZE, transaction_id=None, reported_by=None):
+        """Page `number` (from 1) of the matching reports, newest first, as a list of dicts."""
+        where, params = self._where(transaction_id, reported_by)
+        rows = self._connection().execute(
+            "SELECT transaction_id, reported_by, notes, timestamp FROM reports" + where
+            + " ORDER BY timestamp DESC, id DESC LIMIT ? OFFSET ?",
+            params + [page_size, (max(number, 1) - 1) * page_size]).fetchall()
+        return [dict(row) for row in rows]
+
+    def reported_transactions(self):
+        """The set of transaction ids with at least one report."""
+        with self.lock:
+            rows = self._connection().execute("SELECT id, transaction_id FROM reports WHERE id > ? ORDER BY id",
+                                              (self.reported_through,)).fetchall()
+            if rows:
+                self.reported.update(row["transaction_id"] for row in rows)
+                self.reported_through = rows[-1]["id"]
+            return set(self.reported)
+
+
+def _transaction_positions(df):
+    for column in TX_ID_COLUMNS:
+        if column in df.columns:
+            return pd.Index(df[column].astype(str))
+    return pd.Index([], dtype=object)
+
+
+def reported_rows(path, store):
+    """
+    Row positions, in the dataset at `path`, of the transactions reported in `store`. Resolved
+    through an index of transaction ids (built once per dataset version), not a scan of the rows.
+    """
+    positions = cached_derived(path, "transaction_positions", _transaction_positions)
+    reported = list(store.reported_transactions())
+    if not reported or not len(positions):
+        return np.empty(0, dtype=np.int64)
+    rows = positions.get_indexer_for(reported)
+    return np.unique(rows[rows >= 0])
+
+
+_stores = {}
+_lock = threading.Lock()
+
+
+def get_report_store(path=REPORTS_DB_PATH):
+    """Returns the process-wide report store saved at `path`."""
+    path = os.path.abspath(path)
+    with _lock:
+        if path not in _stores:
+            _stores[path] = ReportStore(path)
+        return _stores[path]
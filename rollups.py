@@ -0,0 +1,248 @@
+import threading
+import numpy as np
+import pandas as pd
+from transaction_store import cached_derived
+from time_columns import epoch_ns, NAT
+from transaction_log import get_transaction_log
+
+# First column found of each list is used; missing dimensions roll up under UNKNOWN
+DATE_COLUMNS = ["Date", "date", "Timestamp", "timestamp"]
+AMOUNT_COLUMNS = ["amount", "Amount Transacted"]
+DIMENSIONS = {
+    "cryptocurrency": ["Cryptocurrency", "cryptocurrency", "currency"],
+    "risk_score": ["Risk Score", "risk_score"],
+    "transaction_type": ["transaction_type", "Transaction Type", "type"],
+}
+KEYS = ["day"] + list(DIMENSIONS)
+UNKNOWN = "Unknown"
+# Rows without a usable date land in this day bucket, included only in unbounded ranges
+UNDATED_DAY = -1
+NS_PER_DAY = 86400 * 10 ** 9
+
+# Quantile sketch: log-spaced buckets with this relative accuracy (mergeable by adding counts)
+SKETCH_RELATIVE_ACCURACY = 0.01
+_GAMMA = (1 + SKETCH_RELATIVE_ACCURACY) / (1 - SKETCH_RELATIVE_ACCURACY)
+_LOG_GAMMA = np.log(_GAMMA)
+_ZERO_BUCKET = 0
+# Pending sketch rows are folded into the sorted sketch table once this many have accumulated
+FOLD_AFTER_ROWS = 100000
+
+
+def _first_column(df, names):
+    for name in names:
+        if name in df.columns and df[name].notna().any():
+            return df[name]
+    return None
+
+
+def _days(values):
+    """Days since the epoch of dates / timestamps (UNDATED_DAY where missing or unparseable)."""
+    if values is None:
+        return None
+    ns = epoch_ns(values)
+    return np.where(ns == NAT, UNDATED_DAY, ns // NS_PER_DAY)
+
+
+def sketch_bucket(values):
+    """Sketch bucket of each value: sign * (offset + ceil(log_gamma |value|)), 0 for zero."""
+    values = np.asarray(values, dtype=np.float64)
+    magnitude = np.abs(values)
+    with np.errstate(divide="ignore"):
+        index = np.ceil(np.log(np.where(magnitude > 0, magnitude, 1.0)) / _LOG_GAMMA).astype(np.int64)
+    # Offset so buckets of values below 1 stay distinct from the zero bucket
+    index = index + (1 << 20)
+    return np.where(magnitude > 0, np.sign(values).astype(np.int64) * index, _ZERO_BUCKET)
+
+
+def bucket_value(buckets):
+    """Representative value of each sketch bucket (within SKETCH_RELATIVE_ACCURACY of its members)."""
+    buckets = np.asarray(buckets, dtype=np.int64)
+    index = np.abs(buckets) - (1 << 20)
+    value = 2 * np.power(_GAMMA, index.astype(np.float64)) / (_GAMMA + 1)
+    return np.where(buckets == _ZERO_BUCKET, 0.0, np.sign(buckets) * value)
+
+
+class DailyRollups:
+    """
+    Per (day, cryptocurrency, risk score, transaction type) aggregates of the transaction amount:
+    count, sum, sum of squares, min, max and a mergeable log-bucket quantile sketch. Any date
+    range is answered by merging day buckets; new transactions are folded in incrementally.
+    """
+
+    def __init__(self):
+        self.groups = pd.DataFrame({key: pd.Series(dtype=np.int64 if key == "day" else object) for key in KEYS})
+        for column, dtype in (("count", np.int64), ("sum", np.float64), ("sum_sq", np.float64),
+                              ("min", np.float64), ("max", np.float64)):
+            self.groups[column] = pd.Series(dtype=dtype)
+        # Sketch counts per (group row, bucket), plus pending rows not yet folded in
+        self.sketch = pd.Series(dtype=np.int64, index=pd.MultiIndex.from_arrays([[], []], names=["group", "bucket"]))
+        self.pending = []
+        self.group_rows = {}
+        # Number of transaction-log records already folded in
+        self.log_applied = 0
+        self.lock = threading.RLock()
+
+    def _rows(self, df):
+        """The key columns and amounts of `df` as a frame (one row per transaction)."""
+        days = _days(_first_column(df, DATE_COLUMNS))
+        amounts = _first_column(df, AMOUNT_COLUMNS)
+        rows = pd.DataFrame({"day": np.full(len(df), UNDATED_DAY) if days is None else days}, index=df.index)
+        for key, names in DIMENSIONS.items():
+            column = _first_column(df, names)
+            rows[key] = UNKNOWN if column is None else column.astype(object).where(column.notna(), UNKNOWN) \
+                .astype(str)
+        rows["amount"] = 0.0 if amounts is None else pd.to_numeric(amounts, errors="coerce").fillna(0.0)
+        return rows.reset_index(drop=True)
+
+    def add_frame(self, df):
+        """Folds every transaction of `df` into the rollups with one vectorized group-by."""
+        rows = self._rows(df)
+        if rows.empty:
+            return
+        rows["sq"] = rows["amount"] ** 2
+        rows["bucket"] = sketch_bucket(rows["amount"].to_numpy())
+        grouped = rows.groupby(KEYS, sort=False)
+        batch = grouped["amount"].agg(["size", "sum", "min", "max"]).rename(columns={"size": "count"})
+        batch["sum_sq"] = grouped["sq"].sum()
+        batch = batch.reset_index()
+        with self.lock:
+            group_index = self._group_index(batch)
+            old = group_index < len(self.groups)
+            existing = self.groups.iloc[group_index[old]]
+            merged = batch[old]
+            self.groups.loc[existing.index, "count"] = existing["count"].to_numpy() + merged["count"].to_numpy()
+            self.groups.loc[existing.index, "sum"] = existing["sum"].to_numpy() + merged["sum"].to_numpy()
+            self.groups.loc[existing.index, "sum_sq"] = existing["sum_sq"].to_numpy() + merged["sum_sq"].to_numpy()
+            self.groups.loc[existing.index, "min"] = np.minimum(existing["min"].to_numpy(), merged["min"].to_numpy())
+            self.groups.loc[existing.index, "max"] = np.maximum(existing["max"].to_numpy(), merged["max"].to_numpy())
+            if (~old).any():
+                new_groups = batch[~old][self.groups.columns]
+                new_groups.index = group_index[~old]
+                self.groups = pd.concat([self.groups, new_groups])
+            # Sketch counts of the batch, keyed by group row
+            row_group = group_index[grouped.ngroup().to_numpy()]
+            counts = pd.Series(1, index=pd.MultiIndex.from_arrays([row_group, rows["bucket"].to_numpy()],
+                                                                  names=["group", "bucket"])).groupby(level=[0, 1]).sum()
+            self.pending.append(counts)
+            if sum(len(p) for p in self.pending) >= FOLD_AFTER_ROWS:
+                self._fold()
+
+    def _group_index(self, batch):
+        """Row of each batch group in self.groups (new groups get the next free rows)."""
+        keys = list(zip(*(batch[key].tolist() for key in KEYS)))
+        index = np.empty(len(keys), dtype=np.int64)
+        next_row = len(self.groups)
+        for i, key in enumerate(keys):
+            row = self.group_rows.get(key)
+            if row is None:
+                row = self.group_rows[key] = next_row
+                next_row += 1
+            index[i] = row
+        return index
+
+    def _fold(self):
+        if self.pending:
+            self.sketch = pd.concat([self.sketch] + self.pending).groupby(level=[0, 1]).sum().sort_index()
+            self.pending = []
+
+    def _select(self, start=None, end=None, **filters):
+        """Group rows inside [start, end] (dates, inclusive) matching the dimension filters."""
+        groups = self.groups
+        mask = np.ones(len(groups), dtype=bool)
+        if start is not None or end is not None:
+            day = groups["day"].to_numpy()
+            mask &= day != UNDATED_DAY
+            if start is not None:
+                mask &= day >= pd.Timestamp(start).to_datetime64().astype("datetime64[D]").astype(np.int64)
+            if end is not None:
+                mask &= day <= pd.Timestamp(end).to_datetime64().astype("datetime64[D]").astype(np.int64)
+        for key, values in filters.items():
+            if values is not None:
+                mask &= groups[key].isin([values] if isinstance(values, str) else values).to_numpy()
+        return groups[mask]
+
+    def query(self, by=("transaction_type",), start=None, end=None, quantiles=(), **filters):
+        """
+        Count, sum, mean, std, min and max of the amount per combination of the `by` dimensions
+        ("day" included) over [start, end], plus approximate quantiles from the merged sketches.
+        """
+        by = list(by)
+        with self.lock:
+            self._fold()
+            selected = self._select(start, end, **filters)
+            if by:
+                result = selected.groupby(by).agg(count=("count", "sum"), sum=("sum", "sum"), sum_sq=("sum_sq", "sum"),
+                                                  min=("min", "min"), max=("max", "max"))
+            else:
+                result = pd.DataFrame([selected[["count", "sum", "sum_sq"]].sum().tolist()
+                                       + [selected["min"].min(), selected["max"].max()]],
+                                      columns=["count", "sum", "sum_sq", "min", "max"], index=["all"])
+            count = result["count"].where(result["count"] > 0)
+            result["mean"] = result["sum"] / count
+            variance = (result["sum_sq"] - count * result["mean"] ** 2) / (count - 1).where(count > 1)
+            result["std"] = np.sqrt(variance.clip(lower=0))
+            result = result.drop(columns="sum_sq")
+            if quantiles:
+                result = result.join(self._quantiles(selected, by, quantiles))
+            return result
+
+    def _quantiles(self, selected, by, quantiles):
+        sketch = self.sketch[self.sketch.index.get_level_values("group").isin(selected.index)]
+        frame = sketch.rename("n").reset_index()
+        labels = selected[by] if by else pd.DataFrame({"_all": "all"}, index=selected.index)
+        frame = frame.join(labels, on="group")
+        keys = by if by else ["_all"]
+        merged = frame.groupby(keys + ["bucket"])["n"].sum().reset_index()
+        merged["cumulative"] = merged.groupby(keys)["n"].cumsum()
+        totals = merged.groupby(keys)["n"].transform("sum")
+        columns = {}
+        for q in quantiles:
+            # First bucket whose cumulative count reaches rank q * (n - 1) + 1
+            reached = merged[merged["cumulative"] >= q * (totals - 1) + 1]
+            first = reached.groupby(keys)["bucket"].first()
+            columns[f"p{round(q * 100):g}"] = pd.Series(bucket_value(first.to_numpy()), index=first.index)
+        result = pd.DataFrame(columns)
+        if not by:
+            result.index = ["all"]
+        return result
+
+    def describe(self, start=None, end=None, **filters):
+        """Equivalent of Series.describe() for the amount over [start, end], from the rollups."""
+        summary = self.query(by=(), start=start, end=end, quantiles=(0.25, 0.5, 0.75), **filters).iloc[0]
+        return summary[["count", "mean", "std", "min", "p25", "p50", "p75", "max"]] \
+            .rename({"p25": "25%", "p50": "50%", "p75": "75%"})
+
+    def date_range(self):
+        """(first, last) dated day as Timestamps, or None if no transaction has a date."""
+        with self.lock:
+            days = self.groups["day"][self.groups["day"] != UNDATED_DAY]
+            if days.empty:
+                return None
+            return (pd.Timestamp(days.min(), unit="D"), pd.Timestamp(days.max(), unit="D"))
+
+    def sync_log(self, log):
+        """Folds in the transaction-log records appended since the last sync."""
+        compacted, records = log.snapshot()
+        with self.lock:
+            if self.log_applied < len(compacted):
+                self.add_frame(compacted.iloc[self.log_applied:])
+                self.log_applied = len(compacted)
+            new_records = records[self.log_applied - len(compacted):]
+            if new_records:
+                self.add_frame(pd.DataFrame(new_records))
+            self.log_applied += len(new_records)
+
+
+def get_rollups(path):
+    """
+    Returns the daily rollups of the dataset at `path`, built once per dataset version;
+    transactions appended to its log since the previous call are folded in incrementally.
+    """
+    def build(df):
+        rollups = DailyRollups()
+        rollups.add_frame(df)
+        return rollups
+
+    rollups = cached_derived(path, "daily_rollups", build)
+    rollups.sync_log(get_transaction_log(path))
+    return rollups
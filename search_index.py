@@ -0,0 +1,261 @@
+import os
+import bisect
+import threading
+from collections import namedtuple
+import numpy as np
+import pandas as pd
+from transaction_store import cached_derived
+from transaction_log import get_transaction_log
+
+WALLET_FILE_PATH = "Wallet.csv"
+KINDS = ["wallet", "transaction", "block", "owner"]
+WALLET, TRANSACTION, BLOCK, OWNER = range(len(KINDS))
+MATCHES = ["exact", "prefix", "substring"]
+
+# Where each kind of key comes from in transaction datasets and log records
+KEY_SOURCES = {
+    WALLET: ["address", "recipient", "Sender Wallet", "Receiver Wallet", "Wallet Address"],
+    TRANSACTION: ["Transaction ID", "transaction_id"],
+    OWNER: ["Owner"],
+}
+
+# Substring search scans only the blocks of this many keys whose trigram filter matches the query
+KEYS_PER_BLOCK = 512
+TRIGRAM_BITS = 16
+
+# Keys added since the last rebuild are kept in a small sorted list until there are this many
+MERGE_AFTER_KEYS = 50000
+
+SearchHit = namedtuple("SearchHit", ["key", "kind", "match"])
+
+
+def _trigrams(data):
+    """Hashes of every 3-byte window of `data` (uint8) that does not span a key separator."""
+    if len(data) < 3:
+        return np.empty(0, dtype=np.int64)
+    data = data.astype(np.uint64)
+    packed = data[:-2] << np.uint64(16) | data[1:-1] << np.uint64(8) | data[2:]
+    # Multiplicative hashing spreads the few thousand distinct trigrams evenly over the buckets
+    hashes = ((packed * np.uint64(2654435761)) >> np.uint64(16)).astype(np.int64) & ((1 << TRIGRAM_BITS) - 1)
+    newline = data == 10
+    return hashes[~(newline[:-2] | newline[1:-1] | newline[2:])]
+
+
+class _SortedKeys:
+    """
+    Keys sorted case-insensitively and packed into one newline-separated buffer with an
+    offsets array (far smaller than millions of str objects). Prefix lookups binary-search the
+    buffer; substring lookups scan the lower-cased copy, skipping blocks of keys that do not
+    contain every trigram of the query.
+    """
+
+    def __init__(self, keys, kinds):
+        encoded = pd.Series(keys, dtype=object).str.encode("utf-8").to_numpy()
+        lowered = np.char.lower(encoded.astype(bytes)) if len(encoded) else np.empty(0, "S1")
+        order = np.lexsort((np.asarray(kinds), lowered))
+        del lowered
+        encoded = encoded[order]
+        self.kinds = np.asarray(kinds, dtype=np.int8)[order]
+        lengths = np.fromiter((len(key) + 1 for key in encoded), dtype=np.int64, count=len(encoded))
+        self.buffer = b"\n".join(encoded) + b"\n" if len(encoded) else b""
+        del encoded
+        self.lower = self.buffer.lower()
+        self.offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self.offsets[1:])
+        self.block_offsets = self.offsets[::KEYS_PER_BLOCK]
+        if self.block_offsets[-1] != self.offsets[-1]:
+            self.block_offsets = np.append(self.block_offsets, self.offsets[-1])
+        # trigram_blocks[h] is a bitset over blocks: which blocks contain a trigram hashing to h
+        n_blocks = len(self.block_offsets) - 1
+        self.trigram_blocks = np.zeros((1 << TRIGRAM_BITS, (n_blocks + 7) // 8), dtype=np.uint8)
+        for block in range(n_blocks):
+            data = np.frombuffer(self.lower, dtype=np.uint8, count=self.block_offsets[block + 1]
+                                 - self.block_offsets[block], offset=self.block_offsets[block])
+            self.trigram_blocks[np.unique(_trigrams(data)), block >> 3] |= np.uint8(1 << (block & 7))
+
+    def __len__(self):
+        return len(self.kinds)
+
+    def key(self, i):
+        return self.buffer[self.offsets[i]:self.offsets[i + 1] - 1].decode("utf-8")
+
+    def _lower_key(self, i):
+        return self.lower[self.offsets[i]:self.offsets[i + 1] - 1]
+
+    def _bisect(self, query):
+        lo, hi = 0, len(self)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._lower_key(mid) < query:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def prefix(self, query, limit):
+        """Indices of the first `limit` keys starting with `query` (lower-cased bytes)."""
+        start = self._bisect(query)
+        end = min(self._bisect(query + b"\xff"), start + limit)
+        return range(start, end)
+
+    def _candidate_blocks(self, query):
+        n_blocks = len(self.block_offsets) - 1
+        if len(query) < 3:
+            return range(n_blocks)
+        rows = self.trigram_blocks[np.unique(_trigrams(np.frombuffer(query, dtype=np.uint8)))]
+        return np.flatnonzero(np.unpackbits(np.bitwise_and.reduce(rows, axis=0), bitorder="little")[:n_blocks])
+
+    def substring(self, query, limit, skip=()):
+        """Indices of up to `limit` keys containing `query`, in key order, leaving out `skip`."""
+        found = []
+        for block in self._candidate_blocks(query):
+            end = self.block_offsets[block + 1]
+            position = self.lower.find(query, self.block_offsets[block], end)
+            while position >= 0:
+                i = int(np.searchsorted(self.offsets, position, side="right")) - 1
+                if i not in skip:
+                    found.append(i)
+                    if len(found) >= limit:
+                        return found
+                position = self.lower.find(query, self.offsets[i + 1], end)
+        return found
+
+
+class SearchIndex:
+    """
+    Case-insensitive prefix and substring search over wallet addresses, transaction ids,
+    block hashes and owners. Hits are ranked exact, then prefix, then substring matches.
+    New keys go into a small sorted delta that is merged into the packed index periodically.
+    """
+
+    def __init__(self, keys=(), kinds=()):
+        self.main = _SortedKeys(list(keys), np.asarray(kinds, dtype=np.int8))
+        self.delta = []
+        self.known = set()
+        # Number of transaction-log records already indexed
+        self.log_applied = 0
+        self.lock = threading.RLock()
+        self._merging = False
+
+    def add(self, key, kind):
+        """Indexes one more key (ignored if it is already indexed)."""
+        key = str(key)
+        with self.lock:
+            if (key, kind) in self.known or self._in_main(key, kind):
+                return
+            self.known.add((key, kind))
+            bisect.insort(self.delta, (key.encode("utf-8").lower(), kind, key))
+            if len(self.delta) >= MERGE_AFTER_KEYS and not self._merging:
+                self._merging = True
+                threading.Thread(target=self._merge, daemon=True).start()
+
+    def _in_main(self, key, kind):
+        query = key.encode("utf-8").lower()
+        return any(self.main.key(i) == key and self.main.kinds[i] == kind for i in self.main.prefix(query, 16))
+
+    def _merge(self):
+        # The packed index is rebuilt outside the lock; keys added meanwhile stay in the delta
+        try:
+            with self.lock:
+                main, merged = self.main, list(self.delta)
+            keys = [main.key(i) for i in range(len(main))] + [key for _, _, key in merged]
+            kinds = np.concatenate([main.kinds, np.array([kind for _, kind, _ in merged], dtype=np.int8)])
+            rebuilt = _SortedKeys(keys, kinds)
+            with self.lock:
+                merged = set(merged)
+                self.main = rebuilt
+                self.delta = [entry for entry in self.delta if entry not in merged]
+                self.known = {(key, kind) for _, kind, key in self.delta}
+        finally:
+            self._merging = False
+
+    def add_frame(self, df):
+        """Indexes every key column of a transactions / wallets frame."""
+        keys, kinds = _frame_keys(df)
+        with self.lock:
+            for key, kind in zip(keys, kinds):
+                self.add(key, kind)
+
+    def search(self, query, limit=20):
+        """Up to `limit` SearchHits for `query`, exact matches first, then prefixes, then substrings."""
+        query = query.strip()
+        if not query:
+            return []
+        needle = query.encode("utf-8").lower()
+        hits = []
+        with self.lock:
+            prefix = self.main.prefix(needle, limit)
+            for i in prefix:
+                key = self.main.key(i)
+                hits.append((0 if len(key) == len(query) else 1, i, key, int(self.main.kinds[i])))
+            start = bisect.bisect_left(self.delta, (needle,))
+            for lowered, kind, key in self.delta[start:start + limit]:
+                if not lowered.startswith(needle):
+                    break
+                hits.append((0 if len(key) == len(query) else 1, -1, key, kind))
+            if len(hits) < limit:
+                for i in self.main.substring(needle, limit - len(hits), skip=set(prefix)):
+                    hits.append((2, i, self.main.key(i), int(self.main.kinds[i])))
+                hits.extend((2, -1, key, kind) for lowered, kind, key in self.delta
+                            if needle in lowered and not lowered.startswith(needle))
+        hits.sort(key=lambda hit: (hit[0], hit[2].lower(), hit[3]))
+        return [SearchHit(key, KINDS[kind], MATCHES[match]) for match, _, key, kind in hits[:limit]]
+
+    def sync_log(self, log):
+        """Indexes the keys of transaction-log records appended since the last sync."""
+        compacted, records = log.snapshot()
+        with self.lock:
+            if self.log_applied < len(compacted):
+                self.add_frame(compacted.iloc[self.log_applied:])
+                self.log_applied = len(compacted)
+            new_records = records[self.log_applied - len(compacted):]
+            if new_records:
+                self.add_frame(pd.DataFrame(new_records))
+            self.log_applied += len(new_records)
+
+    def __len__(self):
+        return len(self.main) + len(self.delta)
+
+
+def _frame_keys(df):
+    keys, kinds = [], []
+    for kind, columns in KEY_SOURCES.items():
+        values = [df[column] for column in columns if column in df.columns]
+        if values:
+            unique = pd.unique(pd.concat(values, ignore_index=True).dropna().astype(str))
+            keys.append(unique)
+            kinds.append(np.full(len(unique), kind, dtype=np.int8))
+    if not keys:
+        return np.empty(0, dtype=object), np.empty(0, dtype=np.int8)
+    return np.concatenate(keys), np.concatenate(kinds)
+
+
+def build_search_index(frames, block_hashes=()):
+    """Builds an index over the key columns of `frames` plus the given block hashes."""
+    keys, kinds = zip(*[_frame_keys(df) for df in frames]) if frames else ((), ())
+    keys = list(keys) + [np.asarray(list(block_hashes), dtype=object)]
+    kinds = list(kinds) + [np.full(len(keys[-1]), BLOCK, dtype=np.int8)]
+    keys = pd.Series(np.concatenate(keys), dtype=object)
+    kinds = np.concatenate(kinds)
+    unique = ~pd.DataFrame({"key": keys, "kind": kinds}).duplicated().to_numpy()
+    return SearchIndex(keys[unique].tolist(), kinds[unique])
+
+
+def get_search_index(path, wallet_path=WALLET_FILE_PATH):
+    """
+    Returns the search index of the dataset at `path` (plus Wallet.csv owners and warehouse
+    block hashes), built once per dataset version; log records appended since the previous
+    call are indexed incrementally.
+    """
+    def build(df):
+        frames = [df]
+        if wallet_path and os.path.exists(wallet_path):
+            frames.append(pd.read_csv(wallet_path, usecols=lambda c: c.strip() in ("Wallet Address", "Owner")))
+        from block_warehouse import get_warehouse
+        warehouse = get_warehouse()
+        block_hashes = warehouse.blocks["hash"].tolist() if warehouse is not None else []
+        return build_search_index(frames, block_hashes)
+
+    index = cached_derived(path, "search_index", build)
+    index.sync_log(get_transaction_log(path))
+    return index
@@ -0,0 +1,504 @@
+import os
+import struct
+import hashlib
+import multiprocessing
+import threading
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Verification workers (processes: ECDSA verification holds the GIL)
+VERIFY_WORKERS = os.cpu_count() or 1
+# Inputs per batch handed to a worker, and the block size below which batches run inline
+BATCH_INPUTS = 256
+PARALLEL_AFTER_INPUTS = 1024
+# Per-input results kept across reruns, least recently used dropped first
+MAX_CACHED_INPUTS = 500000
+
+SIGHASH_ALL, SIGHASH_NONE, SIGHASH_SINGLE, SIGHASH_ANYONECANPAY = 0x01, 0x02, 0x03, 0x80
+VALID, INVALID, UNSUPPORTED, COINBASE = "valid", "invalid", "unsupported", "coinbase"
+# Order of the secp256k1 group
+CURVE_ORDER = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+OP_0, OP_PUSHDATA1, OP_PUSHDATA2, OP_PUSHDATA4, OP_1, OP_16 = 0x00, 0x4c, 0x4d, 0x4e, 0x51, 0x60
+OP_DUP, OP_EQUAL, OP_EQUALVERIFY, OP_HASH160, OP_CHECKSIG, OP_CHECKMULTISIG = 0x76, 0x87, 0x88, 0xa9, 0xac, 0xae
+
+Transaction = namedtuple("Transaction", ["txid", "version", "inputs", "outputs", "locktime"])
+TxInput = namedtuple("TxInput", ["prev_txid", "prev_index", "script_sig", "sequence", "witness"])
+InputVerification = namedtuple("InputVerification", ["txid", "index", "script_type", "status", "pubkeys",
+                                                     "signatures", "detail"])
+
+
+def double_sha256(data):
+    return hashlib.sha256(hashlib.sha256(data).digest()).digest()
+
+
+def hash160(data):
+    """RIPEMD-160 of SHA-256, or None where OpenSSL ships without RIPEMD-160."""
+    try:
+        return hashlib.new("ripemd160", hashlib.sha256(data).digest()).digest()
+    except ValueError:
+        return None
+
+
+def _varint(data, pos):
+    prefix = data[pos]
+    if prefix < 0xfd:
+        return prefix, pos + 1
+    size = {0xfd: 2, 0xfe: 4, 0xff: 8}[prefix]
+    return int.from_bytes(data[pos + 1:pos + 1 + size], "little"), pos + 1 + size
+
+
+def _encode_varint(n):
+    if n < 0xfd:
+        return bytes([n])
+    if n <= 0xffff:
+        return b"\xfd" + struct.pack("<H", n)
+    if n <= 0xffffffff:
+        return b"\xfe" + struct.pack("<I", n)
+    return b"\xff" + struct.pack("<Q", n)
+
+
+def _varslice(data):
+    return _encode_varint(len(data)) + data
+
+
+def _read_slice(data, pos):
+    size, pos = _varint(data, pos)
+    if pos + size > len(data):
+        raise ValueError("Truncated transaction")
+    return bytes(data[pos:pos + size]), pos + size
+
+
+def parse_transaction(data, pos=0):
+    """Parses the serialized transaction starting at `pos` of `data`; returns (transaction, end)."""
+    start = pos
+    version = struct.unpack_from("<i", data, pos)[0]
+    pos += 4
+    segwit = data[pos] == 0 and data[pos + 1] == 1
+    if segwit:
+        pos += 2
+    body_start = pos
+    n_inputs, pos = _varint(data, pos)
+    inputs = []
+    for _ in range(n_inputs):
+        prev_txid, prev_index = bytes(data[pos:pos + 32]), struct.unpack_from("<I", data, pos + 32)[0]
+        script_sig, pos = _read_slice(data, pos + 36)
+        inputs.append([prev_txid, prev_index, script_sig, struct.unpack_from("<I", data, pos)[0], []])
+        pos += 4
+    n_outputs, pos = _varint(data, pos)
+    outputs = []
+    for _ in range(n_outputs):
+        value = struct.unpack_from("<q", data, pos)[0]
+        script, pos = _read_slice(data, pos + 8)
+        outputs.append((value, script))
+    body_end = pos
+    if segwit:
+        for tx_input in inputs:
+            n_items, pos = _varint(data, pos)
+            for _ in range(n_items):
+                item, pos = _read_slice(data, pos)
+                tx_input[4].append(item)
+    locktime = struct.unpack_from("<I", data, pos)[0]
+    pos += 4
+    # The txid hashes the serialization without marker, flag and witnesses
+    txid = double_sha256(bytes(data[start:start + 4]) + bytes(data[body_start:body_end]) +
+                         bytes(data[pos - 4:pos]))[::-1].hex()
+    return Transaction(txid, version, [TxInput(*i) for i in inputs], outputs, locktime), pos
+
+
+def parse_block(data):
+    """Transactions of a serialized block (raw bytes or hex)."""
+    if isinstance(data, str):
+        data = bytes.fromhex(data.strip())
+    n_transactions, pos = _varint(data, 80)
+    transactions = []
+    for _ in range(n_transactions):
+        transaction, pos = parse_transaction(data, pos)
+        transactions.append(transaction)
+    return transactions
+
+
+def script_items(script):
+    """(opcode, pushed bytes or None) of each operation in `script`, or None if it is malformed."""
+    items, pos = [], 0
+    while pos < len(script):
+        opcode = script[pos]
+        pos += 1
+        if opcode == OP_0:
+            items.append((opcode, b""))
+            continue
+        if opcode > OP_PUSHDATA4:
+            items.append((opcode, None))
+            continue
+        if opcode < OP_PUSHDATA1:
+            size = opcode
+        else:
+            width = {OP_PUSHDATA1: 1, OP_PUSHDATA2: 2, OP_PUSHDATA4: 4}[opcode]
+            size = int.from_bytes(script[pos:pos + width], "little")
+            pos += width
+        if pos + size > len(script):
+            return None
+        items.append((opcode, script[pos:pos + size]))
+        pos += size
+    return items
+
+
+def script_pushes(script):
+    """The data pushed by a push-only script (a scriptSig), or None if it does anything else."""
+    items = script_items(script)
+    if items is None or any(data is None for _, data in items):
+        return None
+    return [data for _, data in items]
+
+
+def witness_items(witness_hex):
+    """Items of a serialized witness stack, as blockchain.info reports it in an input's "witness"."""
+    data = bytes.fromhex(witness_hex or "")
+    if not data:
+        return []
+    n_items, pos = _varint(data, 0)
+    items = []
+    for _ in range(n_items):
+        item, pos = _read_slice(data, pos)
+        items.append(item)
+    return items
+
+
+def p2pkh_script(key_hash):
+    return bytes([OP_DUP, OP_HASH160, 20]) + key_hash + bytes([OP_EQUALVERIFY, OP_CHECKSIG])
+
+
+class Sighasher:
+    """Signature hashes of one transaction, legacy and BIP143, sharing the BIP143 midstate hashes."""
+
+    def __init__(self, transaction):
+        self.tx = transaction
+        self._midstate = None
+
+    def legacy(self, index, script_code, hashtype):
+        tx = self.tx
+        base = hashtype & 0x1f
+        if base == SIGHASH_SINGLE and index >= len(tx.outputs):
+            # Consensus quirk: SIGHASH_SINGLE without a matching output signs the number one
+            return b"\x01" + b"\x00" * 31
+        inputs = [index] if hashtype & SIGHASH_ANYONECANPAY else range(len(tx.inputs))
+        parts = [struct.pack("<i", tx.version), _encode_varint(len(inputs))]
+        for i in inputs:
+            tx_input = tx.inputs[i]
+            sequence = tx_input.sequence if i == index or base not in (SIGHASH_NONE, SIGHASH_SINGLE) else 0
+            parts += [tx_input.prev_txid, struct.pack("<I", tx_input.prev_index),
+                      _varslice(script_code) if i == index else b"\x00", struct.pack("<I", sequence)]
+        if base == SIGHASH_NONE:
+            outputs = []
+        elif base == SIGHASH_SINGLE:
+            outputs = [(-1, b"")] * index + [tx.outputs[index]]
+        else:
+            outputs = tx.outputs
+        parts.append(_encode_varint(len(outputs)))
+        parts += [struct.pack("<q", value) + _varslice(script) for value, script in outputs]
+        parts.append(struct.pack("<II", tx.locktime, hashtype))
+        return double_sha256(b"".join(parts))
+
+    def segwit(self, index, script_code, amount, hashtype):
+        tx = self.tx
+        if self._midstate is None:
+            self._midstate = (
+                double_sha256(b"".join(i.prev_txid + struct.pack("<I", i.prev_index) for i in tx.inputs)),
+                double_sha256(b"".join(struct.pack("<I", i.sequence) for i in tx.inputs)),
+                double_sha256(b"".join(struct.pack("<q", v) + _varslice(s) for v, s in tx.outputs)),
+            )
+        prevouts, sequences, outputs = self._midstate
+        base, anyone = hashtype & 0x1f, hashtype & SIGHASH_ANYONECANPAY
+        zero = b"\x00" * 32
+        if anyone:
+            prevouts = zero
+        if anyone or base in (SIGHASH_NONE, SIGHASH_SINGLE):
+            sequences = zero
+        if base == SIGHASH_SINGLE and index < len(tx.outputs):
+            value, script = tx.outputs[index]
+            outputs = double_sha256(struct.pack("<q", value) + _varslice(script))
+        elif base in (SIGHASH_NONE, SIGHASH_SINGLE):
+            outputs = zero
+        tx_input = tx.inputs[index]
+        return double_sha256(b"".join([
+            struct.pack("<i", tx.version), prevouts, sequences, tx_input.prev_txid,
+            struct.pack("<I", tx_input.prev_index), _varslice(script_code), struct.pack("<q", amount),
+            struct.pack("<I", tx_input.sequence), outputs, struct.pack("<II", tx.locktime, hashtype)]))
+
+
+def _key_spend(script_code, stack):
+    """
+    (pubkeys, signatures, required) for a stack unlocking a P2PK, P2PKH or multisig script,
+    a string describing why it does not, or None if the script is none of those.
+    """
+    items = script_items(script_code)
+    if items is None:
+        return None
+    opcodes = [opcode for opcode, _ in items]
+    if len(script_code) == 25 and script_code == p2pkh_script(script_code[3:23]):
+        if len(stack) != 2:
+            return "expected a signature and a public key"
+        key_hash = hash160(stack[1])
+        if key_hash is not None and key_hash != script_code[3:23]:
+            return "public key does not match the spent address"
+        return [stack[1]], [stack[0]], 1
+    if len(items) == 2 and items[0][1] and opcodes[1] == OP_CHECKSIG:
+        if len(stack) != 1:
+            return "expected one signature"
+        return [items[0][1]], [stack[0]], 1
+    if len(items) >= 4 and opcodes[-1] == OP_CHECKMULTISIG and OP_1 <= opcodes[0] <= OP_16 and \
+            OP_1 <= opcodes[-2] <= OP_16 and all(data for _, data in items[1:-2]):
+        pubkeys = [data for _, data in items[1:-2]]
+        required = opcodes[0] - OP_1 + 1
+        if len(pubkeys) != opcodes[-2] - OP_1 + 1 or required > len(pubkeys):
+            return None
+        # The first item is the dummy element CHECKMULTISIG pops
+        if len(stack) != required + 1:
+            return f"expected {required} signatures"
+        return pubkeys, stack[1:], required
+    return None
+
+
+def _witness_program(script):
+    if len(script) in (22, 34) and script[0] == OP_0 and script[1] == len(script) - 2:
+        return script[2:]
+    return None
+
+
+def _input_spend(tx, index, prevout):
+    """
+    Works out how input `index` spends `prevout` (amount, scriptPubKey): returns
+    (script_type, script_code, segwit, spend) where spend is what _key_spend returned.
+    """
+    tx_input = tx.inputs[index]
+    amount, script_pubkey = prevout
+    script_type, segwit = "", False
+    stack = script_pushes(tx_input.script_sig)
+    if stack is None:
+        return "nonstandard", None, False, "scriptSig is not push-only"
+    script_code = script_pubkey
+    if len(script_pubkey) == 23 and script_pubkey[:2] == bytes([OP_HASH160, 20]) and script_pubkey[-1] == OP_EQUAL:
+        if not stack:
+            return "p2sh", None, False, "missing redeem script"
+        script_code, stack = stack[-1], stack[:-1]
+        redeem_hash = hash160(script_code)
+        if redeem_hash is not None and redeem_hash != script_pubkey[2:22]:
+            return "p2sh", None, False, "redeem script does not match the spent address"
+        script_type = "p2sh-"
+    program = _witness_program(script_code)
+    if program is not None:
+        if stack:
+            return script_type + "witness", None, True, "witness spend with a non-empty scriptSig"
+        segwit, stack = True, list(tx_input.witness)
+        if len(program) == 20:
+            script_type += "p2wpkh"
+            script_code = p2pkh_script(program)
+        else:
+            if not stack:
+                return script_type + "p2wsh", None, True, "missing witness script"
+            script_code, stack = stack[-1], stack[:-1]
+            if hashlib.sha256(script_code).digest() != program:
+                return script_type + "p2wsh", None, True, "witness script does not match the program"
+            script_type += "p2wsh-"
+    elif len(script_pubkey) == 34 and script_pubkey[0] == OP_1 and script_pubkey[1] == 32:
+        return "p2tr", None, True, None
+    spend = _key_spend(script_code, stack)
+    if script_type.endswith("p2wpkh"):
+        return script_type, script_code, segwit, spend
+    if spend is None or isinstance(spend, str):
+        kind = "nonstandard"
+    elif len(script_code) == 25:
+        kind = "p2pkh"
+    else:
+        kind = "p2pk" if len(spend[0]) == 1 and script_code[-1] == OP_CHECKSIG else "multisig"
+    return script_type + kind, script_code, segwit, spend
+
+
+def _parse_der(signature):
+    """(r, s) of a DER signature, parsed as leniently as pre-BIP66 consensus allowed, or None."""
+    if len(signature) < 8 or signature[0] != 0x30:
+        return None
+    values, pos = [], 2
+    for _ in range(2):
+        if pos + 2 > len(signature) or signature[pos] != 0x02:
+            return None
+        size = signature[pos + 1]
+        values.append(int.from_bytes(signature[pos + 2:pos + 2 + size], "big"))
+        pos += 2 + size
+    if pos > len(signature) or not all(0 < value < CURVE_ORDER for value in values):
+        return None
+    return tuple(values)
+
+
+def _check_signatures(checks, keys):
+    """CHECKMULTISIG matching: each signature must verify against a key after the previous match."""
+    from cryptography.exceptions import InvalidSignature
+    from cryptography.hazmat.primitives import hashes
+    from cryptography.hazmat.primitives.asymmetric import ec, utils
+    algorithm = ec.ECDSA(utils.Prehashed(hashes.SHA256()))
+    pubkeys, signatures = checks
+    k = 0
+    for signature, digest in signatures:
+        while True:
+            if k == len(pubkeys):
+                return False
+            key = keys.get(pubkeys[k])
+            if key is None:
+                encoded = pubkeys[k]
+                if encoded[:1] in (b"\x06", b"\x07"):
+                    # Hybrid encoding from early clients: the uncompressed point with a parity tag
+                    encoded = b"\x04" + encoded[1:]
+                try:
+                    key = ec.EllipticCurvePublicKey.from_encoded_point(ec.SECP256K1(), encoded)
+                except ValueError:
+                    key = False
+                keys[pubkeys[k]] = key
+            k += 1
+            if key and signature is not None:
+                try:
+                    key.verify(utils.encode_dss_signature(*signature), digest, algorithm)
+                    break
+                except InvalidSignature:
+                    pass
+    return True
+
+
+def verify_inputs(batch):
+    """
+    Verifies every input of each (transaction, prevouts) in `batch`, prevouts holding the
+    (amount, scriptPubKey) each input spends (None if unknown). Runs in the worker processes.
+    """
+    results, keys = [], {}
+    for tx, prevouts in batch:
+        sighasher = Sighasher(tx)
+        for index, tx_input in enumerate(tx.inputs):
+            if tx_input.prev_index == 0xffffffff and tx_input.prev_txid == b"\x00" * 32:
+                results.append(InputVerification(tx.txid, index, "coinbase", COINBASE, [], [], None))
+                continue
+            if prevouts[index] is None:
+                results.append(InputVerification(tx.txid, index, "unknown", UNSUPPORTED, [], [],
+                                                 "spent output unknown"))
+                continue
+            script_type, script_code, segwit, spend = _input_spend(tx, index, prevouts[index])
+            if spend is None:
+                detail = "Schnorr signatures are not supported" if script_type == "p2tr" else "script not supported"
+                results.append(InputVerification(tx.txid, index, script_type, UNSUPPORTED, [], [], detail))
+                continue
+            if isinstance(spend, str):
+                results.append(InputVerification(tx.txid, index, script_type, INVALID, [], [], spend))
+                continue
+            pubkeys, signatures, _ = spend
+            checks = []
+            for signature in signatures:
+                if not signature:
+                    checks.append((None, None))
+                    continue
+                hashtype = signature[-1]
+                digest = sighasher.segwit(index, script_code, prevouts[index][0], hashtype) if segwit \
+                    else sighasher.legacy(index, script_code, hashtype)
+                checks.append((_parse_der(signature[:-1]), digest))
+            ok = _check_signatures((pubkeys, checks), keys)
+            results.append(InputVerification(tx.txid, index, script_type, VALID if ok else INVALID,
+                                             [p.hex() for p in pubkeys], [s.hex() for s in signatures],
+                                             None if ok else "signature does not verify"))
+    return results
+
+
+class SignatureVerifier:
+    """
+    Verifies transaction input signatures in batches on a process pool and caches each
+    result by (txid, input index), so a block (or a transaction in it) is only checked once.
+    """
+
+    def __init__(self, workers=VERIFY_WORKERS):
+        self.workers = workers
+        self.results = OrderedDict()
+        self.lock = threading.Lock()
+        self.pool = None
+
+    def cached(self, txid, index):
+        with self.lock:
+            return self.results.get((txid, index))
+
+    def _batches(self, items):
+        batch, size = [], 0
+        for item in items:
+            batch.append(item)
+            size += len(item[0].inputs)
+            if size >= BATCH_INPUTS:
+                yield batch
+                batch, size = [], 0
+        if batch:
+            yield batch
+
+    def verify(self, transactions, prevouts, progress=lambda fraction: None):
+        """
+        Verifies the inputs of `transactions`, prevouts[i] listing what transaction i's inputs
+        spend. Returns {(txid, index): InputVerification}; progress(fraction) follows each batch.
+        """
+        results, pending = {}, []
+        with self.lock:
+            for tx, spent in zip(transactions, prevouts):
+                cached = [self.results.get((tx.txid, index)) for index in range(len(tx.inputs))]
+                if all(cached):
+                    results.update(((tx.txid, index), result) for index, result in enumerate(cached))
+                else:
+                    pending.append((tx, spent))
+        total = sum(len(tx.inputs) for tx, _ in pending)
+        batches = list(self._batches(pending))
+        done = 0
+        if total < PARALLEL_AFTER_INPUTS or self.workers <= 1:
+            completed = (verify_inputs(batch) for batch in batches)
+        else:
+            if self.pool is None:
+                # Spawned, not forked: the pool is created from a job-queue thread, and forking a
+                # threaded server process can copy locks held by its other threads
+                self.pool = ProcessPoolExecutor(max_workers=self.workers,
+                                                mp_context=multiprocessing.get_context("spawn"))
+            completed = (future.result() for future in
+                         as_completed([self.pool.submit(verify_inputs, batch) for batch in batches]))
+        for batch_results in completed:
+            with self.lock:
+                for result in batch_results:
+                    self.results[(result.txid, result.index)] = result
+                    results[(result.txid, result.index)] = result
+                while len(self.results) > MAX_CACHED_INPUTS:
+                    self.results.popitem(last=False)
+            done += len(batch_results)
+            progress(done / total)
+        return results
+
+
+def block_prevouts(block, transactions):
+    """
+    (amount, scriptPubKey) spent by every input of `transactions`, taken from the prev_out
+    entries of the block's columnar model (block_model.ColumnarBlock; None where it has no script).
+    """
+    prevouts = []
+    for tx in transactions:
+        row = block.row(tx.txid)
+        inputs = block.prevouts(row) if row >= 0 else []
+        spent = []
+        for index in range(len(tx.inputs)):
+            value, script = inputs[index] if index < len(inputs) else (0, None)
+            spent.append((value, bytes.fromhex(script)) if script is not None else None)
+        prevouts.append(spent)
+    return prevouts
+
+
+def verify_block(block, raw_block, verifier=None, progress=lambda fraction: None):
+    """Verifies every input of a block given as its columnar model and its serialized (hex) form."""
+    transactions = parse_block(raw_block)
+    return (verifier or get_verifier()).verify(transactions, block_prevouts(block, transactions), progress)
+
+
+_verifier = None
+_lock = threading.Lock()
+
+
+def get_verifier():
+    """Returns the process-wide verifier (and its result cache) shared by every session."""
+    global _verifier
+    with _lock:
+        if _verifier is None:
+            _verifier = SignatureVerifier()
+        return _verifier
@@ -0,0 +1,108 @@
+import io
+import tempfile
+import threading
+from collections import OrderedDict
+import numpy as np
+
+PAGE_SIZE = 50
+# Rows converted to CSV at a time when exporting a view
+EXPORT_CHUNK_ROWS = 50000
+# Datetime columns (stored in UTC) are exported in the layout of the source CSV files
+EXPORT_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+# Exports larger than this are spooled to disk instead of being held in memory
+SPOOL_MAX_BYTES = 8 << 20
+# Sorted / filtered row orders kept for views with a cache key
+MAX_CACHED_ORDERS = 64
+
+_orders = OrderedDict()
+_lock = threading.Lock()
+
+
+class TableView:
+    """
+    A read-only window over a frame: an array of row positions plus the columns to show.
+    Sorting and filtering only rearrange or narrow the positions, and a page materializes just
+    its own rows, so the frame is never copied. Views built with a `key` (which must change
+    whenever the frame does) remember their sorted / filtered orders across reruns.
+    """
+
+    def __init__(self, df, rows=None, columns=None, key=None):
+        self.df = df
+        self.rows = np.arange(len(df)) if rows is None else np.asarray(rows, dtype=np.int64)
+        self.columns = [c for c in (columns or df.columns) if c in df.columns]
+        self.key = key
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _derive(self, spec, compute):
+        if self.key is None:
+            return TableView(self.df, compute(), self.columns)
+        cache_key = (self.key, spec)
+        with _lock:
+            rows = _orders.get(cache_key)
+            if rows is not None:
+                _orders.move_to_end(cache_key)
+        if rows is None:
+            rows = compute()
+            with _lock:
+                _orders[cache_key] = rows
+                while len(_orders) > MAX_CACHED_ORDERS:
+                    _orders.popitem(last=False)
+        return TableView(self.df, rows, self.columns, cache_key)
+
+    def _values(self, column):
+        return self.df[column].iloc[self.rows]
+
+    def filter(self, column, contains=None, equals=None, minimum=None, maximum=None):
+        """Rows whose `column` contains the text `contains` (case-insensitive), equals `equals` or lies in [minimum, maximum]."""
+        def compute():
+            values = self._values(column)
+            keep = np.ones(len(values), dtype=bool)
+            if contains:
+                keep &= values.astype(str).str.contains(contains, case=False, regex=False).to_numpy()
+            if equals is not None:
+                keep &= (values == equals).to_numpy()
+            if minimum is not None:
+                keep &= (values >= minimum).to_numpy()
+            if maximum is not None:
+                keep &= (values <= maximum).to_numpy()
+            return self.rows[keep]
+        return self._derive(("filter", column, contains, equals, minimum, maximum), compute)
+
+    def sort(self, column, ascending=True):
+        """Rows ordered by `column` (stable, missing values last)."""
+        def compute():
+            order = self._values(column).reset_index(drop=True).sort_values(ascending=ascending, kind="stable",
+                                                                            na_position="last").index.to_numpy()
+            return self.rows[order]
+        return self._derive(("sort", column, ascending), compute)
+
+    def n_pages(self, page_size=PAGE_SIZE):
+        return max(1, -(-len(self) // page_size))
+
+    def page(self, number, page_size=PAGE_SIZE):
+        """Rows of page `number` (from 1) as a small frame; only these rows are materialized."""
+        number = min(max(number, 1), self.n_pages(page_size))
+        rows = self.rows[(number - 1) * page_size:number * page_size]
+        return self.df.iloc[rows][self.columns]
+
+    def write_csv(self, f, chunk_rows=EXPORT_CHUNK_ROWS):
+        """Writes the view as CSV to the binary file `f`, converting EXPORT_CHUNK_ROWS rows at a time."""
+        text = io.TextIOWrapper(f, encoding="utf-8", newline="", write_through=True)
+        try:
+            for start in range(0, max(len(self), 1), chunk_rows):
+                chunk = self.df.iloc[self.rows[start:start + chunk_rows]][self.columns]
+                chunk.to_csv(text, index=False, header=start == 0, date_format=EXPORT_DATE_FORMAT)
+        finally:
+            text.detach()
+
+    def csv_file(self):
+        """
+        The view exported as CSV into a rewound temporary file (in memory while small). Only the
+        conversion is chunked: st.download_button reads the whole file into memory to serve it.
+        """
+        f = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES)
+        self.write_csv(f)
+        f.seek(0)
+        return f
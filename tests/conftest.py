@@ -0,0 +1,36 @@
+import os
+import sys
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import transaction_store  # noqa: E402
+
+
+def transactions_frame(n_rows=40):
+    """A small transactions.csv-shaped frame with a few busy wallets."""
+    wallets = [f"wallet{i:02d}" for i in range(8)]
+    return pd.DataFrame({
+        "Transaction ID": [f"TX{i:04d}" for i in range(n_rows)],
+        "Sender Wallet": [wallets[i % 5] for i in range(n_rows)],
+        "Receiver Wallet": [wallets[(i * 3 + 1) % 8] for i in range(n_rows)],
+        "Amount Transacted": [round(10.5 + i * 7.25, 2) for i in range(n_rows)],
+        "Timestamp": [f"2024-11-{1 + i % 28:02d} {i % 24:02d}:15:00" for i in range(n_rows)],
+        "Risk Score": [["Low", "Medium", "High"][i % 3] for i in range(n_rows)],
+        "Cryptocurrency": [["BTC", "ETH", "DOGE"][i % 3] for i in range(n_rows)],
+    })
+
+
+@pytest.fixture(autouse=True)
+def fresh_store():
+    transaction_store.clear_cache()
+    yield
+    transaction_store.clear_cache()
+
+
+@pytest.fixture
+def transactions_csv(tmp_path):
+    path = tmp_path / "transactions.csv"
+    transactions_frame().to_csv(path, index=False)
+    return str(path)
@@ -0,0 +1,51 @@
+import os
+import numpy as np
+import pandas as pd
+import fraud_scoring
+from batch_analytics import run_batch, read_result
+from fraud_scoring import score_store
+from transaction_store import load_transactions
+
+
+def test_results_match_the_dataset_and_feed_the_app(transactions_csv, tmp_path, monkeypatch):
+    # Results go to the default batch_output/ of the working directory; the model must be found
+    # from any working directory
+    monkeypatch.chdir(tmp_path)
+    output = "batch_output"
+    run_batch(transactions_csv, analyses=["p2p", "fraud"], workers=1, shards=3)
+
+    df = load_transactions(transactions_csv)
+    p2p = read_result("p2p", output, path=transactions_csv)
+    expected = df.groupby(["Sender Wallet", "Receiver Wallet"], observed=True).size()
+    assert p2p.set_index(["sender", "receiver"])["transaction_count"].sort_index().tolist() == \
+        expected.sort_index().tolist()
+
+    scores = read_result("fraud_scores", output, path=transactions_csv)
+    assert sorted(scores["row"]) == list(range(len(df)))
+    expected_scores = fraud_scoring.score(df)
+
+    def no_scoring(df, **kwargs):
+        raise AssertionError("scored again")
+    monkeypatch.setattr(fraud_scoring, "score", no_scoring)
+    scored = score_store(transactions_csv)
+    np.testing.assert_array_equal(scored["fraud_probability"], expected_scores)
+
+
+def test_results_of_another_version_are_ignored(transactions_csv, tmp_path):
+    output = str(tmp_path / "batch")
+    run_batch(transactions_csv, output=output, analyses=["p2p"], workers=1, shards=2)
+    assert read_result("p2p", output) is not None
+    pd.read_csv(transactions_csv).head(10).to_csv(transactions_csv, index=False)
+    assert read_result("p2p", output, path=transactions_csv) is None
+    assert read_result("p2p", output) is not None
+
+
+def test_only_results_of_the_latest_run_are_read(transactions_csv, tmp_path):
+    output = str(tmp_path / "batch")
+    run_batch(transactions_csv, output=output, analyses=["p2p", "fraud"], workers=1, shards=2)
+    assert read_result("fraud_scores", output, path=transactions_csv) is not None
+    pd.read_csv(transactions_csv).head(10).to_csv(transactions_csv, index=False)
+    run_batch(transactions_csv, output=output, analyses=["p2p"], workers=1, shards=2, output_format="json")
+    assert read_result("fraud_scores", output, path=transactions_csv) is None
+    assert len(read_result("p2p", output, path=transactions_csv)) <= 10
+    assert sorted(os.listdir(output)) == ["p2p.json", "summary.json"]
@@ -0,0 +1,36 @@
+import block_model
+from block_model import ColumnarBlock, get_block_model
+
+
+def block_dict(name, addresses):
+    return {"hash": name, "height": 1, "tx": [{
+        "hash": f"{name}-tx", "time": 1700000000,
+        "inputs": [{"prev_out": {"addr": addresses[0], "value": 7, "script": "51"}, "script": ""}],
+        "out": [{"addr": address, "value": 5, "n": n} for n, address in enumerate(addresses[1:])],
+    }]}
+
+
+def test_each_block_has_its_own_address_table():
+    first = ColumnarBlock.from_json(block_dict("a", ["x", "y", "z"]))
+    second = ColumnarBlock.from_json(block_dict("b", ["p", "q"]))
+    assert first.addresses is not second.addresses
+    assert second.addresses.addresses == ["q", "p"]
+    assert first.beneficiaries(0) == [("y", 5e-08), ("z", 5e-08)] and first.sources(0) == ["x"]
+    assert first.prevouts(0) == [(7, "51")] and first.header == {"hash": "a", "height": 1}
+
+
+def test_cached_blocks_skip_the_fetch(monkeypatch):
+    monkeypatch.setattr(block_model, "_blocks", block_model.OrderedDict())
+    monkeypatch.setattr(block_model, "MAX_CACHED_BLOCKS", 2)
+    fetched = []
+
+    def fetch(block_hash):
+        fetched.append(block_hash)
+        return block_dict(block_hash, ["x", "y"])
+
+    first = get_block_model(" a ", fetch)
+    assert get_block_model("a", fetch) is first and fetched == ["a"]
+    get_block_model("b", fetch)
+    get_block_model("c", fetch)
+    get_block_model("a", fetch)
+    assert fetched == ["a", "b", "c", "a"]
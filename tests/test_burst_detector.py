@@ -0,0 +1,36 @@
+import random
+from burst_detector import BurstDetector
+from block_model import ColumnarBlock
+
+
+def synthetic_block(seed, n_transactions=400, n_addresses=6, span=6000):
+    rng = random.Random(seed)
+    txs = []
+    for i in range(n_transactions):
+        outputs = [{"addr": f"addr{rng.randrange(n_addresses)}", "value": rng.choice([10 ** 7, 2 * 10 ** 8]), "n": n}
+                   for n in range(rng.randint(1, 3))]
+        txs.append({"hash": f"tx{i}", "time": 1700000000 + rng.randint(0, span), "inputs": [], "out": outputs})
+    return {"hash": "block", "tx": txs}
+
+
+def test_vectorized_bursts_match_the_streaming_detector():
+    for seed in range(20):
+        block_info = synthetic_block(seed)
+        expected = BurstDetector(min_value=10 ** 8, count=3, window=300).process_block(block_info)
+        block = ColumnarBlock.from_json(block_info)
+        assert block.large_output_bursts(min_value=10 ** 8, count=3, window=300) == expected
+
+
+def test_alerted_addresses_are_forgotten_once_idle():
+    detector = BurstDetector(min_value=0, count=2, window=100, sweep_every=1)
+
+    def send(address, time):
+        return detector.process({"hash": f"{address}-{time}", "time": time, "out": [{"addr": address, "value": 1}]})
+
+    assert send("a", 0) == [] and len(send("a", 10)) == 1
+    # Still inside the burst: silent, and the address stays remembered
+    assert send("a", 60) == [] and "a" in detector.alerted
+    send("b", 500)
+    assert detector.alerted == {} and detector.recent == {"b": detector.recent["b"]}
+    # A new burst after an idle window alerts again
+    assert send("a", 600) == [] and len(send("a", 610)) == 1
@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+from conftest import transactions_frame
+from feature_pipeline import FeaturePipeline, WALLET_FEATURES, get_feature_pipeline, score_appended
+from fraud_scoring import score_transaction
+from transaction_log import get_transaction_log
+
+
+def test_append_matches_backfill():
+    df = transactions_frame()
+    df = df.iloc[np.argsort(pd.to_datetime(df["Timestamp"]).to_numpy(), kind="stable")].reset_index(drop=True)
+    expected = FeaturePipeline().backfill(df)
+    pipeline = FeaturePipeline()
+    rows = np.array([pipeline.append(record)[-len(WALLET_FEATURES):] for record in df.to_dict("records")])
+    np.testing.assert_allclose(rows, expected, rtol=1e-9)
+
+
+def test_score_appended_scores_the_trained_features(transactions_csv):
+    pipeline = get_feature_pipeline(transactions_csv)
+    assert get_feature_pipeline(transactions_csv) is pipeline
+
+    transaction = {"address": "wallet01", "recipient": "wallet07", "amount": 120.0, "date": "2024-12-01"}
+    probability, wallet_features = score_appended(pipeline, transaction)
+    assert probability == score_transaction(transaction)
+    df = transactions_frame()
+    history = ((df["Sender Wallet"] == "wallet01") | (df["Receiver Wallet"] == "wallet01")).sum()
+    assert list(wallet_features) == WALLET_FEATURES and wallet_features["sender_tx_count"] == history
+
+    # Once in the log, the transaction is folded in exactly once
+    get_transaction_log(transactions_csv).append(transaction)
+    for _ in range(2):
+        _, wallet_features = score_appended(get_feature_pipeline(transactions_csv), transaction)
+        assert wallet_features["sender_tx_count"] == history + 1
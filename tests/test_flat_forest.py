@@ -0,0 +1,53 @@
+import json
+import pickle
+import numpy as np
+from sklearn.ensemble import RandomForestClassifier
+import fraud_scoring
+from conftest import transactions_frame
+from flat_forest import FlatForest, read_header, file_digest
+from fraud_scoring import load_model, load_forest, MODEL_PATH
+
+
+def test_flattened_forest_matches_the_pickled_model(tmp_path):
+    model, names = load_model()
+    forest = load_forest(str(tmp_path / "forest.npy"))
+    assert forest.feature_names == names
+    rng = np.random.default_rng(7)
+    X = np.column_stack([rng.uniform(-500, 2000, 3000), rng.uniform(0, 1500, 3000), rng.integers(0, 100, 3000)])
+    expected = model.predict_proba(X)[:, list(model.classes_).index(1)]
+    np.testing.assert_array_equal(forest.predict_proba(X), expected)
+
+
+def test_export_is_rebuilt_for_a_different_pickle(tmp_path):
+    path = str(tmp_path / "forest.npy")
+    load_forest(path)
+    header_path = tmp_path / "forest.json"
+    header = read_header(path)
+    assert header["model_sha256"] == file_digest(MODEL_PATH)
+
+    header["model_sha256"] = "stale"
+    header["max_depth"] = 0
+    header_path.write_text(json.dumps(header))
+    fraud_scoring._forests.pop(path)
+    forest = load_forest(path)
+    assert read_header(path)["model_sha256"] == file_digest(MODEL_PATH)
+    assert forest.max_depth == FlatForest.load(path).max_depth > 0
+
+
+def test_no_model_means_no_forest(tmp_path):
+    assert load_forest(str(tmp_path / "forest.npy"), model_path=str(tmp_path / "missing.pkl")) is None
+
+
+def test_another_model_is_flattened_next_to_it(tmp_path):
+    names = load_model()[1]
+    rng = np.random.default_rng(3)
+    X = np.column_stack([rng.uniform(-500, 2000, 200), rng.uniform(0, 1500, 200), rng.integers(0, 100, 200)])
+    model = RandomForestClassifier(n_estimators=5, max_depth=4, random_state=0).fit(X, X[:, 1] > 700)
+    model_path = str(tmp_path / "other.pkl")
+    with open(model_path, "wb") as file:
+        pickle.dump({"model": model, "feature_names": names}, file)
+
+    df = transactions_frame(10)
+    expected = model.predict_proba(fraud_scoring.build_features(df, names))[:, 1]
+    np.testing.assert_array_equal(fraud_scoring.score(df, model_path=model_path, engine="forest"), expected)
+    assert read_header(str(tmp_path / "other.forest.npy"))["model_sha256"] == file_digest(model_path)
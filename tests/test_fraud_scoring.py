@@ -0,0 +1,44 @@
+import numpy as np
+import pandas as pd
+from conftest import transactions_frame
+import fraud_scoring
+from fraud_scoring import (build_features, transaction_feature_row, wallet_user_id, predict, score_store,
+                           load_model, FEATURE_TIME_ORIGIN, USER_ID_BUCKETS)
+from transaction_store import load_transactions
+
+FEATURES = ["timestamp", "amount", "user_id"]
+
+
+def test_placeholder_encodings():
+    df = transactions_frame(6)
+    features = build_features(df, FEATURES)
+    hours = (pd.to_datetime(df["Timestamp"]) - FEATURE_TIME_ORIGIN) / pd.Timedelta(hours=1)
+    np.testing.assert_allclose(features[:, 0], hours)
+    np.testing.assert_allclose(features[:, 1], df["Amount Transacted"])
+    assert features[:, 2].tolist() == [wallet_user_id(w) for w in df["Sender Wallet"]]
+    assert ((features[:, 2] >= 0) & (features[:, 2] < USER_ID_BUCKETS)).all()
+    # The single-record path encodes exactly like the frame path
+    for i, record in enumerate(df.to_dict("records")):
+        np.testing.assert_array_equal(transaction_feature_row(record, FEATURES)[0], features[i])
+
+
+def test_numeric_features_pass_through():
+    df = pd.DataFrame({"timestamp": [12.0, 48.5], "amount": [1.0, 2.0], "user_id": [3, 97]})
+    np.testing.assert_array_equal(build_features(df, FEATURES), df[FEATURES].to_numpy(dtype=np.float64))
+
+
+def test_predict_leaves_the_shared_model_alone():
+    model, names = load_model()
+    n_jobs = model.n_jobs
+    features = build_features(transactions_frame(8), names)
+    expected = predict(features, engine="sklearn", n_jobs=1)
+    np.testing.assert_array_equal(predict(features, engine="sklearn", n_jobs=2, chunk_size=3), expected)
+    assert load_model()[0] is model and model.n_jobs == n_jobs
+
+
+def test_score_store_returns_a_new_frame(transactions_csv):
+    before = load_transactions(transactions_csv)
+    scored = score_store(transactions_csv)
+    assert "fraud_probability" not in before.columns
+    np.testing.assert_array_equal(scored["fraud_probability"], fraud_scoring.score(before))
+    assert (scored["is_fraudulent"] == (scored["fraud_probability"] >= fraud_scoring.FRAUD_THRESHOLD)).all()
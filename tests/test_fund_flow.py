@@ -0,0 +1,30 @@
+import pandas as pd
+import fund_flow
+from conftest import transactions_frame
+from fund_flow import get_flow_graph, trace_many
+
+
+def test_trace_follows_transfers_in_time_order(transactions_csv):
+    result = get_flow_graph(transactions_csv).trace("wallet00", max_hops=1)
+    df = transactions_frame()
+    sent = df[df["Sender Wallet"] == "wallet00"]
+    assert sorted(result.edges["transaction_id"]) == sorted(sent["Transaction ID"])
+    assert result.stopped is None
+
+    limited = get_flow_graph(transactions_csv).trace("wallet00", max_hops=3, max_results=3)
+    assert len(limited.edges) == 3 and limited.stopped == "max_results"
+
+
+def test_pool_and_inline_traces_agree(transactions_csv, monkeypatch):
+    seeds = [f"wallet{i:02d}" for i in range(8)] + ["TX0003", "nobody"]
+    inline = trace_many(transactions_csv, seeds, workers=1, max_hops=2)
+    assert inline["nobody"] is None
+    monkeypatch.setattr(fund_flow, "INLINE_SEEDS", 0)
+    pooled = trace_many(transactions_csv, seeds, workers=2, max_hops=2)
+    assert fund_flow._pool is not None and trace_many(transactions_csv, seeds, workers=2) is not None
+    assert fund_flow._get_pool(transactions_csv, 2) is fund_flow._pool
+    for seed in seeds[:-1]:
+        pd.testing.assert_frame_equal(pooled[seed].edges, inline[seed].edges)
+    assert pooled["nobody"] is None
+    fund_flow._pool.shutdown()
+    fund_flow._reset_pool(fund_flow._pool)
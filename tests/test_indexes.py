@@ -0,0 +1,49 @@
+import numpy as np
+from conftest import transactions_frame
+from wallet_index import WalletIndex
+from search_index import build_search_index
+from pair_counts import PairCounts
+
+
+def test_wallet_index_matches_a_scan():
+    df = transactions_frame()
+    index = WalletIndex(df)
+    for wallet in ["wallet00", "wallet03", "wallet07"]:
+        involved = (df["Sender Wallet"] == wallet) | (df["Receiver Wallet"] == wallet)
+        assert index.rows(wallet).tolist() == np.flatnonzero(involved).tolist()
+        assert index.count(wallet) == involved.sum()
+        assert index.total(wallet) == df.loc[involved, "Amount Transacted"].sum()
+    assert index.rows("unknown").tolist() == []
+
+
+def test_search_ranks_exact_prefix_then_substring():
+    index = build_search_index([transactions_frame()])
+    hits = index.search("TX0001", limit=5)
+    assert hits[0] == ("TX0001", "transaction", "exact")
+    hits = index.search("tx001", limit=5)
+    assert [hit.key for hit in hits] == [f"TX{i:04d}" for i in range(10, 15)]
+    assert {hit.match for hit in hits} == {"prefix"}
+    assert [hit.key for hit in index.search("let03")] == ["wallet03"]
+    assert index.search("WALLET05")[0].key == "wallet05"
+
+
+def test_search_finds_added_keys():
+    index = build_search_index([transactions_frame()])
+    index.add("newwallet", 0)
+    assert [hit.key for hit in index.search("newwal")] == ["newwallet"]
+
+
+def test_pair_counts_match_groupby():
+    df = transactions_frame()
+    counts = PairCounts()
+    counts.add_frame(df)
+    counts.add("wallet00", "wallet01", 5.0)
+    expected = df.groupby(["Sender Wallet", "Receiver Wallet"])["Amount Transacted"].agg(["size", "sum"])
+    expected.loc[("wallet00", "wallet01"), :] += [1, 5.0]
+    frame = counts.to_frame().set_index(["address", "recipient"]).sort_index()
+    assert frame["transaction_count"].tolist() == expected["size"].tolist()
+    assert np.allclose(frame["amount"], expected["sum"])
+    neighbours = counts.neighbours("wallet02")
+    assert ((neighbours["address"] == "wallet02") | (neighbours["recipient"] == "wallet02")).all()
+    assert neighbours["transaction_count"].sum() == \
+        ((df["Sender Wallet"] == "wallet02") | (df["Receiver Wallet"] == "wallet02")).sum()
@@ -0,0 +1,17 @@
+import job_queue
+from job_queue import JobQueue
+
+
+def test_expired_and_excess_results_are_dropped(monkeypatch):
+    monkeypatch.setattr(job_queue, "MAX_FINISHED_JOBS", 2)
+    queue = JobQueue(workers=1)
+    expired = queue.submit("expired", lambda job: "old", ttl=0)
+    expired.wait()
+    expired.finished -= 1
+    for key in ("a", "b", "c", "d"):
+        queue.submit(key, lambda job, key=key: key).wait()
+    # Eviction runs on submit, when the new job has not finished yet
+    assert list(queue.jobs) == ["b", "c", "d"] and queue.get(expired.id) is None
+
+    # A finished job within its ttl is reused instead of run again
+    assert queue.run("c", lambda job: "again") == "c"
@@ -0,0 +1,22 @@
+import pandas as pd
+from network_layout import NetworkLayout
+
+
+def star_frame():
+    # A hub with many partners plus two quiet wallets hanging off one of them
+    rows = [("hub", f"w{i}") for i in range(6)] + [("w0", "w1"), ("quiet1", "w0"), ("quiet2", "w0")]
+    return pd.DataFrame(rows, columns=["address", "recipient"])
+
+
+def test_folded_wallets_do_not_mark_their_neighbour():
+    layout = NetworkLayout(star_frame(), max_nodes=4, max_edges=10)
+    labels = list(layout.labels)
+    assert "quiet1" not in labels and "w0" in labels
+
+    fraud = pd.DataFrame({"address": ["quiet1"], "recipient": ["quiet2"]})
+    assert len(layout.nodes_of_transactions(fraud)) == 0
+    assert layout.folded_count_of_transactions(fraud) == 2
+
+    fraud = pd.DataFrame({"address": ["hub", "quiet1"], "recipient": ["w0", "nobody"]})
+    assert sorted(labels[i] for i in layout.nodes_of_transactions(fraud)) == ["hub", "w0"]
+    assert layout.folded_count_of_transactions(fraud) == 1
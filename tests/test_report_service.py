@@ -0,0 +1,46 @@
+import os
+import report_service
+from report_service import ReportService, address_list_report, write_pdf
+
+
+def test_write_pdf_publishes_only_the_finished_file(tmp_path):
+    path = str(tmp_path / "reports" / "addresses.pdf")
+    fractions = []
+    write_pdf(address_list_report([f"addr{i}" for i in range(200)]), path, fractions.append)
+    with open(path, "rb") as file:
+        assert file.read(5) == b"%PDF-"
+    assert fractions and fractions == sorted(fractions)
+    assert os.listdir(tmp_path / "reports") == ["addresses.pdf"]
+
+
+def test_reports_are_cached_and_evicted(tmp_path, monkeypatch):
+    monkeypatch.setattr(report_service, "MAX_CACHED_REPORTS", 2)
+    service = ReportService(str(tmp_path))
+    renders = []
+
+    def render(c, progress):
+        renders.append(1)
+        c.drawString(100, 750, "report")
+
+    keys = [service.key(("data", 1), "addresses", (i,)) for i in range(3)]
+    first = service.submit(keys[0], render)
+    assert first.state == "done" and service.submit(keys[0], render) is first and len(renders) == 1
+    os.utime(first.path, (0, 0))
+    service.submit(keys[1], render)
+    service.submit(keys[2], render)
+    assert not os.path.exists(first.path) and service.job(keys[0]) is None
+    assert all(service.job(key).state == "done" for key in keys[1:])
+
+
+def test_eviction_tolerates_files_removed_meanwhile(tmp_path, monkeypatch):
+    service = ReportService(str(tmp_path))
+    (tmp_path / "gone.pdf").write_bytes(b"")
+    getmtime = os.path.getmtime
+
+    def racing_getmtime(path):
+        if path.endswith("gone.pdf"):
+            raise FileNotFoundError(path)
+        return getmtime(path)
+    monkeypatch.setattr(os.path, "getmtime", racing_getmtime)
+    job = service.submit(service.key(("data", 1), "addresses"), address_list_report(["a", "b"]))
+    assert job.state == "done", job.error
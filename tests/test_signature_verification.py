@@ -0,0 +1,69 @@
+import signature_verification
+from block_model import ColumnarBlock
+from signature_verification import (SignatureVerifier, Sighasher, VALID, INVALID, parse_transaction, verify_block,
+                                    verify_inputs)
+
+# Block 170: the first bitcoin transfer, spending the P2PK output of block 9's coinbase
+LEGACY_TX = ("0100000001c997a5e56e104102fa209c6a852dd90660a20b2d9c352423edce25857fcd3704000000004847304402204e45"
+             "e16932b8af514961a1d3a1a25fdf3f4f7732e9d624c6c61548ab5fb8cd410220181522ec8eca07de4860a4acdd12909d"
+             "831cc56cbbac4622082221a8768d1d0901ffffffff0200ca9a3b00000000434104ae1a62fe09c5f51b13905f07f06b99a2"
+             "f7159b2225f374cd378d71302fa28414e7aab37397f554a7df5f142c21c1b7303b8a0626f1baded5c72a704f7e6cd84cac"
+             "00286bee0000000043410411db93e1dcdb8a016b49840f8c53bc1eb68a382e97b1482ecad7b148a6909a5cb2e0eaddfb84"
+             "ccf9744464f82e160bfa9b8b64f9d4c03f999b8643f656b412a3ac00000000")
+LEGACY_TXID = "f4184fc596403b9d638783cf57adfe4c75c605f6356fbc91338530e9831e9e16"
+LEGACY_PREVOUT = (5000000000, bytes.fromhex(
+    "410411db93e1dcdb8a016b49840f8c53bc1eb68a382e97b1482ecad7b148a6909a5cb2e0eaddfb84ccf9744464f82e160bfa9b8b"
+    "64f9d4c03f999b8643f656b412a3ac"))
+
+# BIP143 native P2WPKH example: the unsigned transaction and the sighash of its second input
+BIP143_TX = ("0100000002fff7f7881a8099afa6940d42d1e7f6362bec38171ea3edf433541db4e4ad969f0000000000eeffffffef51e1b8"
+             "04cc89d182d279655c3aa89e815b1b309fe287d9b2b55d57b90ec68a0100000000ffffffff02202cb206000000001976a914"
+             "8280b37df378db99f66f85c95a783a76ac7a6d5988ac9093510d000000001976a9143bde42dbee7e4dbe6a21b2d50ce2f016"
+             "7faa815988ac11000000")
+BIP143_SCRIPT_CODE = "76a9141d0f172a0ecb48aee1be1f2687d2963ae33f71a188ac"
+BIP143_SIGHASH = "c37af31116d1b27caf68aae9e3ac82f1477929014d5b917657d0eb49478cb670"
+
+
+def legacy_transaction():
+    return parse_transaction(bytes.fromhex(LEGACY_TX))[0]
+
+
+def test_bip143_sighash():
+    tx, _ = parse_transaction(bytes.fromhex(BIP143_TX))
+    digest = Sighasher(tx).segwit(1, bytes.fromhex(BIP143_SCRIPT_CODE), 600000000, 1)
+    assert digest.hex() == BIP143_SIGHASH
+
+
+def test_legacy_p2pk_spend_verifies():
+    tx = legacy_transaction()
+    assert tx.txid == LEGACY_TXID
+    [result] = verify_inputs([(tx, [LEGACY_PREVOUT])])
+    assert (result.script_type, result.status) == ("p2pk", VALID)
+
+    # The same signature checked against a different public key fails
+    other_key = LEGACY_PREVOUT[1][:10] + bytes([LEGACY_PREVOUT[1][10] ^ 1]) + LEGACY_PREVOUT[1][11:]
+    [result] = verify_inputs([(tx, [(LEGACY_PREVOUT[0], other_key)])])
+    assert result.status == INVALID
+
+
+def test_verify_block_takes_prevouts_from_the_columnar_model():
+    block = ColumnarBlock.from_json({"hash": "b", "height": 170, "tx": [{
+        "hash": LEGACY_TXID, "time": 1231731025,
+        "inputs": [{"prev_out": {"addr": "a", "value": LEGACY_PREVOUT[0], "script": LEGACY_PREVOUT[1].hex()},
+                    "script": ""}],
+        "out": [{"addr": "b", "value": 1000000000, "n": 0}, {"addr": "c", "value": 4000000000, "n": 1}],
+    }]})
+    raw_block = "00" * 80 + "01" + LEGACY_TX
+    results = verify_block(block, raw_block, verifier=SignatureVerifier(workers=1))
+    assert results[(LEGACY_TXID, 0)].status == VALID
+
+
+def test_worker_pool_is_spawned(monkeypatch):
+    monkeypatch.setattr(signature_verification, "PARALLEL_AFTER_INPUTS", 0)
+    verifier = SignatureVerifier(workers=2)
+    try:
+        results = verifier.verify([legacy_transaction()], [[LEGACY_PREVOUT]])
+        assert results[(LEGACY_TXID, 0)].status == VALID
+        assert verifier.pool._mp_context.get_start_method() == "spawn"
+    finally:
+        verifier.pool.shutdown()
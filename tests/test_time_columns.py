@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+from time_columns import NAT, to_utc, epoch_ns, epoch_seconds, format_time
+
+
+def test_to_utc_parses_strings_numbers_and_datetimes():
+    expected = pd.Timestamp("2024-11-01 12:00:00", tz="UTC")
+    assert to_utc(["2024-11-01T12:00:00Z"]).iloc[0] == expected
+    assert to_utc(["2024-11-01 17:30:00+05:30"]).iloc[0] == expected
+    assert to_utc(["11/01/2024 12:00"]).iloc[0] == expected
+    assert to_utc([expected.value / 1e9]).iloc[0] == expected
+    # Naive datetimes are taken as UTC
+    assert to_utc(pd.Series([pd.Timestamp("2024-11-01 12:00:00")])).iloc[0] == expected
+    assert str(to_utc(["not a time"]).dtype) == "datetime64[ns, UTC]"
+
+
+def test_missing_times_are_nat_and_nan():
+    ns = epoch_ns(["2024-11-01T00:00:00Z", None, "garbage"])
+    assert ns[0] == pd.Timestamp("2024-11-01", tz="UTC").value and (ns[1:] == NAT).all()
+    seconds = epoch_seconds([0, None])
+    assert seconds[0] == 0 and np.isnan(seconds[1])
+
+
+def test_format_time_uses_the_display_time_zone():
+    assert format_time("2024-11-01T12:00:00Z", tz="Asia/Kolkata") == "2024-11-01 17:30:00 IST"
+    assert format_time(0, tz="UTC") == "1970-01-01 00:00:00 UTC"
@@ -0,0 +1,64 @@
+import os
+import glob
+import shutil
+import transaction_log
+from transaction_log import TransactionLog
+
+
+def records(n, start=0):
+    return [{"address": f"a{i}", "recipient": f"b{i}", "amount": float(i), "transaction_id": f"T{i}"}
+            for i in range(start, start + n)]
+
+
+def all_records(log):
+    compacted, live = log.snapshot()
+    return compacted.to_dict("records") + live
+
+
+def test_partial_last_line_is_dropped_on_reopen(tmp_path):
+    log = TransactionLog(str(tmp_path))
+    for record in records(3):
+        log.append(record)
+    log.close()
+    segment = glob.glob(str(tmp_path / "segment-*.jsonl"))[0]
+    with open(segment, "a") as file:
+        file.write('{"address": "half a rec')
+
+    reopened = TransactionLog(str(tmp_path))
+    reopened.append(records(1, start=3)[0])
+    assert reopened.records() == records(4)
+
+
+def test_compaction_folds_sealed_segments(tmp_path, monkeypatch):
+    monkeypatch.setattr(transaction_log, "SEGMENT_MAX_BYTES", 200)
+    monkeypatch.setattr(transaction_log, "COMPACT_AFTER_SEGMENTS", 10 ** 6)
+    prefix = str(tmp_path / "store" / "data.appended")
+    os.makedirs(tmp_path / "store")
+    log = TransactionLog(str(tmp_path / "log"), prefix)
+    for record in records(20):
+        log.append(record)
+    assert len(glob.glob(str(tmp_path / "log" / "segment-*.jsonl"))) > 2
+
+    compacted = log.compact()
+    assert compacted.startswith(prefix) and len(glob.glob(str(tmp_path / "log" / "segment-*.jsonl"))) == 1
+    for record in records(10, start=20):
+        log.append(record)
+    log.compact()
+    assert len(glob.glob(prefix + "-*.parquet")) == 1
+    assert all_records(log) == records(30)
+    log.close()
+    assert all_records(TransactionLog(str(tmp_path / "log"), prefix)) == records(30)
+
+
+def test_segments_left_by_an_interrupted_compaction_are_ignored(tmp_path, monkeypatch):
+    monkeypatch.setattr(transaction_log, "SEGMENT_MAX_BYTES", 200)
+    log = TransactionLog(str(tmp_path))
+    for record in records(12):
+        log.append(record)
+    first = sorted(glob.glob(str(tmp_path / "segment-*.jsonl")))[0]
+    shutil.copy(first, str(tmp_path / "kept"))
+    log.compact()
+    log.close()
+    # The crash happened after the columnar file was swapped in but before the segment was deleted
+    shutil.copy(str(tmp_path / "kept"), first)
+    assert all_records(TransactionLog(str(tmp_path))) == records(12)
@@ -0,0 +1,61 @@
+import os
+import numpy as np
+import pandas as pd
+import transaction_store
+from transaction_store import load_transactions, cached_derived, attach_columns
+from fraud_scoring import build_features
+from conftest import transactions_frame
+
+
+def test_load_is_typed_and_shared(transactions_csv):
+    df = load_transactions(transactions_csv)
+    assert isinstance(df["Sender Wallet"].dtype, pd.CategoricalDtype)
+    assert pd.api.types.is_float_dtype(df["Amount Transacted"])
+    assert load_transactions(transactions_csv) is df
+
+
+def test_columnar_copy_is_reused_after_restart(transactions_csv, monkeypatch):
+    expected = load_transactions(transactions_csv)
+    transaction_store.clear_cache()
+
+    def no_csv(path):
+        raise AssertionError("the CSV was parsed again")
+    monkeypatch.setattr(transaction_store, "read_source", no_csv)
+    pd.testing.assert_frame_equal(load_transactions(transactions_csv), expected)
+
+
+def test_source_change_reloads_and_drops_derived(transactions_csv):
+    builds = []
+    cached_derived(transactions_csv, "rows", lambda df: builds.append(len(df)) or len(df))
+    cached_derived(transactions_csv, "rows", lambda df: builds.append(len(df)) or len(df))
+    assert builds == [40]
+
+    df = pd.read_csv(transactions_csv)
+    pd.concat([df, df.head(2)]).to_csv(transactions_csv, index=False)
+    stat = os.stat(transactions_csv)
+    os.utime(transactions_csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert len(load_transactions(transactions_csv)) == 42
+    assert cached_derived(transactions_csv, "rows", lambda df: builds.append(len(df)) or len(df)) == 42
+    assert builds == [40, 42]
+
+
+def test_attach_columns_returns_a_new_frame(transactions_csv):
+    before = load_transactions(transactions_csv)
+    after = attach_columns(transactions_csv, {"score": range(len(before))})
+    assert "score" not in before.columns
+    assert after["score"].tolist() == list(range(40))
+    assert load_transactions(transactions_csv) is after
+    # Persisted in the columnar copy for the same dataset version
+    transaction_store.clear_cache()
+    assert "score" in load_transactions(transactions_csv).columns
+
+
+def test_numeric_timestamps_reach_the_model_unchanged(tmp_path):
+    df = transactions_frame().drop(columns=["Timestamp"])
+    df["timestamp"] = np.arange(len(df)) * 1.5
+    path = str(tmp_path / "numeric.csv")
+    df.to_csv(path, index=False)
+    stored = load_transactions(path)
+    assert pd.api.types.is_numeric_dtype(stored["timestamp"])
+    features = ["timestamp", "amount", "user_id"]
+    np.testing.assert_array_equal(build_features(stored, features), build_features(df, features))
@@ -0,0 +1,63 @@
+import json
+import threading
+import pytest
+import user_store
+from user_store import UserStore, LoginBusy, is_hashed
+
+
+@pytest.fixture(autouse=True)
+def cheap_hashes(monkeypatch):
+    monkeypatch.setattr(user_store, "SCRYPT_N", 1 << 4)
+
+
+def read(path):
+    with open(path) as file:
+        return json.load(file)
+
+
+def test_plaintext_passwords_are_upgraded_on_login(tmp_path):
+    path = str(tmp_path / "users.json")
+    with open(path, "w") as file:
+        json.dump({"alice": "secret", "bob": "hunter2"}, file)
+    store = UserStore(path)
+    assert not store.verify("alice", "wrong") and read(path)["alice"] == "secret"
+    assert store.verify("alice", "secret")
+    stored = read(path)
+    assert is_hashed(stored["alice"]) and stored["bob"] == "hunter2"
+    assert store.verify("alice", "secret") and not store.verify("alice", "Secret")
+    assert not store.verify("carol", "secret")
+
+
+def test_concurrent_updates_are_all_kept(tmp_path):
+    path = str(tmp_path / "users.json")
+    stores = [UserStore(path) for _ in range(4)]
+    threads = [threading.Thread(target=lambda s=s, i=i: [s.register(f"user{i}-{j}", "pw") for j in range(10)])
+               for i, s in enumerate(stores)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(read(path)) == 40 and len(stores[0]) == 40
+    assert not stores[1].register("user0-0", "other")
+    assert sorted(tmp_path.iterdir()) == [tmp_path / "users.json"]
+
+
+def test_failed_update_leaves_the_file_and_releases_the_lock(tmp_path):
+    path = str(tmp_path / "users.json")
+    store = UserStore(path)
+    store.register("alice", "pw")
+    before = read(path)
+
+    def broken(users):
+        users["mallory"] = "x"
+        raise ValueError("change failed")
+    with pytest.raises(ValueError):
+        store._update(broken)
+    assert read(path) == before and "mallory" not in store
+    assert store.register("bob", "pw")
+
+
+def test_register_reports_busy(tmp_path, monkeypatch):
+    monkeypatch.setattr(user_store, "MAX_PENDING_HASHES", 0)
+    with pytest.raises(LoginBusy):
+        UserStore(str(tmp_path / "users.json")).register("alice", "pw")
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+from config import DISPLAY_TIMEZONE
+
+# Timestamp columns the store keeps as datetime64[ns, UTC] instead of strings (numeric ones are left as is)
+TIMESTAMP_COLUMNS = ["Timestamp", "timestamp", "Date", "date"]
+DISPLAY_FORMAT = "%Y-%m-%d %H:%M:%S %Z"
+# int64 value of NaT in epoch_ns results
+NAT = np.iinfo(np.int64).min
+
+
+def to_utc(values):
+    """
+    Timestamps as a datetime64[ns, UTC] Series (keeping the index of a Series): strings are
+    parsed as ISO 8601 first, numbers are epoch seconds and naive datetimes are taken as UTC.
+    Unparseable values become NaT.
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    if isinstance(series.dtype, pd.DatetimeTZDtype):
+        parsed = series.dt.tz_convert("UTC")
+    elif pd.api.types.is_datetime64_dtype(series.dtype):
+        parsed = series.dt.tz_localize("UTC")
+    elif pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+        parsed = pd.to_datetime(series, unit="s", utc=True, errors="coerce")
+    else:
+        parsed = pd.to_datetime(series, utc=True, errors="coerce", format="ISO8601")
+        # Anything else (e.g. "11/23/2024") falls back to per-value format inference
+        retry = parsed.isna() & series.notna()
+        if retry.any():
+            parsed[retry] = pd.to_datetime(series[retry], utc=True, errors="coerce", format="mixed")
+    return parsed.dt.as_unit("ns")
+
+
+def epoch_ns(values):
+    """Nanoseconds since the epoch as int64 (NAT where missing); free for datetime64[ns, UTC] columns."""
+    return to_utc(values).dt.tz_localize(None).to_numpy().view(np.int64)
+
+
+def epoch_seconds(values):
+    """Seconds since the epoch as float64 (NaN where missing)."""
+    ns = epoch_ns(values)
+    return np.where(ns == NAT, np.nan, ns / 1e9)
+
+
+def localize(values, tz=None):
+    """The timestamps converted to the display time zone (DISPLAY_TIMEZONE unless `tz` is given)."""
+    return to_utc(values).dt.tz_convert(tz or DISPLAY_TIMEZONE)
+
+
+def format_times(values, tz=None, fmt=DISPLAY_FORMAT):
+    """
+    Display strings of the timestamps in the display time zone. Formatting is the slow part,
+    so pass only the rows actually rendered.
+    """
+    return localize(values, tz).dt.strftime(fmt)
+
+
+def format_time(value, tz=None, fmt=DISPLAY_FORMAT):
+    """Display string of one timestamp (epoch seconds, string or datetime)."""
+    return format_times([value], tz, fmt).iloc[0]
+
+
+def localize_frame(df, tz=None):
+    """Copy of a small frame (a rendered page) with its datetime columns in the display time zone."""
+    columns = [c for c in df.columns if isinstance(df[c].dtype, pd.DatetimeTZDtype)]
+    if not columns:
+        return df
+    df = df.copy()
+    for column in columns:
+        df[column] = df[column].dt.tz_convert(tz or DISPLAY_TIMEZONE)
+    return df
@@ -0,0 +1,232 @@
+import os
+import glob
+import json
+import time
+import threading
+import pandas as pd
+from transaction_store import store_location
+
+SEGMENT_MAX_BYTES = 16 * 1024 * 1024
+FSYNC_EVERY = 64
+FSYNC_INTERVAL_SECONDS = 1.0
+# Sealed segments are folded into the columnar store once this many have accumulated
+COMPACT_AFTER_SEGMENTS = 4
+
+
+def _number(path):
+    # segment-00000012.jsonl / <name>.appended-00000012.parquet -> 12
+    return int(os.path.splitext(path)[0].rsplit("-", 1)[1])
+
+
+def _drop_partial_line(path):
+    """Truncates a segment to its last complete line (a crash can leave half a record behind)."""
+    with open(path, "rb+") as file:
+        end = file.seek(0, os.SEEK_END)
+        position = end
+        while position > 0:
+            start = max(position - 65536, 0)
+            file.seek(start)
+            newline = file.read(position - start).rfind(b"\n")
+            if newline >= 0:
+                position = start + newline + 1
+                break
+            position = start
+        if position != end:
+            file.truncate(position)
+
+
+class TransactionLog:
+    """
+    Durable append-only log of submitted transactions, stored as JSONL segments next to the dataset.
+    Appends are O(1): one line written to the open segment, with fsync batched every FSYNC_EVERY
+    records or FSYNC_INTERVAL_SECONDS. Sealed segments are folded into one columnar file kept in the
+    store (`<compacted_prefix>-<last folded segment>.parquet`); segments up to that number are ignored
+    by readers, so a crash halfway through compaction neither loses nor repeats records.
+    Pages do not read the log directly: only the derived indexes (pair counts, rollups, search and
+    the feature pipeline) fold its records in, through their sync_log() methods.
+    """
+
+    def __init__(self, directory, compacted_prefix=None):
+        self.directory = directory
+        self.compacted_prefix = compacted_prefix or os.path.join(directory, "compacted")
+        os.makedirs(directory, exist_ok=True)
+        self.lock = threading.Lock()
+        self._file = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._compacting = False
+        # Serializes compactions, which write the columnar file outside `lock`
+        self._compact_lock = threading.Lock()
+        # Parsed records per segment file: path -> (bytes read, records)
+        self._read_cache = {}
+        self._parts_cache = (None, pd.DataFrame())
+
+    def _compacted_files(self):
+        return sorted(glob.glob(glob.escape(self.compacted_prefix) + "-*.parquet"))
+
+    def _folded(self):
+        # Number of the last segment already in the columnar store
+        compacted = self._compacted_files()
+        return _number(compacted[-1]) if compacted else 0
+
+    def _segments(self):
+        folded = self._folded()
+        paths = sorted(glob.glob(os.path.join(self.directory, "segment-*.jsonl")))
+        return [path for path in paths if _number(path) > folded]
+
+    def _open_segment(self):
+        segments = self._segments()
+        if segments and os.path.getsize(segments[-1]) < SEGMENT_MAX_BYTES:
+            path = segments[-1]
+            _drop_partial_line(path)
+            self._read_cache.pop(path, None)
+        else:
+            number = _number(segments[-1]) + 1 if segments else self._folded() + 1
+            path = os.path.join(self.directory, f"segment-{number:08d}.jsonl")
+        self._file = open(path, "a", encoding="utf-8")
+
+    def append(self, record):
+        """Appends one transaction record (a JSON-serialisable dict)."""
+        line = json.dumps(record, default=str) + "\n"
+        rotated = False
+        with self.lock:
+            if self._file is None or self._file.tell() >= SEGMENT_MAX_BYTES:
+                rotated = self._file is not None
+                self._seal()
+                self._open_segment()
+            self._file.write(line)
+            self._file.flush()
+            self._unsynced += 1
+            if self._unsynced >= FSYNC_EVERY or time.monotonic() - self._last_sync >= FSYNC_INTERVAL_SECONDS:
+                self._sync()
+        if rotated and len(self._segments()) > COMPACT_AFTER_SEGMENTS:
+            self.compact_in_background()
+
+    def _sync(self):
+        if self._file is not None and self._unsynced:
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def _seal(self):
+        if self._file is not None:
+            self._sync()
+            self._file.close()
+            self._file = None
+
+    def sync(self):
+        """Forces buffered appends to disk."""
+        with self.lock:
+            self._sync()
+
+    def _read_segment(self, path):
+        # Only the bytes appended since the last read are parsed
+        offset, records = self._read_cache.get(path, (0, []))
+        with open(path, "r", encoding="utf-8") as file:
+            file.seek(offset)
+            data = file.read()
+        complete = data[:data.rfind("\n") + 1]
+        if complete:
+            records = records + [json.loads(line) for line in complete.splitlines() if line]
+            self._read_cache[path] = (offset + len(complete.encode("utf-8")), records)
+        return records
+
+    def _records(self):
+        segments = self._segments()
+        for path in list(self._read_cache):
+            if path not in segments:
+                del self._read_cache[path]
+        return [record for path in segments for record in self._read_segment(path)]
+
+    def _compacted(self):
+        compacted = self._compacted_files()
+        path = compacted[-1] if compacted else None
+        key, frame = self._parts_cache
+        if key != path:
+            frame = pd.read_parquet(path) if path else pd.DataFrame()
+            self._parts_cache = (path, frame)
+        return frame
+
+    def records(self):
+        """Records still in JSONL segments, oldest first."""
+        with self.lock:
+            return self._records()
+
+    def snapshot(self):
+        """
+        A consistent (compacted DataFrame, live records) pair: records already folded into the
+        columnar store (cached until it is rewritten) and records still in JSONL segments.
+        """
+        with self.lock:
+            return self._compacted(), self._records()
+
+    def __len__(self):
+        compacted, records = self.snapshot()
+        return len(compacted) + len(records)
+
+    def compact(self):
+        """
+        Folds every sealed segment into the columnar store and deletes the segments. The Parquet
+        file is written without holding the lock, so appends carry on meanwhile.
+        """
+        with self._compact_lock:
+            return self._compact()
+
+    def _compact(self):
+        with self.lock:
+            sealed = self._segments()
+            if self._file is not None:
+                sealed = [p for p in sealed if os.path.abspath(p) != os.path.abspath(self._file.name)]
+            if not sealed:
+                return None
+            records = [record for path in sealed for record in self._read_segment(path)]
+            previous = self._compacted_files()
+            compacted = self._compacted()
+
+        frames = [frame for frame in (compacted, pd.DataFrame(records)) if not frame.empty]
+        folded = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        path = f"{self.compacted_prefix}-{_number(sealed[-1]):08d}.parquet"
+        tmp_path = path + ".tmp"
+        folded.to_parquet(tmp_path, index=False)
+
+        with self.lock:
+            # From here on readers skip the folded segments, so the deletes below are only cleanup
+            os.replace(tmp_path, path)
+            self._parts_cache = (path, folded)
+            for old in previous + sealed:
+                if old != path:
+                    os.remove(old)
+                self._read_cache.pop(old, None)
+        return path
+
+    def compact_in_background(self):
+        """Starts compaction in a daemon thread unless one is already running."""
+        with self.lock:
+            if self._compacting:
+                return
+            self._compacting = True
+
+        def run():
+            try:
+                self.compact()
+            finally:
+                self._compacting = False
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def close(self):
+        with self.lock:
+            self._seal()
+
+
+_logs = {}
+_logs_lock = threading.Lock()
+
+
+def get_transaction_log(path):
+    """Returns the process-wide log of submitted transactions for the dataset at `path`."""
+    directory = store_location(path, ".log")
+    with _logs_lock:
+        if directory not in _logs:
+            _logs[directory] = TransactionLog(directory, store_location(path, ".appended"))
+        return _logs[directory]
@@ -0,0 +1,164 @@
+import os
+import json
+import threading
+import pandas as pd
+from time_columns import TIMESTAMP_COLUMNS, to_utc
+
+# Columns with few distinct values are stored as categoricals in the columnar copy
+CATEGORICAL_COLUMNS = [
+    "Sender Wallet", "Receiver Wallet", "Wallet Address", "Owner",
+    "Risk Score", "Cryptocurrency", "address", "recipient", "transaction_type",
+]
+NUMERIC_COLUMNS = ["Amount Transacted", " Amount Transacted", "Total Transactions", "amount"]
+# Bumped whenever the typed layout changes, so older columnar copies are rebuilt
+STORE_FORMAT = 3
+
+# Directory (next to the source file) holding the converted columnar copies
+STORE_DIR_NAME = ".store"
+
+_cache = {}
+_derived = {}
+_lock = threading.Lock()
+
+
+def dataset_version(path):
+    """Returns a (path, mtime, size) key that changes whenever the source file changes."""
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    return (path, stat.st_mtime_ns, stat.st_size)
+
+
+def _store_paths(path):
+    folder = os.path.join(os.path.dirname(path), STORE_DIR_NAME)
+    base = os.path.splitext(os.path.basename(path))[0]
+    return folder, os.path.join(folder, base + ".parquet"), os.path.join(folder, base + ".meta.json")
+
+
+def store_location(path, suffix):
+    """Path of a companion file or directory kept with the columnar copy of `path` (e.g. suffix '.log')."""
+    folder, _, _ = _store_paths(os.path.abspath(path))
+    return os.path.join(folder, os.path.splitext(os.path.basename(path))[0] + suffix)
+
+
+def _apply_dtypes(df):
+    for column in NUMERIC_COLUMNS:
+        if column in df.columns:
+            df[column] = pd.to_numeric(df[column], errors="coerce")
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype("category")
+    for column in TIMESTAMP_COLUMNS:
+        # Numeric timestamps stay numbers: the fraud model reads them as its `timestamp` feature
+        if column in df.columns and not pd.api.types.is_numeric_dtype(df[column]):
+            df[column] = to_utc(df[column])
+    return df
+
+
+def read_source(path):
+    """Parses a transactions.csv / Wallet.csv shaped file into a typed DataFrame."""
+    return _apply_dtypes(pd.read_csv(path))
+
+
+def convert_to_columnar(path):
+    """
+    Converts a CSV file into a typed Parquet copy under .store/ and returns the DataFrame.
+    The copy is reused on later loads as long as the source mtime and size are unchanged.
+    """
+    version = dataset_version(path)
+    folder, parquet_path, meta_path = _store_paths(version[0])
+    df = read_source(path)
+    try:
+        os.makedirs(folder, exist_ok=True)
+        tmp_path = parquet_path + ".tmp"
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, parquet_path)
+        with open(meta_path, "w") as file:
+            json.dump({"mtime_ns": version[1], "size": version[2], "format": STORE_FORMAT}, file)
+    except (ImportError, OSError):
+        # Parquet engine missing or read-only folder: serve the parsed CSV without a columnar copy
+        pass
+    return df
+
+
+def _read_columnar(path, version):
+    _, parquet_path, meta_path = _store_paths(version[0])
+    try:
+        with open(meta_path, "r") as file:
+            meta = json.load(file)
+        if meta.get("mtime_ns") != version[1] or meta.get("size") != version[2] or \
+                meta.get("format") != STORE_FORMAT:
+            return None
+        return pd.read_parquet(parquet_path)
+    except (FileNotFoundError, ValueError, ImportError, OSError):
+        return None
+
+
+def _load(path):
+    version = dataset_version(path)
+    with _lock:
+        cached = _cache.get(version[0])
+        if cached is not None and cached[0] == version:
+            return cached
+        df = _read_columnar(path, version)
+        if df is None:
+            df = convert_to_columnar(path)
+        _cache[version[0]] = (version, df)
+        for key in [key for key in _derived if key[0][0] == version[0] and key[0] != version]:
+            del _derived[key]
+        return version, df
+
+
+def load_transactions(path):
+    """
+    Returns the transactions in `path` from a process-wide cache.
+    All sessions share one in-memory copy which is only reloaded when the file changes.
+    The returned DataFrame is shared, so callers must copy it before modifying it.
+    """
+    return _load(path)[1]
+
+
+def cached_derived(path, name, build):
+    """
+    Returns a structure derived from the dataset at `path` (an index, an aggregate, ...),
+    building it with build(df) once per dataset version.
+    """
+    version, df = _load(path)
+    key = (version, name)
+    with _lock:
+        if key in _derived:
+            return _derived[key]
+    value = build(df)
+    with _lock:
+        _derived[key] = value
+    return value
+
+
+def attach_columns(path, columns):
+    """
+    Writes computed columns (e.g. fraud scores) back into the store for the current dataset version.
+    Returns a new frame with the columns, which replaces the cached one (frames already handed out
+    are left untouched), and rewrites the columnar copy so they survive restarts until the source
+    file changes.
+    """
+    version, df = _load(path)
+    df = df.assign(**columns)
+    with _lock:
+        cached = _cache.get(version[0])
+        if cached is not None and cached[0] == version:
+            _cache[version[0]] = (version, df)
+        _, parquet_path, _ = _store_paths(version[0])
+        if os.path.exists(parquet_path):
+            try:
+                tmp_path = parquet_path + ".tmp"
+                df.to_parquet(tmp_path, index=False)
+                os.replace(tmp_path, parquet_path)
+            except (ImportError, OSError):
+                pass
+    return df
+
+
+def clear_cache():
+    """Drops every cached dataset and derived structure."""
+    with _lock:
+        _cache.clear()
+        _derived.clear()
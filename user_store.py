@@ -0,0 +1,181 @@
+import os
+import json
+import time
+import base64
+import hashlib
+import hmac
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+USER_DATA_PATH = "user_data.json"
+
+# scrypt cost: 2**14 rounds with r=8 uses 16 MB per hash, about 50 ms on one core
+SCRYPT_N = 1 << 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+SALT_BYTES = 16
+# Password hashes run on this many threads (hashlib releases the GIL while hashing), so a
+# burst of logins queues here instead of stalling the sessions serving pages
+HASH_WORKERS = min(4, os.cpu_count() or 1)
+# Verifications allowed to wait for a worker before new logins are turned away
+MAX_PENDING_HASHES = 64
+# A writer's lock file older than this is considered abandoned
+LOCK_STALE_SECONDS = 30
+
+
+class LoginBusy(Exception):
+    """Raised when too many password checks are already queued."""
+
+
+def hash_password(password, salt=None):
+    """Salted scrypt hash of `password`, encoded with its parameters as one string."""
+    salt = salt or os.urandom(SALT_BYTES)
+    digest = hashlib.scrypt(password.encode("utf-8"), salt=salt, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P)
+    return "scrypt${}${}${}${}${}".format(SCRYPT_N, SCRYPT_R, SCRYPT_P, base64.b64encode(salt).decode(),
+                                          base64.b64encode(digest).decode())
+
+
+def is_hashed(stored):
+    return isinstance(stored, str) and stored.startswith("scrypt$")
+
+
+def check_password(stored, password):
+    """True if `password` matches the stored hash (or a plaintext password from older files)."""
+    if not is_hashed(stored):
+        return hmac.compare_digest(str(stored).encode("utf-8"), password.encode("utf-8"))
+    _, n, r, p, salt, digest = stored.split("$")
+    expected = base64.b64decode(digest)
+    actual = hashlib.scrypt(password.encode("utf-8"), salt=base64.b64decode(salt), n=int(n), r=int(r), p=int(p),
+                            dklen=len(expected))
+    return hmac.compare_digest(actual, expected)
+
+
+class UserStore:
+    """
+    Usernames and password hashes in a JSON file. Reads come from an in-process copy that is
+    reloaded only when the file's mtime changes; each update re-reads the file under a lock,
+    changes one user and replaces the file atomically, so concurrent writers never tear it.
+    """
+
+    def __init__(self, path=USER_DATA_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.users = {}
+        self.version = None
+        self.pool = ThreadPoolExecutor(max_workers=HASH_WORKERS)
+        self.pending = threading.BoundedSemaphore(MAX_PENDING_HASHES)
+        # Checked for unknown usernames so they take as long as known ones
+        self.dummy_hash = hash_password("")
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.path)
+            return (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            return None
+
+    def _load(self):
+        """The current users, re-read from disk only if the file changed."""
+        version = self._stat()
+        with self.lock:
+            if version != self.version:
+                try:
+                    with open(self.path, "r") as f:
+                        self.users = json.load(f)
+                except FileNotFoundError:
+                    self.users = {}
+                self.version = version
+            return self.users
+
+    def _file_lock(self):
+        # Lock shared with other processes: whoever creates the lock file first may write
+        lock_path = self.path + ".lock"
+        while True:
+            try:
+                return os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY), lock_path
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(lock_path) > LOCK_STALE_SECONDS:
+                        os.remove(lock_path)
+                except OSError:
+                    pass
+                time.sleep(0.01)
+
+    def _update(self, change):
+        """Applies change(users) to the latest users on disk and writes them back atomically."""
+        fd, lock_path = self._file_lock()
+        try:
+            users = dict(self._load())
+            result = change(users)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(users, f, indent=4)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+            with self.lock:
+                self.users, self.version = users, self._stat()
+            return result
+        finally:
+            os.close(fd)
+            os.remove(lock_path)
+
+    def __contains__(self, username):
+        return username in self._load()
+
+    def __len__(self):
+        return len(self._load())
+
+    def _hash_in_pool(self, function, *args):
+        if not self.pending.acquire(blocking=False):
+            raise LoginBusy("Too many logins in progress, please try again.")
+        try:
+            return self.pool.submit(function, *args).result()
+        finally:
+            self.pending.release()
+
+    def register(self, username, password):
+        """Adds a user; returns False if the username is taken."""
+        if username in self:
+            return False
+        stored = self._hash_in_pool(hash_password, password)
+
+        def add(users):
+            if username in users:
+                return False
+            users[username] = stored
+            return True
+        return self._update(add)
+
+    def verify(self, username, password):
+        """True if `password` is `username`'s password. Plaintext passwords are upgraded to hashes."""
+        stored = self._load().get(username)
+        ok = self._hash_in_pool(check_password, self.dummy_hash if stored is None else stored, password)
+        ok = ok and stored is not None
+        if ok and not is_hashed(stored):
+            try:
+                self.set_password(username, password)
+            except LoginBusy:
+                # The login itself succeeded; the password is upgraded on a later one
+                pass
+        return ok
+
+    def set_password(self, username, password):
+        stored = self._hash_in_pool(hash_password, password)
+
+        def update(users):
+            users[username] = stored
+        self._update(update)
+
+
+_stores = {}
+_lock = threading.Lock()
+
+
+def get_user_store(path=USER_DATA_PATH):
+    """Returns the process-wide user store saved at `path`."""
+    path = os.path.abspath(path)
+    with _lock:
+        if path not in _stores:
+            _stores[path] = UserStore(path)
+        return _stores[path]
@@ -0,0 +1,159 @@
+import streamlit as st
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from config import DATA_FILE_PATH
+from transaction_store import dataset_version
+from fraud_scoring import score_store
+from address_clustering import get_address_clusters
+from fund_flow import trace_many
+from rollups import get_rollups
+from table_pager import TableView
+from report_store import get_report_store, reported_rows
+from views.data import with_fraud_scores
+from views.widgets import show_paged_table, select_date_range
+from views.reports import generate_pdf
+
+# AI Insight page: fraud scores from the random-forest model
+def ai_insight():
+    st.title("🧠 AI Insight")
+    try:
+        df = score_store(DATA_FILE_PATH)
+    except (KeyError, FileNotFoundError) as e:
+        st.error(f"Unable to score the dataset: {e}")
+        return
+    threshold = st.slider("Fraud probability threshold", 0.0, 1.0, 0.5, 0.05)
+    flagged = df['fraud_probability'] >= threshold
+    st.write(f"**Transactions scored:** {len(df)}")
+    st.write(f"**Flagged as fraudulent:** {int(flagged.sum())}")
+    st.write("### Fraud Probability Distribution")
+    bins = pd.cut(df['fraud_probability'], bins=np.linspace(0, 1, 11), include_lowest=True)
+    st.bar_chart(bins.value_counts(sort=False).rename(index=str))
+    st.write("### Highest-Risk Transactions")
+    st.write(df.nlargest(20, 'fraud_probability'))
+
+
+# Blockchain Analytics Navigation
+def blockchain_analytics(df):
+    st.markdown("---")
+    st.title("🔍 Blockchain Analytics Navigation")
+
+    # Daily rollups answer the date-range aggregates without rescanning the transactions
+    rollups = get_rollups(DATA_FILE_PATH)
+    start, end = select_date_range(rollups)
+
+    # Check if the DataFrame contains the required columns
+    if "transaction_type" in df.columns:
+        st.write("### Transaction Analysis by Type")
+        
+        # Count occurrences of each transaction_type in the selected range
+        transaction_counts = rollups.query(by=["transaction_type"], start=start, end=end)["count"] \
+            .rename("Count").reset_index()
+        
+        # Display aggregated results
+        st.write("Transaction Counts by Type:")
+        st.write(transaction_counts)
+        
+        # Display the results as a bar chart
+        st.bar_chart(transaction_counts.set_index("transaction_type")["Count"])
+    else:
+        st.warning("The uploaded dataset does not contain a 'transaction_type' column. Please verify the data.")
+
+    # Navigation options
+    analytics_options = ["📂 Overview", "📊 Data Insights", "📉 Network Analysis", "🕵️‍♂️ Transaction Monitoring", "🕵️‍♂️ Pseudonymous Addresses"]
+    analytics_choice = st.selectbox("Select an analysis type:", analytics_options)
+
+    if analytics_choice == "📂 Overview":
+        st.write("### Blockchain Overview")
+        st.write("Gain a high-level understanding of blockchain transactions.")
+        user_reporting_and_collaboration()
+    elif analytics_choice == "📊 Data Insights":
+        st.write("### Data Insights")
+        st.write("Explore trends, patterns, and anomalies in the data.")
+        st.write("Data Statistics:")
+        st.write(rollups.describe(start=start, end=end).rename("Amount"))
+        st.write("Amounts by Cryptocurrency and Risk Score:")
+        st.write(rollups.query(by=["cryptocurrency", "risk_score"], start=start, end=end, quantiles=(0.5, 0.95)))
+    elif analytics_choice == "📉 Network Analysis":
+        st.write("### Network Analysis")
+        st.write("Analyze blockchain connections and transaction networks.")
+        seeds = st.text_area("Wallets or transaction IDs to trace (one per line)").split()
+        direction = st.radio("Follow funds", ["forward", "backward"], horizontal=True)
+        max_hops = st.slider("Hops", 1, 6, 3)
+        min_amount = st.number_input("Minimum amount per transfer", min_value=0.0, value=0.0)
+        if seeds and st.button("Trace"):
+            # A few seeds are traced right here; larger batches use the shared worker pool
+            results = trace_many(DATA_FILE_PATH, seeds, direction=direction, max_hops=max_hops,
+                                 min_amount=min_amount)
+            for seed, result in results.items():
+                if result is None:
+                    st.warning(f"`{seed}` is not a wallet or transaction in the dataset.")
+                    continue
+                st.write(f"**{seed}**: {len(result.edges)} transfers, {len(result.wallets) - 1} wallets reached")
+                if result.stopped:
+                    st.info(f"Trace stopped early ({result.stopped.replace('_', ' ')}); showing partial results.")
+                st.write(result.edges)
+    elif analytics_choice == "🕵️‍♂️ Transaction Monitoring":
+        st.write("### Transaction Monitoring")
+        df = with_fraud_scores(df)
+        if df is not None:
+            fraudulent_transactions = TableView(df, np.flatnonzero((df['is_fraudulent'] == True).to_numpy()),
+                                                key=(dataset_version(DATA_FILE_PATH), len(df), "fraudulent"))
+            if len(fraudulent_transactions):
+                st.write("### Fraudulent Transactions:")
+                show_paged_table(fraudulent_transactions, "fraudulent", "fraudulent_transactions.csv")
+            else:
+                st.write("No fraudulent transactions found.")
+            # Transactions analysts have reported, found through the report store's index
+            flagged = reported_rows(DATA_FILE_PATH, get_report_store())
+            if len(flagged):
+                flagged = flagged[flagged < len(df)]
+                st.write("### Transactions Reported by Analysts:")
+                st.write(f"{len(np.intersect1d(flagged, fraudulent_transactions.rows))} of {len(flagged)} "
+                         "reported transactions are also scored as fraudulent.")
+                show_paged_table(TableView(df, flagged), "reported")
+        else:
+            st.warning("The dataset does not contain an 'is_fraudulent' column. Please verify the data.")
+    elif analytics_choice == "🕵️‍♂️ Pseudonymous Addresses":
+        st.write("### Pseudonymous Addresses")
+        if "address" in df.columns:
+            unique_addresses = df['address'].unique()
+            st.write("Unique blockchain addresses (showing pseudonymous properties):")
+            clusters = get_address_clusters()
+            if clusters is not None:
+                # Addresses spent together in ingested blocks are attributed to one entity
+                entities = clusters.entities(unique_addresses.astype(str))
+                st.write(pd.DataFrame({"address": unique_addresses,
+                                       "entity": pd.Series(entities).where(entities >= 0).astype("Int64")}))
+                st.write(f"Addresses linked to a known entity: {int((entities >= 0).sum())}")
+            else:
+                st.write(unique_addresses)
+            generate_pdf(unique_addresses)  # Generate PDF here
+        else:
+            st.warning("The dataset does not contain an 'address' column. Please verify the data.")
+
+# Function to handle user reporting and collaboration
+def user_reporting_and_collaboration():
+    st.write("### User Reporting and Collaboration")
+    transaction_id = st.text_input("Transaction ID")
+    reported_by = st.text_input("Reported By")
+    notes = st.text_area("Notes")
+
+    if st.button("Submit Report"):
+        if transaction_id and reported_by and notes:
+            get_report_store().add(transaction_id, reported_by, notes, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            st.success("Report submitted successfully!")
+        else:
+            st.error("Please fill all the fields before submitting.")
+
+    # Display submitted reports, one page at a time straight from the report store
+    store = get_report_store()
+    reported_by_filter = st.text_input("Show reports by", key="reports_reported_by")
+    transaction_filter = st.text_input("Show reports on transaction", key="reports_transaction_id")
+    filters = {"reported_by": reported_by_filter or None, "transaction_id": transaction_filter or None}
+    n_reports = store.count(**filters)
+    if n_reports:
+        st.write("### Submitted Reports")
+        page = st.number_input("Page", min_value=1, max_value=store.n_pages(**filters), value=1, key="reports_page")
+        st.table(store.page(page, **filters))
+        st.caption(f"{n_reports} reports")
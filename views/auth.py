@@ -0,0 +1,64 @@
+import streamlit as st
+from datetime import datetime
+from user_store import get_user_store, LoginBusy
+
+# Register page
+def register_user():
+    st.title("🔐 Register New Account")
+    username = st.text_input("Enter a username")
+    password = st.text_input("Enter a password", type="password")
+    confirm_password = st.text_input("Confirm your password", type="password")
+
+    if st.button("Register"):
+        users = get_user_store()
+        if password != confirm_password:
+            st.error("Passwords do not match!")
+            return
+        if username in users:
+            st.error("Username already exists!")
+            return
+        try:
+            registered = users.register(username, password)
+        except LoginBusy as e:
+            st.warning(str(e))
+            return
+        if not registered:
+            st.error("Username already exists!")
+        else:
+            st.success("Account created successfully!")
+            st.info("You can now log in with your credentials.")
+            st.session_state.redirect_to_login = True
+
+# Login page
+def login_user():
+    st.title("🔑 Login")
+    username = st.text_input("Username")
+    password = st.text_input("Password", type="password")
+
+    if hasattr(st.session_state, "redirect_to_login") and st.session_state.redirect_to_login:
+        st.success("Account created successfully. Please log in.")
+        del st.session_state.redirect_to_login
+
+    if st.button("Login"):
+        try:
+            valid = get_user_store().verify(username, password)
+        except LoginBusy as e:
+            st.warning(str(e))
+            return False, None
+        if valid:
+            current_time = datetime.now()
+            hour = current_time.hour
+            greeting = "Good Morning" if hour < 12 else "Good Afternoon" if hour < 18 else "Good Evening"
+            st.success(f"{greeting}, {username}!")
+            st.session_state.logged_in = True
+            st.session_state.username = username
+            return True, username
+        else:
+            st.error("Invalid username or password!")
+    return False, None
+
+# Logout page
+def logout_user():
+    st.session_state.logged_in = False
+    del st.session_state.username
+    st.success("You have been logged out.")
@@ -0,0 +1,69 @@
+import streamlit as st
+from config import DATA_FILE_PATH
+from views.home import home_page
+from views.auth import logout_user
+
+# Each page's module (and the libraries it needs) is imported the first time the page is shown
+def user_dashboard(username):
+    """
+    Function to handle the user dashboard with various navigation options.
+    Allows the user to upload data and view blockchain analytics, visualization,
+    peer-to-peer transaction data, and 3D blockchain connections.
+    """
+    st.sidebar.title("📊 Dashboard")
+    st.sidebar.write(f"Logged in as: {username}")
+
+    search_query = st.text_input("Search", placeholder="Wallet address, transaction ID, block hash or owner")
+    
+    if search_query:
+        import pandas as pd
+        from search_index import get_search_index
+        st.write(f"Search results for: **{search_query}**")
+        try:
+            hits = get_search_index(DATA_FILE_PATH).search(search_query)
+        except FileNotFoundError:
+            hits = None
+            st.warning("The transaction dataset is not available for searching.")
+        if hits:
+            st.table(pd.DataFrame(hits))
+        elif hits is not None:
+            st.write("No matches found.")
+    
+    pages = ["🏠 Home", "📤 View Data", "📈 Blockchain Analytics", "📊 Visualization", "💱 Peer-to-Peer Transaction", 
+             "🌐 3D Visualization of Blockchain", "🔗 Explore through API", "👛 Wallet Details", "🧠 AI Insight", "🚪 Logout"]
+    choice = st.sidebar.radio("Navigate to:", pages)
+
+    if choice == "🏠 Home":
+        home_page()
+    elif choice == "📤 View Data":
+        from views.data import load_transaction_data
+        load_transaction_data()
+    elif choice == "📈 Blockchain Analytics":
+        from views.data import get_uploaded_data
+        from views.analytics import blockchain_analytics
+        df = get_uploaded_data()
+        if df is not None:
+            blockchain_analytics(df)
+    elif choice == "📊 Visualization":
+        from views.explorer import visualize_block
+        visualize_block()
+    elif choice == "💱 Peer-to-Peer Transaction":
+        from views.network import peer_to_peer_transaction
+        peer_to_peer_transaction()
+    elif choice == "🌐 3D Visualization of Blockchain":
+        from views.data import get_uploaded_data
+        from views.network import visualize_blockchain_network
+        df = get_uploaded_data()
+        if df is not None:
+            visualize_blockchain_network(df, DATA_FILE_PATH)
+    elif choice == "🔗 Explore through API":
+        from views.explorer import explore_through_api
+        explore_through_api()
+    elif choice == "👛 Wallet Details":
+        from views.wallet import wallet_details
+        wallet_details()
+    elif choice == "🧠 AI Insight":
+        from views.analytics import ai_insight
+        ai_insight()
+    elif choice == "🚪 Logout":
+        logout_user()
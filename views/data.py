@@ -0,0 +1,52 @@
+import streamlit as st
+from config import DATA_FILE_PATH
+from transaction_store import load_transactions
+from fraud_scoring import score_store, add_fraud_scores
+
+# Function to handle file upload for transaction data
+def load_transaction_data():
+    """
+    Function to automatically load transaction data from a predefined file.
+    """
+    if "uploaded_df" not in st.session_state:
+        st.session_state.uploaded_df = None
+    
+    try:
+        df = load_transactions(DATA_FILE_PATH)
+        if not df.empty:
+            try:
+                df = score_store(DATA_FILE_PATH)  # Adds fraud_probability / is_fraudulent once per dataset version
+            except KeyError:
+                pass  # The dataset lacks the columns the fraud model needs
+        if df.empty:
+            st.error("The data file is empty. Please check the file content.")
+        else:
+            st.success("Data loaded successfully from file!")
+            st.write("Data Preview:")
+            st.write(df.head())
+            st.session_state.uploaded_df = df  # Store the loaded DataFrame in session state for use elsewhere in the app
+    except Exception as e:
+        st.error(f"Error reading the file: {e}")
+    
+    return st.session_state.uploaded_df
+
+
+def get_uploaded_data():
+    """Returns the dataset loaded through "View Data", or None with a warning."""
+    df = st.session_state.get("uploaded_df")
+    if df is None:
+        st.warning("Please load the transaction dataset first (📤 View Data).")
+    return df
+
+
+def with_fraud_scores(df):
+    """
+    Returns `df` with an 'is_fraudulent' column, scoring it with the fraud model when the column
+    is missing. Returns None if the dataset has neither the column nor the model's input columns.
+    """
+    if "is_fraudulent" in df.columns:
+        return df
+    try:
+        return add_fraud_scores(df)
+    except KeyError:
+        return None
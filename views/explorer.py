@@ -0,0 +1,209 @@
+import streamlit as st
+import requests
+from io import BytesIO
+from blockchain_client import get_client
+from block_model import get_block_model
+from views.widgets import background_job
+from time_columns import format_time
+
+def generate_qr_code(data):
+    """Generates and returns a QR code image in bytes for Streamlit display."""
+    import qrcode
+    qr = qrcode.QRCode(
+        version=1,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        box_size=10,
+        border=4,
+    )
+    qr.add_data(data)
+    qr.make(fit=True)
+    qr_image = qr.make_image(fill_color="black", back_color="white")
+
+    # Convert the PIL image to a bytes object
+    img_buffer = BytesIO()
+    qr_image.save(img_buffer, format="PNG")
+    img_buffer.seek(0)
+    return img_buffer
+
+def get_block_info(hash_id):
+    """Shows the header of a block and returns its columnar model (block_model.ColumnarBlock)."""
+    st.info("Connecting to server...")
+    try:
+        # Fetched in the background, once for every session asking for this block, and only
+        # when the block is not already among the recently parsed ones
+        block = background_job(("block", hash_id.strip()),
+                               lambda job: get_block_model(hash_id, get_client().get_block), "Fetching the block")
+        if block is None:
+            return None
+
+        block_info = block.header
+        st.success("Block data loaded successfully!")
+        block_count = block_info.get("height", "Unknown")
+        st.subheader("Block Information")
+        st.text(f"Hash: {block_info.get('hash')}")
+        st.text(f"Height (Block Number): {block_count}")
+        st.text(f"Time: {format_time(block_info['time']) if block_info.get('time') else 'Unknown'}")
+        st.text(f"Block Size: {block_info.get('size')} bytes")
+        st.text(f"Number of Transactions: {len(block)}")
+        st.text(f"Total Blocks in the Blockchain: {block_count + 1}")
+
+        return block
+
+    except requests.exceptions.RequestException as e:
+        st.error(f"Error fetching block data: {e}")
+        return None
+
+def is_mining_transaction(block, row):
+    return block.is_mining(row)
+
+def extract_scriptsig(block, row):
+    return block.scriptsigs(row)
+
+def describe_stack(items):
+    """Labels the items of a scriptSig or witness stack as signatures, public keys or data."""
+    described = []
+    for item in items:
+        if len(item) in (33, 65) and item[0] in (2, 3, 4):
+            described.append(f"public key `{item.hex()}`")
+        elif 9 <= len(item) <= 73 and item[0] == 0x30:
+            described.append(f"signature `{item[:-1].hex()}` (sighash type {item[-1]:#04x})")
+        else:
+            described.append(f"data `{item.hex()}`" if item else "empty")
+    return described
+
+def get_signer_identity(verifications):
+    """One line per input: who signed it (the keys whose signatures verified) and the check's outcome."""
+    from signature_verification import VALID, COINBASE
+    if not verifications:
+        return ["Signatures were not verified for this transaction."]
+    lines = []
+    for result in verifications:
+        if result.status == COINBASE:
+            lines.append(f"Input {result.index + 1}: coinbase, no signature")
+        elif result.status == VALID:
+            keys = ", ".join(f"`{key}`" for key in result.pubkeys)
+            lines.append(f"Input {result.index + 1} ({result.script_type}): ✅ valid signature by {keys}")
+        else:
+            lines.append(f"Input {result.index + 1} ({result.script_type}): {result.status}, {result.detail}")
+    return lines
+
+def verify_block_signatures(block_hash, block):
+    """Verifies every input signature of the block as a background job; returns the results or None."""
+    from signature_verification import verify_block
+
+    def verify(job):
+        def progress(fraction):
+            job.check()
+            job.report(fraction)
+        return verify_block(block, get_client().get_raw_block(block_hash), progress=progress)
+
+    try:
+        return background_job(("verify_block", block_hash.strip()), verify, "Verifying input signatures",
+                              progress=True)
+    except (requests.exceptions.RequestException, ValueError) as e:
+        st.warning(f"Signatures could not be verified: {e}")
+        return None
+
+def show_beneficiary_details(block, row, verified=None):
+    st.subheader("Beneficiary Details")
+    if is_mining_transaction(block, row):
+        st.write("This is a mining transaction (block reward).")
+        for address, value_btc in block.beneficiaries(row):
+            st.write(f"- **Received by**: `{address}`, **Amount**: `{value_btc} BTC`")
+    else:
+        st.write("This is a regular transaction.")
+        st.write("**Beneficiaries (Receivers):**")
+        for address, value_btc in block.beneficiaries(row):
+            st.write(f"- **Received by**: `{address}`, **Amount**: `{value_btc} BTC`")
+        
+        st.write("**Sources (Senders):**")
+        for sender_address in block.sources(row):
+            st.write(f"- **Source Address**: `{sender_address}`")
+
+    st.subheader("Witness Signatures and Addresses")
+    witnesses = block.witnesses(row)
+    from signature_verification import witness_items, script_pushes
+    for i, witness_data in witnesses:
+        try:
+            items = describe_stack(witness_items(witness_data))
+        except (ValueError, IndexError):
+            items = [f"`{witness_data}`"]
+        st.write(f"- **Witness for Input {i+1}**: " + "; ".join(items))
+        
+        # Add unique key to the button
+        if st.button(f"Generate QR Code for Witness Signature - Input {i+1}", key=f"qr_button_{i}"):
+            qr_image_bytes = generate_qr_code(witness_data)
+            st.image(qr_image_bytes, caption=f"QR Code for Witness Signature - Input {i+1}")
+    
+    if not witnesses:
+        st.write("No witness for this transaction.")
+    
+    scriptsig_details = extract_scriptsig(block, row)
+    st.subheader("ScriptSig (Transaction Authorization Potential Forensics)")
+    if scriptsig_details:
+        for i, script in enumerate(scriptsig_details, 1):
+            try:
+                pushes = script_pushes(bytes.fromhex(script))
+            except ValueError:
+                pushes = None
+            items = describe_stack(pushes) if pushes else [f"`{script}`"]
+            st.write(f"- **ScriptSig for Input {i}**: " + "; ".join(items))
+
+    tx_hash = block.hashes[row]
+    n_inputs = len(scriptsig_details)
+    # verified(txid, index) looks up a finished input check (None while it has not run)
+    checked = [verified(tx_hash, i) for i in range(n_inputs)] if verified else []
+    verifications = [result for result in checked if result is not None]
+    st.write("**Signer Identity**:")
+    for line in get_signer_identity(verifications):
+        st.write(f"- {line}")
+
+def visualize_transactions(block, verified=None):
+    if len(block) == 0:
+        st.write("No transactions found in this block.")
+        return
+
+    st.subheader("Visualizing Transactions in Block")
+    tx_ids = block.hashes[:15].tolist()
+    selected_tx = st.selectbox("Select a transaction to explore:", tx_ids)
+    
+    if selected_tx:
+        # Every transaction of the block is already in the columnar model; no extra request is needed
+        st.write(f"Details for Transaction: `{selected_tx}`")
+        show_beneficiary_details(block, block.row(selected_tx), verified)
+
+# Visualization page: the transaction visualizer for a block picked by hash
+def visualize_block():
+    block_hash = st.text_input("Enter a Block Hash ID to visualize its transactions", key="visualize_block_hash")
+    if block_hash:
+        block = get_block_info(block_hash)
+        if block is not None:
+            visualize_transactions(block)
+
+# Explore through API function
+def  explore_through_api():
+    st.title("🔗 Explore Blockchain API")
+    st.markdown("""
+    Here you can explore blockchain data through an API.
+    Enter a Block Hash ID to view its details.
+    """)
+
+    block_hash = st.text_input("Enter Block Hash ID")
+
+    if block_hash:
+        block = get_block_info(block_hash)
+        if block is not None:
+            from signature_verification import get_verifier, VALID, INVALID
+            # The transactions are browsable right away; signer identities fill in from the
+            # verifier's cache once the (opt-in) verification below has checked them
+            st.subheader("Options")
+            st.write("Select a transaction to view detailed information.")
+            visualize_transactions(block, get_verifier().cached)
+
+            st.subheader("Signature Verification")
+            if st.checkbox("Verify every input signature of this block", key=f"verify_{block_hash.strip()}"):
+                verification = verify_block_signatures(block_hash, block)
+                if verification:
+                    statuses = [result.status for result in verification.values()]
+                    st.text(f"Input signatures: {statuses.count(VALID)} valid, {statuses.count(INVALID)} invalid, "
+                            f"{len(statuses) - statuses.count(VALID) - statuses.count(INVALID)} not checked")
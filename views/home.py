@@ -0,0 +1,14 @@
+import streamlit as st
+
+# Home page
+def home_page():
+    st.title("🏠 Blockchain Analysis Tool")
+    st.markdown("""Welcome to the Blockchain Analysis Tool!
+        - Explore blockchain transactions.
+        - Detect fraudulent activities.
+        - Analyze and visualize data like a pro.
+    """)
+
+    st.markdown("### Learn more about Blockchain:")
+    video_url = "https://youtu.be/QJn28fFKUR0?si=IPPXXYeFZCQk1tB6"
+    st.video(video_url)
@@ -0,0 +1,114 @@
+import streamlit as st
+from datetime import datetime
+from config import DATA_FILE_PATH
+from feature_pipeline import get_feature_pipeline, score_appended
+from transaction_log import get_transaction_log
+from pair_counts import get_pair_counts
+from batch_analytics import read_result
+from network_layout import get_network_layout, build_layout, network_figure
+from transaction_store import dataset_version
+from views.data import with_fraud_scores
+from views.widgets import background_job
+
+def visualize_blockchain_network(df, path=None):
+    """
+    Visualizes the blockchain network in 3D with fraudulent transactions highlighted in red.
+    """
+    # Ensure the 'is_fraudulent' column is boolean, scoring the data with the fraud model if it is missing
+    df = with_fraud_scores(df)
+    if df is None:
+        st.error("The 'is_fraudulent' column is missing in the data!")
+        return
+
+    # Force-directed layout of the wallet graph, downsampled to the payload budget and
+    # cached per dataset version when the data comes from a file
+    try:
+        if path:
+            # Built in the background (once per dataset version, shared by every session)
+            layout = background_job(("network_layout", dataset_version(path)), lambda job: get_network_layout(path),
+                                    "Laying out the wallet network")
+            if layout is None:
+                return
+        else:
+            layout = build_layout(df)
+    except KeyError as e:
+        st.error(f"Unable to build the network: {e}")
+        return
+
+    # Highlight the wallets involved in fraudulent transactions in red
+    fraudulent_transactions = df[df['is_fraudulent'].astype(bool)]
+    fig = network_figure(layout, layout.nodes_of_transactions(fraudulent_transactions))
+    st.write(f"Showing {len(layout.labels)} of {len(layout.wallets)} wallets and {len(layout.edges)} strongest links.")
+    folded = layout.folded_count_of_transactions(fraudulent_transactions)
+    if folded:
+        st.write(f"{folded} wallets involved in fraudulent transactions are folded into other nodes "
+                 "and not highlighted.")
+
+    # Display the plot in Streamlit
+    st.plotly_chart(fig)
+
+
+PEER_COUNT_ROWS = 50
+
+def peer_to_peer_transaction():
+    """
+    Function to handle both the transaction submission and the display of peer-to-peer transactions.
+    Allows users to submit peer-to-peer transactions and also view the transaction count between addresses and recipients.
+    """
+    st.title("💱 Peer-to-Peer Transaction")
+
+    # Displaying the uploaded dataset (plus every submitted transaction) if available
+    if "uploaded_df" in st.session_state and st.session_state.uploaded_df is not None:
+        # A batch run over this dataset version answers directly while nothing has been appended;
+        # otherwise pair counts are maintained incrementally instead of re-running a groupby per render
+        precomputed = read_result("p2p", path=DATA_FILE_PATH)
+        if precomputed is not None and len(get_transaction_log(DATA_FILE_PATH)) == 0:
+            peer_count = precomputed.nlargest(PEER_COUNT_ROWS, "transaction_count") \
+                .rename(columns={"sender": "address", "receiver": "recipient"}).reset_index(drop=True)
+            n_pairs = len(precomputed)
+        else:
+            pair_counts = get_pair_counts(DATA_FILE_PATH)
+            peer_count = pair_counts.top(PEER_COUNT_ROWS)
+            n_pairs = len(pair_counts)
+        peer_count['type'] = 'P2P'
+        st.write(f"Peer-to-Peer Transaction Count (top {PEER_COUNT_ROWS} of {n_pairs} pairs):")
+        st.write(peer_count)
+
+        wallet = st.text_input("Show the counterparties of a wallet")
+        if wallet:
+            st.write(get_pair_counts(DATA_FILE_PATH).neighbours(wallet))
+
+    else:
+        st.warning("Please upload a transaction dataset first.")
+
+    # Input fields for submitting a new transaction
+    sender = st.text_input("Sender Address")
+    receiver = st.text_input("Receiver Address")
+    amount = st.number_input("Amount", min_value=0.01)
+    transaction_id = st.text_input("Transaction ID")
+    transaction_date = st.date_input("Transaction Date", min_value=datetime.today())
+
+    if st.button("Submit Transaction"):
+        if sender and receiver and transaction_id:
+            # Creating a new transaction record
+            transaction = {
+                "address": sender,
+                "recipient": receiver,
+                "amount": amount,
+                "transaction_id": transaction_id,
+                "date": transaction_date.strftime("%Y-%m-%d"),
+            }
+
+            # Scored from the sender's history before it (the per-wallet aggregates are built once
+            # per dataset version and pick up the log incrementally)
+            probability, wallet_features = score_appended(get_feature_pipeline(DATA_FILE_PATH), transaction)
+
+            # Append the new transaction to the shared, durable transaction log of the dataset
+            get_transaction_log(DATA_FILE_PATH).append(transaction)
+
+            st.success(f"Transaction successfully recorded: {transaction}")
+            st.write("Sender history:", wallet_features)
+            st.info(f"Fraud probability: {probability:.2%}")
+
+        else:
+            st.error("Please fill in all fields.")
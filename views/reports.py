@@ -0,0 +1,33 @@
+import streamlit as st
+from config import DATA_FILE_PATH
+from rollups import get_rollups
+from report_service import address_list_report, transaction_type_report
+from views.widgets import select_date_range, offer_pdf_report
+
+# Function to generate a PDF with the unique addresses in A4 format
+def generate_pdf(addresses):
+    render = address_list_report(addresses)
+    offer_pdf_report("unique_addresses", (), render, len(addresses),
+                     "Download Unique Addresses as PDF", "unique_addresses.pdf")
+
+# Function to visualize transaction proportions and generate a report
+def visualize_transaction_proportions_and_generate_report(df):
+    st.title("📊 Visualization and Reporting Tools")
+    
+    # Visualize transaction type proportions as a pie chart
+    if 'transaction_type' in df.columns:
+        st.subheader("Transaction Proportions")
+        rollups = get_rollups(DATA_FILE_PATH)
+        start, end = select_date_range(rollups)
+        transaction_counts = rollups.query(by=['transaction_type'], start=start, end=end)['count'].reset_index()
+        import plotly.express as px
+        fig = px.pie(transaction_counts, values='count', names='transaction_type', title='Transaction Type Proportions')
+        st.plotly_chart(fig)
+        
+        # Generate PDF report
+        st.subheader("Download Detailed Report")
+        render = transaction_type_report(transaction_counts)
+        offer_pdf_report("transaction_report", (str(start), str(end)), render, len(transaction_counts),
+                         "Download Report as PDF", "transaction_report.pdf")
+    else:
+        st.warning("The dataset does not contain a 'transaction_type' column. Please upload a valid dataset.")
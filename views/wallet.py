@@ -0,0 +1,28 @@
+import streamlit as st
+from config import WALLET_DATA_FILE_PATH
+from transaction_store import load_transactions, dataset_version
+from wallet_index import get_wallet_index
+from table_pager import TableView
+from views.widgets import show_paged_table
+
+def load_data():
+    return load_transactions(WALLET_DATA_FILE_PATH)
+
+# Define wallet details functionality
+def wallet_details():
+    st.title("👛 Wallet Details")
+    df = load_data()
+    wallet_index = get_wallet_index(WALLET_DATA_FILE_PATH)
+    selected_wallet = st.selectbox("Select Wallet", wallet_index.wallets)
+    if selected_wallet:
+        wallet_transactions = wallet_index.history(df, selected_wallet)
+        st.header("Wallet Overview")
+        st.write(f"**Wallet Address:** {selected_wallet}")
+        st.write(f"**Total Transactions:** {wallet_index.count(selected_wallet)}")
+        st.write(f"**Total Amount Transacted:** ${wallet_index.total(selected_wallet):.2f}")
+        st.header("Transaction History")
+        # Only the visible page of the wallet's rows is sent to the browser
+        wallet_transactions = TableView(df, wallet_index.rows(selected_wallet),
+                                        ['Transaction ID', 'Sender Wallet', 'Receiver Wallet', 'Amount Transacted', 'Timestamp', 'Risk Score'],
+                                        key=(dataset_version(WALLET_DATA_FILE_PATH), selected_wallet))
+        show_paged_table(wallet_transactions, "wallet_history", f"{selected_wallet}_transactions.csv")
@@ -0,0 +1,101 @@
+import time
+import uuid
+import streamlit as st
+from config import DATA_FILE_PATH
+from table_pager import PAGE_SIZE
+from time_columns import localize_frame
+
+# How long a rerun waits for a background job before showing its progress and polling again
+JOB_POLL_SECONDS = 0.5
+# How long a finished job's result stays in the job queue for the sessions polling it; the caches
+# the work goes through (parsed blocks, verified inputs, layouts) keep the data itself
+JOB_RESULT_SECONDS = 60
+
+
+# Function to show a table one page at a time, with sorting, filtering and an optional CSV export
+def show_paged_table(view, key, file_name=None):
+    sort_column, descending, filter_column, filter_text = st.columns(4)
+    sort_by = sort_column.selectbox("Sort by", ["(none)"] + view.columns, key=f"{key}_sort")
+    descending = descending.checkbox("Descending", key=f"{key}_descending")
+    filter_by = filter_column.selectbox("Filter column", view.columns, key=f"{key}_filter_column")
+    text = filter_text.text_input("Contains", key=f"{key}_filter")
+    if text:
+        view = view.filter(filter_by, contains=text)
+    if sort_by != "(none)":
+        view = view.sort(sort_by, ascending=not descending)
+    page = st.number_input("Page", min_value=1, max_value=view.n_pages(), value=1, key=f"{key}_page")
+    # Only the rendered page is converted to the display time zone
+    st.dataframe(localize_frame(view.page(page)))
+    first = (page - 1) * PAGE_SIZE
+    st.caption(f"Rows {min(first + 1, len(view))}-{min(first + PAGE_SIZE, len(view))} of {len(view)}")
+    # The export is converted in chunks, and only when asked for; the download button still
+    # holds the finished CSV in memory, as Streamlit has no way to stream a file to the browser
+    if file_name and st.button("Prepare CSV", key=f"{key}_export"):
+        st.download_button(label="Download CSV", data=view.csv_file(), file_name=file_name, mime='text/csv')
+
+
+# Function to pick the date range the analytics aggregate over (None, None for all dates)
+def select_date_range(rollups):
+    dated = rollups.date_range()
+    if dated is None:
+        return None, None
+    selected = st.date_input("Date range", value=(dated[0].date(), dated[1].date()),
+                             min_value=dated[0].date(), max_value=dated[1].date())
+    if isinstance(selected, (tuple, list)) and len(selected) == 2:
+        return selected[0], selected[1]
+    return None, None
+
+
+# Function to run slow work as a shared background job: returns its result once finished, and
+# meanwhile reruns the page to poll (None if the user cancelled it). Only work that calls
+# job.report() / job.check() should pass progress=True to get a progress bar and a Cancel button
+def background_job(key, work, label, ttl=JOB_RESULT_SECONDS, progress=False):
+    from job_queue import get_job_queue, FAILED, CANCELLED
+    queue = get_job_queue()
+    owner = st.session_state.setdefault("job_owner", uuid.uuid4().hex)
+    cancelled = st.session_state.setdefault("cancelled_jobs", set())
+    if key in cancelled:
+        st.info(f"{label} was cancelled.")
+        if not st.button("Run again", key=f"rerun_{key}"):
+            return None
+        cancelled.discard(key)
+    job = queue.submit(key, work, owner=owner, ttl=ttl)
+    if not job.wait(JOB_POLL_SECONDS):
+        if progress:
+            st.progress(job.progress)
+        st.caption(f"{label}...")
+        if progress and st.button("Cancel", key=f"cancel_{job.id}"):
+            queue.cancel(job.id, owner)
+            cancelled.add(key)
+            st.experimental_rerun()
+        time.sleep(JOB_POLL_SECONDS)
+        st.experimental_rerun()
+    if job.state == FAILED:
+        raise job.error
+    if job.state == CANCELLED:
+        cancelled.add(key)
+        st.info(f"{label} was cancelled.")
+        return None
+    return job.result
+
+# Function to offer a PDF report for download, rendering it only once a download is requested
+def offer_pdf_report(name, params, render, n_items, label, file_name):
+    from report_service import get_report_service, report_version, BACKGROUND_AFTER_ITEMS
+    service = get_report_service(DATA_FILE_PATH)
+    key = service.key(report_version(DATA_FILE_PATH), name, params)
+    job = service.job(key)
+    if job is None or job.state == "failed":
+        if st.button(f"Generate {file_name}", key=f"generate_{name}"):
+            # Large reports are built in the background; reruns show their progress
+            job = service.submit(key, render, background=n_items > BACKGROUND_AFTER_ITEMS)
+    if job is None:
+        return
+    if job.state == "running":
+        st.progress(job.progress)
+        st.caption(f"Building {file_name}...")
+        st.button("Refresh progress", key=f"refresh_{name}")
+    elif job.state == "failed":
+        st.error(f"Could not generate {file_name}: {job.error}")
+    else:
+        with open(job.path, "rb") as f:
+            st.download_button(label=label, data=f, file_name=file_name, mime="application/pdf")
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+from transaction_store import cached_derived
+
+
+def _csr(codes, n_wallets):
+    """Groups row positions by wallet code: rows of wallet w are order[offsets[w]:offsets[w + 1]]."""
+    order = np.argsort(codes, kind="stable")
+    offsets = np.zeros(n_wallets + 1, dtype=np.int64)
+    np.cumsum(np.bincount(codes, minlength=n_wallets), out=offsets[1:])
+    return offsets, order.astype(np.int64)
+
+
+class WalletIndex:
+    """
+    Dictionary-encoded wallet addresses with CSR arrays of the rows each wallet sent and received.
+    Lookups cost time proportional to the wallet's own rows instead of a scan of the frame.
+    """
+
+    def __init__(self, df, sender_column="Sender Wallet", receiver_column="Receiver Wallet",
+                 amount_column="Amount Transacted"):
+        senders = df[sender_column].astype(str).to_numpy()
+        receivers = df[receiver_column].astype(str).to_numpy()
+        self.wallets, codes = np.unique(np.concatenate([senders, receivers]), return_inverse=True)
+        n_rows = len(df)
+        self.sender_codes = codes[:n_rows]
+        self.receiver_codes = codes[n_rows:]
+        self.codes = {wallet: code for code, wallet in enumerate(self.wallets.tolist())}
+        self.sent_offsets, self.sent_rows = _csr(self.sender_codes, len(self.wallets))
+        self.received_offsets, self.received_rows = _csr(self.receiver_codes, len(self.wallets))
+        if amount_column in df.columns:
+            self.amounts = pd.to_numeric(df[amount_column], errors="coerce").fillna(0).to_numpy()
+        else:
+            self.amounts = np.zeros(n_rows)
+
+    def __len__(self):
+        return len(self.wallets)
+
+    def __contains__(self, wallet):
+        return wallet in self.codes
+
+    def sent(self, wallet):
+        """Row positions of the transactions sent by `wallet`."""
+        code = self.codes.get(wallet)
+        if code is None:
+            return np.empty(0, dtype=np.int64)
+        return self.sent_rows[self.sent_offsets[code]:self.sent_offsets[code + 1]]
+
+    def received(self, wallet):
+        """Row positions of the transactions received by `wallet`."""
+        code = self.codes.get(wallet)
+        if code is None:
+            return np.empty(0, dtype=np.int64)
+        return self.received_rows[self.received_offsets[code]:self.received_offsets[code + 1]]
+
+    def rows(self, wallet):
+        """Sorted row positions of every transaction involving `wallet`."""
+        sent = self.sent(wallet)
+        received = self.received(wallet)
+        if not len(received):
+            return sent
+        if not len(sent):
+            return received
+        return np.union1d(sent, received)
+
+    def count(self, wallet):
+        return len(self.rows(wallet))
+
+    def total(self, wallet):
+        return float(self.amounts[self.rows(wallet)].sum())
+
+    def history(self, df, wallet):
+        """The rows of `df` (the frame the index was built from) involving `wallet`."""
+        return df.iloc[self.rows(wallet)]
+
+
+def get_wallet_index(path):
+    """Returns the wallet index of the dataset at `path`, built once per dataset version."""
+    return cached_derived(path, "wallet_index", WalletIndex)